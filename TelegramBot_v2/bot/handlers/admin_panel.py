@@ -77,6 +77,12 @@ except ImportError:
     def format_validation_errors(errors: list[str]) -> str:
         """Форматирование ошибок."""
         return "\n".join([f"❌ {e}" for e in errors]) if errors else "Нет ошибок"
+from bot.keyboards.admin_callbacks import (
+    CB_CREDIT_ADD_CONFIRM,
+    CB_CREDIT_REMOVE_CONFIRM,
+    CB_UNLIMITED_GRANT,
+    unpack_callback,
+)
 from bot.keyboards.admin_keyboards import (
     CATEGORY_NAMES,
     IDEA_STATUS_NAMES,
@@ -652,16 +658,14 @@ async def callback_credit_remove(callback: CallbackQuery, state: FSMContext) ->
     await callback.answer()
 
 
-@router.callback_query(F.data.startswith("admin:credit_add_confirm:"))
+@router.callback_query(F.data.startswith(CB_CREDIT_ADD_CONFIRM + ":"))
 async def callback_credit_add_confirm(callback: CallbackQuery, state: FSMContext) -> None:
     """Подтвердить начисление кредитов."""
     if not callback.from_user or not is_admin(callback.from_user.id):
         await callback.answer("⛔ Нет доступа", show_alert=True)
         return
     
-    parts = callback.data.split(":")
-    telegram_id = int(parts[-2])
-    amount = int(parts[-1])
+    telegram_id, amount = unpack_callback(CB_CREDIT_ADD_CONFIRM, callback.data)
     
     try:
         success = await admin_add_credits(
@@ -682,16 +686,14 @@ async def callback_credit_add_confirm(callback: CallbackQuery, state: FSMContext
         await callback.answer("❌ Ошибка", show_alert=True)
 
 
-@router.callback_query(F.data.startswith("admin:credit_remove_confirm:"))
+@router.callback_query(F.data.startswith(CB_CREDIT_REMOVE_CONFIRM + ":"))
 async def callback_credit_remove_confirm(callback: CallbackQuery, state: FSMContext) -> None:
     """Подтвердить списание кредитов."""
     if not callback.from_user or not is_admin(callback.from_user.id):
         await callback.answer("⛔ Нет доступа", show_alert=True)
         return
     
-    parts = callback.data.split(":")
-    telegram_id = int(parts[-2])
-    amount = int(parts[-1])
+    telegram_id, amount = unpack_callback(CB_CREDIT_REMOVE_CONFIRM, callback.data)
     
     try:
         success = await admin_remove_credits(
@@ -844,16 +846,14 @@ async def callback_unlimited_menu(callback: CallbackQuery, state: FSMContext) ->
     await callback.answer()
 
 
-@router.callback_query(F.data.startswith("admin:unlimited_grant:"))
+@router.callback_query(F.data.startswith(CB_UNLIMITED_GRANT + ":"))
 async def callback_unlimited_grant(callback: CallbackQuery, state: FSMContext) -> None:
     """Выдать/продлить безлимит."""
     if not callback.from_user or not is_admin(callback.from_user.id):
         await callback.answer("⛔ Нет доступа", show_alert=True)
         return
 
-    parts = callback.data.split(":")
-    telegram_id = int(parts[-2])
-    duration_days = int(parts[-1])
+    telegram_id, duration_days = unpack_callback(CB_UNLIMITED_GRANT, callback.data)
 
     try:
         new_until = await admin_grant_unlimited(
@@ -108,7 +108,7 @@ def build_packages_keyboard(
         badge = "💎 " if pkg.is_best_value else ""
         savings_text = f" (-{pkg.savings_percent}%)" if pkg.savings_percent > 0 else ""
         builder.button(
-            text=f"{badge}{pkg.emoji} {pkg.credits} ТЗ • {format_number(pkg.price_rub)}₽{savings_text}",
+            text=f"{badge}{pkg.emoji} {pkg.credits} ТЗ • {pkg.price_rub_formatted}₽{savings_text}",
             callback_data=f"buy:{pkg.id}",
         )
     
@@ -117,7 +117,7 @@ def build_packages_keyboard(
     if unlimited_packages:
         pkg = unlimited_packages[0]
         builder.button(
-            text=f"👑 БЕЗЛИМИТ {pkg.duration_days} дней • {format_number(pkg.price_rub)}₽",
+            text=f"👑 БЕЗЛИМИТ {pkg.duration_days} дней • {pkg.price_rub_formatted}₽",
             callback_data=f"buy:{pkg.id}",
         )
     
@@ -173,11 +173,16 @@ async def callback_show_packages(
     user: User,
 ) -> None:
     """Показать профессиональное меню пакетов."""
-    from bot.utils.package_menu import build_packages_menu_text, build_packages_keyboard
+    from bot.utils.package_menu import (
+        build_packages_keyboard,
+        build_packages_menu_text,
+        get_unlimited_status_text,
+    )
 
     await callback.answer()
-    text = build_packages_menu_text(user)
-    keyboard = build_packages_keyboard(user, show_back=True)
+    unlimited_status = get_unlimited_status_text(user)
+    text = build_packages_menu_text(user, unlimited_status=unlimited_status)
+    keyboard = build_packages_keyboard(user, show_back=True, unlimited_status=unlimited_status)
 
     if callback.message:
         await callback.message.edit_text(text=text, reply_markup=keyboard, parse_mode="HTML")
@@ -308,12 +313,19 @@ async def callback_buy_package(
     )
 
     # Проверка блокировки при активном безлимите
-    from bot.utils.package_menu import get_package_blocked_message, build_packages_menu_text, build_packages_keyboard
+    from bot.utils.package_menu import (
+        build_packages_keyboard,
+        get_package_blocked_message,
+        get_unlimited_status_text,
+    )
 
-    blocked_message = get_package_blocked_message(package_id, user)
+    unlimited_status = get_unlimited_status_text(user)
+    blocked_message = get_package_blocked_message(
+        package_id, user, unlimited_status=unlimited_status
+    )
     if blocked_message:
         # Показать сообщение о блокировке и вернуться в меню
-        keyboard = build_packages_keyboard(user, show_back=True)
+        keyboard = build_packages_keyboard(user, show_back=True, unlimited_status=unlimited_status)
         if callback.message:
             await callback.message.edit_text(text=blocked_message, reply_markup=keyboard, parse_mode="HTML")
         return
@@ -326,7 +338,7 @@ async def callback_buy_package(
             f"━━━━━━━━━━━━━━━━━━━━━\n\n"
             f"📦 <b>Тариф:</b> {package.display_name}\n"
             f"⏱ <b>Срок:</b> {package.duration_days} дней\n"
-            f"💳 <b>Стоимость:</b> {format_number(package.price_rub)}₽\n\n"
+            f"💳 <b>Стоимость:</b> {package.price_rub_formatted}₽\n\n"
             f"✨ <b>Что включено:</b>\n"
             f"   • Неограниченные генерации ТЗ\n"
             f"   • Приоритетная обработка\n"
@@ -343,8 +355,8 @@ async def callback_buy_package(
             f"{package.emoji} <b>Пакет «{package.name}»</b>\n"
             f"━━━━━━━━━━━━━━━━━━━━━\n\n"
             f"📦 <b>Кредитов:</b> {package.credits} ТЗ\n"
-            f"💳 <b>Стоимость:</b> {format_number(package.price_rub)}₽\n"
-            f"📊 <b>Цена за 1 ТЗ:</b> {package.price_per_credit}₽"
+            f"💳 <b>Стоимость:</b> {package.price_rub_formatted}₽\n"
+            f"📊 <b>Цена за 1 ТЗ:</b> {package.price_per_credit_text}₽"
             f"{savings_text}\n\n"
         )
         
@@ -427,7 +439,7 @@ async def callback_confirm_buy(
         invoice_description = (
             f"Пакет кредитов TZ Generator\n"
             f"• {package.credits} генераций ТЗ\n"
-            f"• Цена за ТЗ: {package.price_per_credit}₽\n"
+            f"• Цена за ТЗ: {package.price_per_credit_text}₽\n"
             f"• Бессрочное использование"
         )
         label_text = f"{package.credits} кредитов"
@@ -686,7 +698,7 @@ async def handle_successful_payment(
                 f"👑 <b>Тариф:</b> Безлимитная подписка\n"
                 f"⏱ <b>Срок:</b> {package.duration_days} дней\n"
                 f"📅 <b>Действует до:</b> {expiry_date.strftime('%d.%m.%Y')}\n"
-                f"💳 <b>Оплачено:</b> {format_number(package.price_rub)}₽\n\n"
+                f"💳 <b>Оплачено:</b> {package.price_rub_formatted}₽\n\n"
                 f"🎉 Теперь вы можете генерировать ТЗ без ограничений!\n\n"
                 f"Нажмите 🚀 <b>Создать ТЗ</b>, чтобы начать!",
                 reply_markup=get_main_menu_keyboard(),
@@ -726,7 +738,7 @@ async def handle_successful_payment(
                 f"✅ <b>Оплата прошла успешно!</b>\n\n"
                 f"📦 <b>Пакет:</b> {package.display_name}\n"
                 f"➕ <b>Начислено:</b> +{package.credits} кредитов\n"
-                f"💳 <b>Оплачено:</b> {format_number(package.price_rub)}₽"
+                f"💳 <b>Оплачено:</b> {package.price_rub_formatted}₽"
                 f"{savings_text}\n\n"
                 f"━━━━━━━━━━━━━━━━━━━━━\n"
                 f"🏦 <b>Ваш баланс:</b> {new_balance} кредитов\n\n"
@@ -1056,10 +1056,15 @@ async def cmd_balance(message: Message, user: User) -> None:
 @router.message(Command("buy"))
 async def cmd_buy(message: Message, user: User) -> None:
     """Команда /buy - купить кредиты или подписку."""
-    from bot.utils.package_menu import build_packages_menu_text, build_packages_keyboard
+    from bot.utils.package_menu import (
+        build_packages_keyboard,
+        build_packages_menu_text,
+        get_unlimited_status_text,
+    )
 
-    text = build_packages_menu_text(user)
-    keyboard = build_packages_keyboard(user, show_back=False)
+    unlimited_status = get_unlimited_status_text(user)
+    text = build_packages_menu_text(user, unlimited_status=unlimited_status)
+    keyboard = build_packages_keyboard(user, show_back=False, unlimited_status=unlimited_status)
 
     await message.answer(text=text, reply_markup=keyboard, parse_mode="HTML")
 
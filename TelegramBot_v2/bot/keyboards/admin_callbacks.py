@@ -0,0 +1,62 @@
+"""
+Компактные callback_data для админ-панели.
+
+Telegram ограничивает callback_data 64 байтами. Для кнопок, несущих
+несколько чисел (ID пользователя + сумма/срок), используются короткие
+префиксы и числа в base36 — так остаётся запас под новые поля,
+а апдейты становятся короче.
+
+Формат: ``<префикс>:<число36>:<число36>...``
+"""
+
+from typing import List
+
+
+# ============================================================
+# ПРЕФИКСЫ
+# ============================================================
+
+CB_CREDIT_ADD_CONFIRM = "a:ca"
+CB_CREDIT_REMOVE_CONFIRM = "a:cr"
+CB_UNLIMITED_GRANT = "a:ug"
+
+# Лимит Telegram на callback_data (в байтах UTF-8)
+MAX_CALLBACK_BYTES = 64
+
+_DIGITS36 = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+# ============================================================
+# КОДИРОВАНИЕ
+# ============================================================
+
+def int36(value: int) -> str:
+    """Записать неотрицательное целое в base36."""
+    if value < 0:
+        raise ValueError(f"Отрицательное значение в callback_data: {value}")
+    if value < 36:
+        return _DIGITS36[value]
+
+    digits = []
+    while value:
+        value, rem = divmod(value, 36)
+        digits.append(_DIGITS36[rem])
+    return "".join(reversed(digits))
+
+
+def pack_callback(prefix: str, *values: int) -> str:
+    """
+    Собрать callback_data из префикса и чисел.
+
+    Raises:
+        ValueError: Если результат длиннее лимита Telegram
+    """
+    data = ":".join((prefix, *map(int36, values)))
+    if len(data.encode("utf-8")) > MAX_CALLBACK_BYTES:
+        raise ValueError(f"callback_data длиннее {MAX_CALLBACK_BYTES} байт: {data}")
+    return data
+
+
+def unpack_callback(prefix: str, data: str) -> List[int]:
+    """Разобрать числа из callback_data, собранной pack_callback."""
+    return [int(part, 36) for part in data[len(prefix) + 1:].split(":")]
@@ -8,10 +8,148 @@
 - Настроек и аналитики
 """
 
-from typing import List, Optional, Dict, Any
+import sys
+from functools import cache, lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
-from aiogram.utils.keyboard import InlineKeyboardBuilder
+
+from .admin_callbacks import (
+    CB_CREDIT_ADD_CONFIRM,
+    CB_CREDIT_REMOVE_CONFIRM,
+    CB_UNLIMITED_GRANT,
+    pack_callback,
+)
+
+
+# ============================================================
+# ПОДПИСИ ПО УМОЛЧАНИЮ
+# ============================================================
+
+# Кириллические литералы не интернируются автоматически,
+# поэтому создаём их один раз и переиспользуем в каждой строке списков
+_NONAME = sys.intern("Без имени")
+_ANON = sys.intern("Аноним")
+
+
+# ============================================================
+# CALLBACK DATA РАЗДЕЛОВ
+# ============================================================
+
+# Переходы в разделы встречаются в большинстве клавиатур — держим
+# по одному экземпляру каждой строки
+_CB_MAIN = sys.intern("admin:main")
+_CB_USERS = sys.intern("admin:users")
+_CB_IDEAS = sys.intern("admin:ideas")
+_CB_GENERATIONS = sys.intern("admin:generations")
+_CB_PAYMENTS = sys.intern("admin:payments")
+_CB_SUPPORT = sys.intern("admin:support")
+_CB_SETTINGS = sys.intern("admin:settings")
+_CB_LOGS = sys.intern("admin:logs")
+_CB_ANALYTICS = sys.intern("admin:analytics")
+
+
+# ============================================================
+# ОБЩИЕ КНОПКИ
+# ============================================================
+
+# Все тексты и callback_data формируются здесь же из str/int, поэтому
+# кнопки создаются без pydantic-валидации — она доминирует в стоимости рендера
+_mk = InlineKeyboardButton.model_construct
+
+# Кнопки неизменяемы (frozen pydantic-модели), поэтому один экземпляр
+# безопасно переиспользуется во всех клавиатурах
+_BTN_MAIN_MENU = _mk(text="⬅️ Главное меню", callback_data=_CB_MAIN)
+_BTN_HOME = _mk(text="🏠 Меню", callback_data=_CB_MAIN)
+_BTN_REFRESH = _mk(text="🔄 Обновить", callback_data="admin:refresh")
+_BTN_BACK_IDEAS = _mk(text="⬅️ К списку", callback_data=_CB_IDEAS)
+_BTN_BACK_USERS = _mk(text="⬅️ К списку", callback_data=_CB_USERS)
+_BTN_BACK_GENS = _mk(text="⬅️ К списку", callback_data=_CB_GENERATIONS)
+_BTN_BACK_PAYMENTS = _mk(text="⬅️ К списку", callback_data=_CB_PAYMENTS)
+_BTN_BACK_SUPPORT = _mk(text="⬅️ К списку", callback_data=_CB_SUPPORT)
+
+# Готовые ряды хранятся кортежами: неизменяемые ряды безопасно делить
+# между закэшированными клавиатурами
+_MAIN_MENU_ROW = (_BTN_MAIN_MENU,)
+
+
+def _as_markup(rows: List[Sequence[InlineKeyboardButton]]) -> InlineKeyboardMarkup:
+    """
+    Собрать разметку из готовых рядов.
+
+    Раскладка всех клавиатур известна заранее, поэтому ряды собираются
+    вручную без InlineKeyboardBuilder, а разметка, как и сами кнопки,
+    создаётся без pydantic-валидации.
+
+    Ряды копируются в списки: без валидации pydantic сериализует кортеж
+    вместо list[list[...]] по-другому, и кнопки уходят в Bot API со
+    всеми пустыми полями (url, pay, ...) как явными null.
+    """
+    return InlineKeyboardMarkup.model_construct(inline_keyboard=[list(row) for row in rows])
+
+
+# ============================================================
+# ПАГИНАЦИЯ
+# ============================================================
+
+@lru_cache(maxsize=4096)
+def _pagination_row(
+    prefix: str,
+    page: int,
+    total_pages: int,
+    info_cb: str,
+) -> Tuple[InlineKeyboardButton, ...]:
+    """
+    Ряд навигации «◀️ 2/5 ▶️» (кэш по странице и разделу).
+
+    Args:
+        prefix: Префикс callback_data перехода, например ``admin:users_page``
+        page: Текущая страница
+        total_pages: Всего страниц
+        info_cb: callback_data кнопки с номером страницы
+    """
+    info = _mk(text=f"{page}/{total_pages}", callback_data=info_cb)
+    has_prev = page > 1
+    has_next = page < total_pages
+
+    # Ряд имеет одну из четырёх форм в зависимости от краёв списка
+    if has_prev and has_next:
+        return (
+            _mk(text="◀️", callback_data=f"{prefix}:{page-1}"),
+            info,
+            _mk(text="▶️", callback_data=f"{prefix}:{page+1}"),
+        )
+    if has_prev:
+        return (_mk(text="◀️", callback_data=f"{prefix}:{page-1}"), info)
+    if has_next:
+        return (info, _mk(text="▶️", callback_data=f"{prefix}:{page+1}"))
+    return (info,)
+
+
+# ============================================================
+# СУММЫ И СРОКИ
+# ============================================================
+
+# Раскладка кнопок сумм известна заранее, а подписи не зависят от
+# пользователя — при вызове форматируется только callback_data
+_CREDIT_AMOUNT_CHUNKS = ((1, 5, 10), (20, 50, 100))
+_FREE_CREDITS_CHUNKS = ((0, 1, 2), (3, 5))
+_UNLIMITED_CHUNKS = ((7, 30, 90), (180, 365))
+
+_AMOUNT_TEXTS = {
+    amount: f"{amount} 💎"
+    for chunk in _CREDIT_AMOUNT_CHUNKS + _FREE_CREDITS_CHUNKS
+    for amount in chunk
+}
+
+# Пары (срок, подпись) по рядам: «♾ 7д» для выдачи, «⏳ +7д» для продления
+_UNLIMITED_LABELS = {
+    is_active: tuple(
+        tuple((days, f"{'⏳ +' if is_active else '♾ '}{days}д") for days in chunk)
+        for chunk in _UNLIMITED_CHUNKS
+    )
+    for is_active in (False, True)
+}
 
 
 # ============================================================
@@ -39,42 +177,137 @@ IDEA_STATUS_NAMES = {
     "rejected": "❌ Отклонены",
 }
 
+_IDEA_STATUS_EMOJI = {
+    "new": "🆕",
+    "approved": "✅",
+    "rejected": "❌",
+}
+
+
+# ============================================================
+# ПЛАТЕЖИ (статусы)
+# ============================================================
+
+_PAYMENT_STATUS_ICONS = {
+    "completed": "✅",
+    "pending": "⏳",
+    "failed": "❌",
+    "refunded": "🔄",
+}
+
 
 # ============================================================
 # ГЛАВНОЕ МЕНЮ
 # ============================================================
 
-def get_admin_main_keyboard() -> InlineKeyboardMarkup:
+def _build_admin_main_keyboard() -> InlineKeyboardMarkup:
     """Главное меню админ-панели."""
-    builder = InlineKeyboardBuilder()
+    return _as_markup([
+        [
+            _mk(text="👥 Пользователи", callback_data=_CB_USERS),
+            _mk(text="💬 Поддержка", callback_data=_CB_SUPPORT),
+        ],
+        [
+            _mk(text="📝 Генерации", callback_data=_CB_GENERATIONS),
+            _mk(text="💳 Платежи", callback_data=_CB_PAYMENTS),
+        ],
+        [
+            _mk(text="💡 Идеи", callback_data=_CB_IDEAS),
+            _mk(text="📊 Аналитика", callback_data=_CB_ANALYTICS),
+        ],
+        [
+            _mk(text="🔧 Настройки", callback_data=_CB_SETTINGS),
+            _mk(text="📋 Логи", callback_data=_CB_LOGS),
+        ],
+        [_BTN_REFRESH],
+    ])
+
+
+# Статические клавиатуры не зависят от входных данных и строятся
+# один раз при импорте — хендлеры получают готовый объект
+_ADMIN_MAIN_MARKUP = _build_admin_main_keyboard()
 
-    builder.row(
-        InlineKeyboardButton(text="👥 Пользователи", callback_data="admin:users"),
-        InlineKeyboardButton(text="💬 Поддержка", callback_data="admin:support"),
-    )
-    builder.row(
-        InlineKeyboardButton(text="📝 Генерации", callback_data="admin:generations"),
-        InlineKeyboardButton(text="💳 Платежи", callback_data="admin:payments"),
-    )
-    builder.row(
-        InlineKeyboardButton(text="💡 Идеи", callback_data="admin:ideas"),
-        InlineKeyboardButton(text="📊 Аналитика", callback_data="admin:analytics"),
-    )
-    builder.row(
-        InlineKeyboardButton(text="🔧 Настройки", callback_data="admin:settings"),
-        InlineKeyboardButton(text="📋 Логи", callback_data="admin:logs"),
-    )
-    builder.row(
-        InlineKeyboardButton(text="🔄 Обновить", callback_data="admin:refresh"),
-    )
 
-    return builder.as_markup()
+def get_admin_main_keyboard() -> InlineKeyboardMarkup:
+    """Главное меню админ-панели."""
+    return _ADMIN_MAIN_MARKUP
 
 
 # ============================================================
 # ИДЕИ
 # ============================================================
 
+# Тексты строк форматируются шаблоном, а callback_data с одним ID
+# собирается конкатенацией префикса — без машинерии форматирования
+_IDEA_BTN_TEXT_TMPL = "%s @%s | ID %s"
+_IDEA_CB_PREFIX = "admin:idea:"
+
+
+def _build_ideas_filter_rows(
+    status_filter: Optional[str],
+) -> Tuple[Tuple[InlineKeyboardButton, ...], ...]:
+    """Ряды фильтра идей по статусу."""
+    return (
+        (
+            _mk(
+                text="🆕 Новые" + (" ✓" if status_filter == "new" else ""),
+                callback_data="admin:ideas_status:new",
+            ),
+            _mk(
+                text="✅ Одобр" + (" ✓" if status_filter == "approved" else ""),
+                callback_data="admin:ideas_status:approved",
+            ),
+            _mk(
+                text="❌ Откл" + (" ✓" if status_filter == "rejected" else ""),
+                callback_data="admin:ideas_status:rejected",
+            ),
+        ),
+        (
+            _mk(
+                text="🔄 Все" + (" ✓" if not status_filter else ""),
+                callback_data="admin:ideas_status:all",
+            ),
+        ),
+    )
+
+
+# Все состояния панели известны заранее: подписи с «✓» собираются
+# при импорте, а рендер выбирает готовые ряды по активному значению.
+# Неизвестное значение (ничего не отмечено) собирается на лету
+_IDEAS_FILTER_ROWS = {
+    key: _build_ideas_filter_rows(key)
+    for key in (None, "new", "approved", "rejected")
+}
+
+
+def _build_ideas_sort_rows(sort_by: str) -> Tuple[Tuple[InlineKeyboardButton, ...], ...]:
+    """Ряды сортировки идей."""
+    return (
+        (
+            _mk(
+                text="📅 По дате" + (" ✓" if sort_by == "created_at" else ""),
+                callback_data="admin:ideas_sort:created_at",
+            ),
+            _mk(
+                text="🧾 По статусу" + (" ✓" if sort_by == "status" else ""),
+                callback_data="admin:ideas_sort:status",
+            ),
+        ),
+        (
+            _mk(
+                text="🎁 По награде" + (" ✓" if sort_by == "reward_credits" else ""),
+                callback_data="admin:ideas_sort:reward_credits",
+            ),
+        ),
+    )
+
+
+_IDEAS_SORT_ROWS = {
+    key: _build_ideas_sort_rows(key)
+    for key in ("created_at", "status", "reward_credits")
+}
+
+
 def get_ideas_list_keyboard(
     ideas: List[Dict[str, Any]],
     page: int,
@@ -85,90 +318,38 @@ def get_ideas_list_keyboard(
     """
     Клавиатура списка идей с пагинацией и сортировкой.
     """
-    builder = InlineKeyboardBuilder()
-    
-    status_emoji = {
-        "new": "🆕",
-        "approved": "✅",
-        "rejected": "❌",
-    }
-    
-    for idea in ideas:
-        username = idea.get("username") or "Аноним"
-        idea_id = idea.get("id")
-        status = idea.get("status", "new")
-        emoji = status_emoji.get(status, "📝")
-        
-        builder.row(
-            InlineKeyboardButton(
-                text=f"{emoji} @{username} | ID {idea_id}",
-                callback_data=f"admin:idea:{idea_id}",
+    get_emoji = _IDEA_STATUS_EMOJI.get
+    
+    rows = [
+        [
+            _mk(
+                text=_IDEA_BTN_TEXT_TMPL % (
+                    get_emoji(idea.get("status", "new"), "📝"),
+                    idea.get("username") or _ANON,
+                    idea.get("id"),
+                ),
+                callback_data=_IDEA_CB_PREFIX + str(idea.get("id")),
             )
-        )
+        ]
+        for idea in ideas
+    ]
     
     # Пагинация
-    nav_buttons = []
-    if page > 1:
-        nav_buttons.append(
-            InlineKeyboardButton(text="◀️", callback_data=f"admin:ideas_page:{page-1}")
-        )
-    nav_buttons.append(
-        InlineKeyboardButton(text=f"{page}/{total_pages}", callback_data="admin:ideas_info")
-    )
-    if page < total_pages:
-        nav_buttons.append(
-            InlineKeyboardButton(text="▶️", callback_data=f"admin:ideas_page:{page+1}")
-        )
-    if nav_buttons:
-        builder.row(*nav_buttons)
+    rows.append(_pagination_row("admin:ideas_page", page, total_pages, "admin:ideas_info"))
     
-    # Фильтр по статусу
-    builder.row(
-        InlineKeyboardButton(
-            text="🆕 Новые" + (" ✓" if status_filter == "new" else ""),
-            callback_data="admin:ideas_status:new",
-        ),
-        InlineKeyboardButton(
-            text="✅ Одобр" + (" ✓" if status_filter == "approved" else ""),
-            callback_data="admin:ideas_status:approved",
-        ),
-        InlineKeyboardButton(
-            text="❌ Откл" + (" ✓" if status_filter == "rejected" else ""),
-            callback_data="admin:ideas_status:rejected",
-        ),
-    )
-    builder.row(
-        InlineKeyboardButton(
-            text="🔄 Все" + (" ✓" if not status_filter else ""),
-            callback_data="admin:ideas_status:all",
-        ),
-    )
-    
-    # Сортировка
-    builder.row(
-        InlineKeyboardButton(
-            text="📅 По дате" + (" ✓" if sort_by == "created_at" else ""),
-            callback_data="admin:ideas_sort:created_at",
-        ),
-        InlineKeyboardButton(
-            text="🧾 По статусу" + (" ✓" if sort_by == "status" else ""),
-            callback_data="admin:ideas_sort:status",
-        ),
-    )
-    builder.row(
-        InlineKeyboardButton(
-            text="🎁 По награде" + (" ✓" if sort_by == "reward_credits" else ""),
-            callback_data="admin:ideas_sort:reward_credits",
-        ),
-    )
+    # Фильтр по статусу и сортировка
+    rows.extend(_IDEAS_FILTER_ROWS.get(status_filter) or _build_ideas_filter_rows(status_filter))
+    rows.extend(_IDEAS_SORT_ROWS.get(sort_by) or _build_ideas_sort_rows(sort_by))
     
-    builder.row(
-        InlineKeyboardButton(text="⬅️ Главное меню", callback_data="admin:main"),
-    )
+    rows.append(_MAIN_MENU_ROW)
     
-    return builder.as_markup()
+    return _as_markup(rows)
 
 
+# Карточки и подтверждения зависят только от хешируемых аргументов,
+# а aiogram не изменяет разметку при отправке — готовый объект
+# переиспользуется при повторных открытиях и двойных нажатиях
+@lru_cache(maxsize=1024)
 def get_idea_card_keyboard(
     idea_id: int,
     status: str,
@@ -176,48 +357,72 @@ def get_idea_card_keyboard(
     """
     Клавиатура карточки идеи.
     """
-    builder = InlineKeyboardBuilder()
-    
-    builder.row(
-        InlineKeyboardButton(
-            text="✅ Одобрить (+2)",
-            callback_data=f"admin:idea_approve:{idea_id}",
-        ),
-        InlineKeyboardButton(
-            text="❌ Отклонить",
-            callback_data=f"admin:idea_reject:{idea_id}",
-        ),
-    )
-    
-    builder.row(
-        InlineKeyboardButton(text="⬅️ К списку", callback_data="admin:ideas"),
-        InlineKeyboardButton(text="🏠 Меню", callback_data="admin:main"),
-    )
-    
-    return builder.as_markup()
+    return _as_markup([
+        [
+            _mk(
+                text="✅ Одобрить (+2)",
+                callback_data=f"admin:idea_approve:{idea_id}",
+            ),
+            _mk(
+                text="❌ Отклонить",
+                callback_data=f"admin:idea_reject:{idea_id}",
+            ),
+        ],
+        [_BTN_BACK_IDEAS, _BTN_HOME],
+    ])
 
 
+@cache
 def get_admin_back_keyboard(section: str = "main") -> InlineKeyboardMarkup:
     """Кнопка возврата в нужный раздел."""
-    builder = InlineKeyboardBuilder()
-    
     if section == "main":
-        builder.row(
-            InlineKeyboardButton(text="⬅️ Главное меню", callback_data="admin:main"),
-        )
-    else:
-        builder.row(
-            InlineKeyboardButton(text="⬅️ Назад", callback_data=f"admin:{section}"),
-            InlineKeyboardButton(text="🏠 Главное меню", callback_data="admin:main"),
-        )
+        return _as_markup([_MAIN_MENU_ROW])
     
-    return builder.as_markup()
+    return _as_markup([
+        [
+            _mk(text="⬅️ Назад", callback_data=f"admin:{section}"),
+            _mk(text="🏠 Главное меню", callback_data=_CB_MAIN),
+        ],
+    ])
 
 
 # ============================================================
 # ПОЛЬЗОВАТЕЛИ
 # ============================================================
 
+_USER_BTN_TEXT_TMPL = "👤 @%s | 💰 %s"
+_USER_CB_PREFIX = "admin:user:"
+
+
+def _build_users_sort_rows(sort_by: str) -> Tuple[Tuple[InlineKeyboardButton, ...], ...]:
+    """Ряды сортировки пользователей."""
+    return (
+        (
+            _mk(
+                text="📅 По дате" + (" ✓" if sort_by == "created_at" else ""),
+                callback_data="admin:users_sort:created_at",
+            ),
+            _mk(
+                text="💰 По балансу" + (" ✓" if sort_by == "balance" else ""),
+                callback_data="admin:users_sort:balance",
+            ),
+        ),
+        (
+            _mk(
+                text="📝 По генерациям" + (" ✓" if sort_by == "total_generated" else ""),
+                callback_data="admin:users_sort:total_generated",
+            ),
+            _mk(text="🔍 Поиск", callback_data="admin:users_search"),
+        ),
+    )
+
+
+_USERS_SORT_ROWS = {
+    key: _build_users_sort_rows(key)
+    for key in ("created_at", "balance", "total_generated")
+}
+
+
 def get_users_list_keyboard(
     users: List[Dict[str, Any]],
     page: int,
@@ -233,65 +438,30 @@ def get_users_list_keyboard(
         total_pages: Всего страниц
         sort_by: Поле сортировки
     """
-    builder = InlineKeyboardBuilder()
-    
     # Пользователи
-    for user in users:
-        username = user.get("username") or "Без имени"
-        balance = user.get("balance", 0)
-        telegram_id = user.get("telegram_id")
-        
-        builder.row(
-            InlineKeyboardButton(
-                text=f"👤 @{username} | 💰 {balance}",
-                callback_data=f"admin:user:{telegram_id}",
+    rows = [
+        [
+            _mk(
+                text=_USER_BTN_TEXT_TMPL % (user.get("username") or _NONAME, user.get("balance", 0)),
+                callback_data=_USER_CB_PREFIX + str(user.get("telegram_id")),
             )
-        )
+        ]
+        for user in users
+    ]
     
     # Пагинация
-    nav_buttons = []
-    if page > 1:
-        nav_buttons.append(
-            InlineKeyboardButton(text="◀️", callback_data=f"admin:users_page:{page-1}")
-        )
-    nav_buttons.append(
-        InlineKeyboardButton(text=f"{page}/{total_pages}", callback_data="admin:users_info")
-    )
-    if page < total_pages:
-        nav_buttons.append(
-            InlineKeyboardButton(text="▶️", callback_data=f"admin:users_page:{page+1}")
-        )
-    
-    if nav_buttons:
-        builder.row(*nav_buttons)
+    rows.append(_pagination_row("admin:users_page", page, total_pages, "admin:users_info"))
     
     # Сортировка
-    builder.row(
-        InlineKeyboardButton(
-            text="📅 По дате" + (" ✓" if sort_by == "created_at" else ""),
-            callback_data="admin:users_sort:created_at",
-        ),
-        InlineKeyboardButton(
-            text="💰 По балансу" + (" ✓" if sort_by == "balance" else ""),
-            callback_data="admin:users_sort:balance",
-        ),
-    )
-    builder.row(
-        InlineKeyboardButton(
-            text="📝 По генерациям" + (" ✓" if sort_by == "total_generated" else ""),
-            callback_data="admin:users_sort:total_generated",
-        ),
-        InlineKeyboardButton(text="🔍 Поиск", callback_data="admin:users_search"),
-    )
+    rows.extend(_USERS_SORT_ROWS.get(sort_by) or _build_users_sort_rows(sort_by))
     
     # Назад
-    builder.row(
-        InlineKeyboardButton(text="⬅️ Главное меню", callback_data="admin:main"),
-    )
+    rows.append(_MAIN_MENU_ROW)
     
-    return builder.as_markup()
+    return _as_markup(rows)
 
 
+@lru_cache(maxsize=1024)
 def get_user_card_keyboard(
     telegram_id: int,
     is_blocked: bool = False,
@@ -303,98 +473,86 @@ def get_user_card_keyboard(
         telegram_id: Telegram ID пользователя
         is_blocked: Заблокирован ли пользователь
     """
-    builder = InlineKeyboardBuilder()
-    
-    # Управление балансом
-    builder.row(
-        InlineKeyboardButton(
-            text="➕ Начислить",
-            callback_data=f"admin:credit_add:{telegram_id}",
-        ),
-        InlineKeyboardButton(
-            text="➖ Списать",
-            callback_data=f"admin:credit_remove:{telegram_id}",
-        ),
-    )
-    
     # Блокировка
     if is_blocked:
-        builder.row(
-            InlineKeyboardButton(
-                text="✅ Разблокировать",
-                callback_data=f"admin:unblock:{telegram_id}",
-            ),
+        block_button = _mk(
+            text="✅ Разблокировать",
+            callback_data=f"admin:unblock:{telegram_id}",
         )
     else:
-        builder.row(
-            InlineKeyboardButton(
-                text="🚫 Заблокировать",
-                callback_data=f"admin:block:{telegram_id}",
-            ),
+        block_button = _mk(
+            text="🚫 Заблокировать",
+            callback_data=f"admin:block:{telegram_id}",
         )
     
-    # Дополнительные действия
-    builder.row(
-        InlineKeyboardButton(
-            text="📝 Генерации",
-            callback_data=f"admin:user_generations:{telegram_id}",
-        ),
-        InlineKeyboardButton(
-            text="💳 Платежи",
-            callback_data=f"admin:user_payments:{telegram_id}",
-        ),
-    )
-
-    # Безлимит
-    builder.row(
-        InlineKeyboardButton(
-            text="♾ Безлимит",
-            callback_data=f"admin:unlimited:{telegram_id}",
-        ),
-    )
-    
-    # Назад
-    builder.row(
-        InlineKeyboardButton(text="⬅️ К списку", callback_data="admin:users"),
-        InlineKeyboardButton(text="🏠 Меню", callback_data="admin:main"),
-    )
-    
-    return builder.as_markup()
+    return _as_markup([
+        # Управление балансом
+        [
+            _mk(
+                text="➕ Начислить",
+                callback_data=f"admin:credit_add:{telegram_id}",
+            ),
+            _mk(
+                text="➖ Списать",
+                callback_data=f"admin:credit_remove:{telegram_id}",
+            ),
+        ],
+        [block_button],
+        # Дополнительные действия
+        [
+            _mk(
+                text="📝 Генерации",
+                callback_data=f"admin:user_generations:{telegram_id}",
+            ),
+            _mk(
+                text="💳 Платежи",
+                callback_data=f"admin:user_payments:{telegram_id}",
+            ),
+        ],
+        # Безлимит
+        [
+            _mk(
+                text="♾ Безлимит",
+                callback_data=f"admin:unlimited:{telegram_id}",
+            ),
+        ],
+        # Назад
+        [_BTN_BACK_USERS, _BTN_HOME],
+    ])
 
 
+@lru_cache(maxsize=1024)
 def get_unlimited_manage_keyboard(
     telegram_id: int,
     is_active: bool = False,
 ) -> InlineKeyboardMarkup:
     """Клавиатура управления безлимитом."""
-    builder = InlineKeyboardBuilder()
-
-    durations = [7, 30, 90, 180, 365]
-    label_prefix = "⏳ +" if is_active else "♾ "
-
-    for days in durations:
-        builder.button(
-            text=f"{label_prefix}{days}д",
-            callback_data=f"admin:unlimited_grant:{telegram_id}:{days}",
-        )
-
-    builder.adjust(3)
+    rows = [
+        [
+            _mk(
+                text=label,
+                callback_data=pack_callback(CB_UNLIMITED_GRANT, telegram_id, days),
+            )
+            for days, label in chunk
+        ]
+        for chunk in _UNLIMITED_LABELS[bool(is_active)]
+    ]
 
-    builder.row(
-        InlineKeyboardButton(
+    rows.append([
+        _mk(
             text="🛑 Забрать",
             callback_data=f"admin:unlimited_revoke:{telegram_id}",
         ),
-    )
+    ])
+    rows.append([
+        _mk(text="⬅️ Назад", callback_data=f"admin:user:{telegram_id}"),
+        _BTN_HOME,
+    ])
 
-    builder.row(
-        InlineKeyboardButton(text="⬅️ Назад", callback_data=f"admin:user:{telegram_id}"),
-        InlineKeyboardButton(text="🏠 Меню", callback_data="admin:main"),
-    )
-
-    return builder.as_markup()
+    return _as_markup(rows)
 
 
+@lru_cache(maxsize=1024)
 def get_credit_amount_keyboard(
     telegram_id: int,
     action: str,
@@ -406,32 +564,33 @@ def get_credit_amount_keyboard(
         telegram_id: Telegram ID пользователя
         action: Тип действия (add/remove)
     """
-    builder = InlineKeyboardBuilder()
+    prefix = CB_CREDIT_ADD_CONFIRM if action == "add" else CB_CREDIT_REMOVE_CONFIRM
     
-    amounts = [1, 5, 10, 20, 50, 100]
-    
-    for amount in amounts:
-        builder.button(
-            text=f"{amount} 💎",
-            callback_data=f"admin:credit_{action}_confirm:{telegram_id}:{amount}",
-        )
-    
-    builder.adjust(3)
-    
-    builder.row(
-        InlineKeyboardButton(
-            text="✏️ Другое количество",
-            callback_data=f"admin:credit_{action}_custom:{telegram_id}",
-        ),
-    )
-    
-    builder.row(
-        InlineKeyboardButton(text="❌ Отмена", callback_data=f"admin:user:{telegram_id}"),
-    )
+    rows = [
+        [
+            _mk(
+                text=_AMOUNT_TEXTS[amount],
+                callback_data=pack_callback(prefix, telegram_id, amount),
+            )
+            for amount in chunk
+        ]
+        for chunk in _CREDIT_AMOUNT_CHUNKS
+    ]
     
-    return builder.as_markup()
+    return _as_markup(rows + [
+        [
+            _mk(
+                text="✏️ Другое количество",
+                callback_data=f"admin:credit_{action}_custom:{telegram_id}",
+            ),
+        ],
+        [
+            _mk(text="❌ Отмена", callback_data=f"admin:user:{telegram_id}"),
+        ],
+    ])
 
 
+@lru_cache(maxsize=2048)
 def get_confirm_action_keyboard(
     action: str,
     telegram_id: int,
@@ -445,26 +604,46 @@ def get_confirm_action_keyboard(
         telegram_id: Telegram ID пользователя
         extra_data: Дополнительные данные
     """
-    builder = InlineKeyboardBuilder()
-    
     confirm_data = f"admin:{action}_yes:{telegram_id}"
     cancel_data = f"admin:user:{telegram_id}"
     
     if extra_data:
         confirm_data += f":{extra_data}"
     
-    builder.row(
-        InlineKeyboardButton(text="✅ Да, подтверждаю", callback_data=confirm_data),
-        InlineKeyboardButton(text="❌ Отмена", callback_data=cancel_data),
-    )
-    
-    return builder.as_markup()
+    return _as_markup([
+        [
+            _mk(text="✅ Да, подтверждаю", callback_data=confirm_data),
+            _mk(text="❌ Отмена", callback_data=cancel_data),
+        ],
+    ])
 
 
 # ============================================================
 # ГЕНЕРАЦИИ
 # ============================================================
 
+_GEN_BTN_TEXT_TMPL = "📷 @%s | %s | ⭐ %s%%"
+_GEN_CB_PREFIX = "admin:generation:"
+
+
+@lru_cache(maxsize=64)
+def _generations_filter_row(
+    category_filter: Optional[str],
+    date_filter: Optional[str],
+) -> Tuple[InlineKeyboardButton, ...]:
+    """Ряд фильтров генераций (кэш по паре фильтров)."""
+    return (
+        _mk(
+            text="🏷 Категория" + (f" ({category_filter})" if category_filter else ""),
+            callback_data="admin:gen_filter_category",
+        ),
+        _mk(
+            text="📅 Дата" + (f" ({date_filter})" if date_filter else ""),
+            callback_data="admin:gen_filter_date",
+        ),
+    )
+
+
 def get_generations_list_keyboard(
     generations: List[Dict[str, Any]],
     page: int,
@@ -482,59 +661,34 @@ def get_generations_list_keyboard(
         category_filter: Фильтр по категории
         date_filter: Фильтр по дате (today, week, month)
     """
-    builder = InlineKeyboardBuilder()
-    
     # Генерации
-    for gen in generations:
-        username = gen.get("username") or "Аноним"
-        category = CATEGORY_NAMES.get(gen.get("category", ""), gen.get("category", ""))
-        score = gen.get("quality_score") or 0
-        gen_id = gen.get("id")
-        
-        builder.row(
-            InlineKeyboardButton(
-                text=f"📷 @{username} | {category} | ⭐ {score}%",
-                callback_data=f"admin:generation:{gen_id}",
+    rows = [
+        [
+            _mk(
+                text=_GEN_BTN_TEXT_TMPL % (
+                    gen.get("username") or _ANON,
+                    CATEGORY_NAMES.get(gen.get("category", ""), gen.get("category", "")),
+                    gen.get("quality_score") or 0,
+                ),
+                callback_data=_GEN_CB_PREFIX + str(gen.get("id")),
             )
-        )
+        ]
+        for gen in generations
+    ]
     
     # Пагинация
-    nav_buttons = []
-    if page > 1:
-        nav_buttons.append(
-            InlineKeyboardButton(text="◀️", callback_data=f"admin:generations_page:{page-1}")
-        )
-    nav_buttons.append(
-        InlineKeyboardButton(text=f"{page}/{total_pages}", callback_data="admin:gen_info")
-    )
-    if page < total_pages:
-        nav_buttons.append(
-            InlineKeyboardButton(text="▶️", callback_data=f"admin:generations_page:{page+1}")
-        )
+    rows.append(_pagination_row("admin:generations_page", page, total_pages, "admin:gen_info"))
     
-    if nav_buttons:
-        builder.row(*nav_buttons)
-    
-    # Фильтры по категории
-    builder.row(
-        InlineKeyboardButton(
-            text="🏷 Категория" + (f" ({category_filter})" if category_filter else ""),
-            callback_data="admin:gen_filter_category",
-        ),
-        InlineKeyboardButton(
-            text="📅 Дата" + (f" ({date_filter})" if date_filter else ""),
-            callback_data="admin:gen_filter_date",
-        ),
-    )
+    # Фильтры по категории и дате
+    rows.append(_generations_filter_row(category_filter, date_filter))
     
     # Назад
-    builder.row(
-        InlineKeyboardButton(text="⬅️ Главное меню", callback_data="admin:main"),
-    )
+    rows.append(_MAIN_MENU_ROW)
     
-    return builder.as_markup()
+    return _as_markup(rows)
 
 
+@lru_cache(maxsize=1024)
 def get_generation_card_keyboard(
     generation_id: int,
     has_photos: bool = True,
@@ -546,90 +700,133 @@ def get_generation_card_keyboard(
         generation_id: ID генерации
         has_photos: Есть ли фотографии
     """
-    builder = InlineKeyboardBuilder()
+    rows = []
     
     if has_photos:
-        builder.row(
-            InlineKeyboardButton(
+        rows.append([
+            _mk(
                 text="🖼 Показать фото",
                 callback_data=f"admin:gen_photos:{generation_id}",
             ),
-        )
+        ])
     
-    builder.row(
-        InlineKeyboardButton(
-            text="📄 Полный текст ТЗ",
-            callback_data=f"admin:gen_full_tz:{generation_id}",
-        ),
-    )
+    rows += [
+        [
+            _mk(
+                text="📄 Полный текст ТЗ",
+                callback_data=f"admin:gen_full_tz:{generation_id}",
+            ),
+        ],
+        [
+            _mk(
+                text="📝 Полный анализ",
+                callback_data=f"admin:gen_full_analysis:{generation_id}",
+            ),
+        ],
+        [
+            _mk(
+                text="❌ Удалить",
+                callback_data=f"admin:gen_delete:{generation_id}",
+            ),
+        ],
+        [_BTN_BACK_GENS, _BTN_HOME],
+    ]
     
-    builder.row(
-        InlineKeyboardButton(
-            text="📝 Полный анализ",
-            callback_data=f"admin:gen_full_analysis:{generation_id}",
-        ),
-    )
+    return _as_markup(rows)
+
+
+def _build_category_filter_keyboard() -> InlineKeyboardMarkup:
+    """Клавиатура выбора категории для фильтра."""
+    buttons = [
+        _mk(text=name, callback_data=f"admin:gen_category:{key}")
+        for key, name in CATEGORY_NAMES.items()
+    ]
     
-    builder.row(
-        InlineKeyboardButton(
-            text="❌ Удалить",
-            callback_data=f"admin:gen_delete:{generation_id}",
-        ),
-    )
+    # По 2 категории в ряд
+    rows = [buttons[i:i + 2] for i in range(0, len(buttons), 2)]
     
-    builder.row(
-        InlineKeyboardButton(text="⬅️ К списку", callback_data="admin:generations"),
-        InlineKeyboardButton(text="🏠 Меню", callback_data="admin:main"),
-    )
+    rows.append([
+        _mk(text="🔄 Сбросить фильтр", callback_data="admin:gen_category:all"),
+    ])
+    rows.append([
+        _mk(text="⬅️ Назад", callback_data=_CB_GENERATIONS),
+    ])
     
-    return builder.as_markup()
+    return _as_markup(rows)
+
+
+_CATEGORY_FILTER_MARKUP = _build_category_filter_keyboard()
 
 
 def get_category_filter_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура выбора категории для фильтра."""
-    builder = InlineKeyboardBuilder()
-    
-    for key, name in CATEGORY_NAMES.items():
-        builder.button(
-            text=name,
-            callback_data=f"admin:gen_category:{key}",
-        )
-    
-    builder.adjust(2)
-    
-    builder.row(
-        InlineKeyboardButton(text="🔄 Сбросить фильтр", callback_data="admin:gen_category:all"),
-    )
-    builder.row(
-        InlineKeyboardButton(text="⬅️ Назад", callback_data="admin:generations"),
-    )
-    
-    return builder.as_markup()
+    return _CATEGORY_FILTER_MARKUP
+
+
+def _build_date_filter_keyboard() -> InlineKeyboardMarkup:
+    """Клавиатура выбора периода для фильтра."""
+    return _as_markup([
+        [
+            _mk(text="📅 Сегодня", callback_data="admin:gen_date:today"),
+            _mk(text="📆 Неделя", callback_data="admin:gen_date:week"),
+        ],
+        [
+            _mk(text="🗓 Месяц", callback_data="admin:gen_date:month"),
+            _mk(text="🔄 Все время", callback_data="admin:gen_date:all"),
+        ],
+        [
+            _mk(text="⬅️ Назад", callback_data=_CB_GENERATIONS),
+        ],
+    ])
+
+
+_DATE_FILTER_MARKUP = _build_date_filter_keyboard()
 
 
 def get_date_filter_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура выбора периода для фильтра."""
-    builder = InlineKeyboardBuilder()
-    
-    builder.row(
-        InlineKeyboardButton(text="📅 Сегодня", callback_data="admin:gen_date:today"),
-        InlineKeyboardButton(text="📆 Неделя", callback_data="admin:gen_date:week"),
-    )
-    builder.row(
-        InlineKeyboardButton(text="🗓 Месяц", callback_data="admin:gen_date:month"),
-        InlineKeyboardButton(text="🔄 Все время", callback_data="admin:gen_date:all"),
-    )
-    builder.row(
-        InlineKeyboardButton(text="⬅️ Назад", callback_data="admin:generations"),
-    )
-    
-    return builder.as_markup()
+    return _DATE_FILTER_MARKUP
 
 
 # ============================================================
 # ПЛАТЕЖИ
 # ============================================================
 
+_PAYMENT_BTN_TEXT_TMPL = "%s %d₽ | @%s"
+_PAYMENT_CB_PREFIX = "admin:payment:"
+
+
+def _build_payments_filter_rows(
+    status_filter: Optional[str],
+) -> Tuple[Tuple[InlineKeyboardButton, ...], ...]:
+    """Ряды фильтра платежей по статусу."""
+    return (
+        (
+            _mk(
+                text="✅" + (" Успешные ✓" if status_filter == "completed" else " Успешные"),
+                callback_data="admin:pay_status:completed",
+            ),
+            _mk(
+                text="⏳" + (" Ожидание ✓" if status_filter == "pending" else " Ожидание"),
+                callback_data="admin:pay_status:pending",
+            ),
+        ),
+        (
+            _mk(
+                text="❌" + (" Неудачные ✓" if status_filter == "failed" else " Неудачные"),
+                callback_data="admin:pay_status:failed",
+            ),
+            _mk(text="🔄 Все", callback_data="admin:pay_status:all"),
+        ),
+    )
+
+
+_PAYMENTS_FILTER_ROWS = {
+    key: _build_payments_filter_rows(key)
+    for key in (None, "completed", "pending", "failed")
+}
+
+
 def get_payments_list_keyboard(
     payments: List[Dict[str, Any]],
     page: int,
@@ -645,131 +842,93 @@ def get_payments_list_keyboard(
         total_pages: Всего страниц
         status_filter: Фильтр по статусу
     """
-    builder = InlineKeyboardBuilder()
-    
-    status_icons = {
-        "completed": "✅",
-        "pending": "⏳",
-        "failed": "❌",
-        "refunded": "🔄",
-    }
-    
-    # Платежи
-    for payment in payments:
-        username = payment.get("username") or "Аноним"
-        amount = payment.get("amount", 0) / 100
-        status = payment.get("status", "completed")
-        icon = status_icons.get(status, "❓")
-        payment_id = payment.get("id")
-        
-        builder.row(
-            InlineKeyboardButton(
-                text=f"{icon} {amount:.0f}₽ | @{username}",
-                callback_data=f"admin:payment:{payment_id}",
+    get_icon = _PAYMENT_STATUS_ICONS.get
+    
+    # Платежи: сумма хранится в копейках, в списке — целые рубли
+    rows = [
+        [
+            _mk(
+                text=_PAYMENT_BTN_TEXT_TMPL % (
+                    get_icon(payment.get("status", "completed"), "❓"),
+                    (payment.get("amount", 0) + 50) // 100,
+                    payment.get("username") or _ANON,
+                ),
+                callback_data=_PAYMENT_CB_PREFIX + str(payment.get("id")),
             )
-        )
+        ]
+        for payment in payments
+    ]
     
     # Пагинация
-    nav_buttons = []
-    if page > 1:
-        nav_buttons.append(
-            InlineKeyboardButton(text="◀️", callback_data=f"admin:payments_page:{page-1}")
-        )
-    nav_buttons.append(
-        InlineKeyboardButton(text=f"{page}/{total_pages}", callback_data="admin:pay_info")
-    )
-    if page < total_pages:
-        nav_buttons.append(
-            InlineKeyboardButton(text="▶️", callback_data=f"admin:payments_page:{page+1}")
-        )
-    
-    if nav_buttons:
-        builder.row(*nav_buttons)
+    rows.append(_pagination_row("admin:payments_page", page, total_pages, "admin:pay_info"))
     
     # Фильтр по статусу
-    builder.row(
-        InlineKeyboardButton(
-            text="✅" + (" Успешные ✓" if status_filter == "completed" else " Успешные"),
-            callback_data="admin:pay_status:completed",
-        ),
-        InlineKeyboardButton(
-            text="⏳" + (" Ожидание ✓" if status_filter == "pending" else " Ожидание"),
-            callback_data="admin:pay_status:pending",
-        ),
-    )
-    builder.row(
-        InlineKeyboardButton(
-            text="❌" + (" Неудачные ✓" if status_filter == "failed" else " Неудачные"),
-            callback_data="admin:pay_status:failed",
-        ),
-        InlineKeyboardButton(text="🔄 Все", callback_data="admin:pay_status:all"),
-    )
+    rows.extend(_PAYMENTS_FILTER_ROWS.get(status_filter) or _build_payments_filter_rows(status_filter))
     
     # Назад
-    builder.row(
-        InlineKeyboardButton(text="⬅️ Главное меню", callback_data="admin:main"),
-    )
+    rows.append(_MAIN_MENU_ROW)
     
-    return builder.as_markup()
+    return _as_markup(rows)
+
+
+# Карточка платежа не содержит действий с конкретным платежом
+_PAYMENT_CARD_MARKUP = _as_markup([(_BTN_BACK_PAYMENTS, _BTN_HOME)])
 
 
 def get_payment_card_keyboard(payment_id: int) -> InlineKeyboardMarkup:
     """Клавиатура карточки платежа."""
-    builder = InlineKeyboardBuilder()
-    
-    builder.row(
-        InlineKeyboardButton(text="⬅️ К списку", callback_data="admin:payments"),
-        InlineKeyboardButton(text="🏠 Меню", callback_data="admin:main"),
-    )
-    
-    return builder.as_markup()
+    return _PAYMENT_CARD_MARKUP
 
 
 # ============================================================
 # АНАЛИТИКА
 # ============================================================
 
+def _build_analytics_keyboard() -> InlineKeyboardMarkup:
+    """Клавиатура раздела аналитики."""
+    return _as_markup([
+        [
+            _mk(text="📈 Регистрации", callback_data="admin:analytics_registrations"),
+            _mk(text="💰 Доходы", callback_data="admin:analytics_revenue"),
+        ],
+        [
+            _mk(text="🏷 Категории", callback_data="admin:analytics_categories"),
+            _mk(text="🔄 Конверсия", callback_data="admin:analytics_conversion"),
+        ],
+        _MAIN_MENU_ROW,
+    ])
+
+
+_ANALYTICS_MARKUP = _build_analytics_keyboard()
+
+
 def get_analytics_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура раздела аналитики."""
-    builder = InlineKeyboardBuilder()
-    
-    builder.row(
-        InlineKeyboardButton(text="📈 Регистрации", callback_data="admin:analytics_registrations"),
-        InlineKeyboardButton(text="💰 Доходы", callback_data="admin:analytics_revenue"),
-    )
-    builder.row(
-        InlineKeyboardButton(text="🏷 Категории", callback_data="admin:analytics_categories"),
-        InlineKeyboardButton(text="🔄 Конверсия", callback_data="admin:analytics_conversion"),
-    )
-    builder.row(
-        InlineKeyboardButton(text="⬅️ Главное меню", callback_data="admin:main"),
-    )
-    
-    return builder.as_markup()
+    return _ANALYTICS_MARKUP
 
 
+@lru_cache(maxsize=16)
 def get_analytics_period_keyboard(section: str) -> InlineKeyboardMarkup:
     """Клавиатура выбора периода для аналитики."""
-    builder = InlineKeyboardBuilder()
-    
-    builder.row(
-        InlineKeyboardButton(text="7 дней", callback_data=f"admin:analytics_{section}:7"),
-        InlineKeyboardButton(text="30 дней", callback_data=f"admin:analytics_{section}:30"),
-    )
-    builder.row(
-        InlineKeyboardButton(text="90 дней", callback_data=f"admin:analytics_{section}:90"),
-    )
-    builder.row(
-        InlineKeyboardButton(text="⬅️ Аналитика", callback_data="admin:analytics"),
-    )
-    
-    return builder.as_markup()
+    return _as_markup([
+        [
+            _mk(text="7 дней", callback_data=f"admin:analytics_{section}:7"),
+            _mk(text="30 дней", callback_data=f"admin:analytics_{section}:30"),
+        ],
+        [
+            _mk(text="90 дней", callback_data=f"admin:analytics_{section}:90"),
+        ],
+        [
+            _mk(text="⬅️ Аналитика", callback_data=_CB_ANALYTICS),
+        ],
+    ])
 
 
 # ============================================================
 # НАСТРОЙКИ
 # ============================================================
 
+@lru_cache(maxsize=8)
 def get_settings_keyboard(
     maintenance_mode: bool = False,
     free_generations_enabled: bool = True,
@@ -781,79 +940,77 @@ def get_settings_keyboard(
         maintenance_mode: Включен ли режим обслуживания
         free_generations_enabled: Включены ли бесплатные генерации
     """
-    builder = InlineKeyboardBuilder()
-    
-    # Режим обслуживания
-    builder.row(
-        InlineKeyboardButton(
-            text=f"🔧 Режим обслуживания: {'✅ ВКЛ' if maintenance_mode else '❌ ВЫКЛ'}",
-            callback_data="admin:setting_maintenance",
-        ),
-    )
-    
-    # Бесплатные генерации
-    builder.row(
-        InlineKeyboardButton(
-            text=f"🎁 Бесплатные генерации: {'✅ ВКЛ' if free_generations_enabled else '❌ ВЫКЛ'}",
-            callback_data="admin:setting_free_gen",
-        ),
-    )
-    
-    # Количество бесплатных кредитов
-    builder.row(
-        InlineKeyboardButton(
-            text="💎 Бесплатных кредитов: ...",
-            callback_data="admin:setting_free_credits",
-        ),
-    )
-    
-    # AI провайдеры
-    builder.row(
-        InlineKeyboardButton(
-            text="🤖 Проверить AI провайдеров",
-            callback_data="admin:check_ai",
-        ),
-    )
-    
-    # Очистка статистики прибыли
-    builder.row(
-        InlineKeyboardButton(
-            text="🗑 Сбросить статистику прибыли",
-            callback_data="admin:reset_revenue_stats",
-        ),
-    )
-    
-    # Назад
-    builder.row(
-        InlineKeyboardButton(text="⬅️ Главное меню", callback_data="admin:main"),
-    )
+    return _as_markup([
+        # Режим обслуживания
+        [
+            _mk(
+                text=f"🔧 Режим обслуживания: {'✅ ВКЛ' if maintenance_mode else '❌ ВЫКЛ'}",
+                callback_data="admin:setting_maintenance",
+            ),
+        ],
+        # Бесплатные генерации
+        [
+            _mk(
+                text=f"🎁 Бесплатные генерации: {'✅ ВКЛ' if free_generations_enabled else '❌ ВЫКЛ'}",
+                callback_data="admin:setting_free_gen",
+            ),
+        ],
+        # Количество бесплатных кредитов
+        [
+            _mk(
+                text="💎 Бесплатных кредитов: ...",
+                callback_data="admin:setting_free_credits",
+            ),
+        ],
+        # AI провайдеры
+        [
+            _mk(
+                text="🤖 Проверить AI провайдеров",
+                callback_data="admin:check_ai",
+            ),
+        ],
+        # Очистка статистики прибыли
+        [
+            _mk(
+                text="🗑 Сбросить статистику прибыли",
+                callback_data="admin:reset_revenue_stats",
+            ),
+        ],
+        # Назад
+        _MAIN_MENU_ROW,
+    ])
+
+
+def _build_free_credits_keyboard() -> InlineKeyboardMarkup:
+    """Клавиатура выбора количества бесплатных кредитов."""
+    rows = [
+        [
+            _mk(
+                text=_AMOUNT_TEXTS[amount],
+                callback_data=f"admin:set_free_credits:{amount}",
+            )
+            for amount in chunk
+        ]
+        for chunk in _FREE_CREDITS_CHUNKS
+    ]
+    rows.append([_mk(text="⬅️ Настройки", callback_data=_CB_SETTINGS)])
     
-    return builder.as_markup()
+    return _as_markup(rows)
+
+
+_FREE_CREDITS_MARKUP = _build_free_credits_keyboard()
 
 
 def get_free_credits_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура выбора количества бесплатных кредитов."""
-    builder = InlineKeyboardBuilder()
-    
-    for amount in [0, 1, 2, 3, 5]:
-        builder.button(
-            text=f"{amount} 💎",
-            callback_data=f"admin:set_free_credits:{amount}",
-        )
-    
-    builder.adjust(3)
-    
-    builder.row(
-        InlineKeyboardButton(text="⬅️ Настройки", callback_data="admin:settings"),
-    )
-    
-    return builder.as_markup()
+    return _FREE_CREDITS_MARKUP
 
 
 # ============================================================
 # ЛОГИ
 # ============================================================
 
+@lru_cache(maxsize=8)
 def get_logs_keyboard(
     level_filter: Optional[str] = None,
 ) -> InlineKeyboardMarkup:
@@ -863,72 +1020,133 @@ def get_logs_keyboard(
     Args:
         level_filter: Фильтр по уровню (ERROR, WARNING, INFO)
     """
-    builder = InlineKeyboardBuilder()
-    
-    builder.row(
-        InlineKeyboardButton(
-            text="⚠️ Errors" + (" ✓" if level_filter == "ERROR" else ""),
-            callback_data="admin:logs_level:ERROR",
-        ),
-        InlineKeyboardButton(
-            text="⚡ Warnings" + (" ✓" if level_filter == "WARNING" else ""),
-            callback_data="admin:logs_level:WARNING",
-        ),
-    )
-    builder.row(
-        InlineKeyboardButton(
-            text="ℹ️ Info" + (" ✓" if level_filter == "INFO" else ""),
-            callback_data="admin:logs_level:INFO",
-        ),
-        InlineKeyboardButton(text="🔄 Все", callback_data="admin:logs_level:all"),
-    )
-    builder.row(
-        InlineKeyboardButton(text="📜 Действия админов", callback_data="admin:admin_actions"),
-    )
-    builder.row(
-        InlineKeyboardButton(text="🔄 Обновить", callback_data="admin:logs"),
-        InlineKeyboardButton(text="⬅️ Меню", callback_data="admin:main"),
-    )
-    
-    return builder.as_markup()
-
-
+    return _as_markup([
+        [
+            _mk(
+                text="⚠️ Errors" + (" ✓" if level_filter == "ERROR" else ""),
+                callback_data="admin:logs_level:ERROR",
+            ),
+            _mk(
+                text="⚡ Warnings" + (" ✓" if level_filter == "WARNING" else ""),
+                callback_data="admin:logs_level:WARNING",
+            ),
+        ],
+        [
+            _mk(
+                text="ℹ️ Info" + (" ✓" if level_filter == "INFO" else ""),
+                callback_data="admin:logs_level:INFO",
+            ),
+            _mk(text="🔄 Все", callback_data="admin:logs_level:all"),
+        ],
+        [
+            _mk(text="📜 Действия админов", callback_data="admin:admin_actions"),
+        ],
+        [
+            _mk(text="🔄 Обновить", callback_data=_CB_LOGS),
+            _mk(text="⬅️ Меню", callback_data=_CB_MAIN),
+        ],
+    ])
+
+
+@lru_cache(maxsize=256)
 def get_admin_actions_keyboard(
     page: int = 1,
     total_pages: int = 1,
 ) -> InlineKeyboardMarkup:
     """Клавиатура списка действий администраторов."""
-    builder = InlineKeyboardBuilder()
-    
-    # Пагинация
-    nav_buttons = []
-    if page > 1:
-        nav_buttons.append(
-            InlineKeyboardButton(text="◀️", callback_data=f"admin:actions_page:{page-1}")
-        )
-    nav_buttons.append(
-        InlineKeyboardButton(text=f"{page}/{total_pages}", callback_data="admin:actions_info")
-    )
-    if page < total_pages:
-        nav_buttons.append(
-            InlineKeyboardButton(text="▶️", callback_data=f"admin:actions_page:{page+1}")
-        )
-    
-    if nav_buttons:
-        builder.row(*nav_buttons)
-    
-    builder.row(
-        InlineKeyboardButton(text="⬅️ Логи", callback_data="admin:logs"),
-        InlineKeyboardButton(text="🏠 Меню", callback_data="admin:main"),
-    )
-
-    return builder.as_markup()
+    return _as_markup([
+        # Пагинация
+        _pagination_row("admin:actions_page", page, total_pages, "admin:actions_info"),
+        [
+            _mk(text="⬅️ Логи", callback_data=_CB_LOGS),
+            _BTN_HOME,
+        ],
+    ])
 
 
 # ============================================================
 # ПОДДЕРЖКА
 # ============================================================
 
+_TICKET_CB_PREFIX = "admin:support_ticket:"
+
+_TICKET_STATUS_EMOJI = {
+    "open": "🆕",
+    "in_progress": "⏳",
+    "resolved": "✅",
+    "archived": "📁",
+}
+
+_TICKET_PRIORITY_EMOJI = {
+    "low": "",
+    "medium": "🟡",
+    "high": "🔴",
+}
+
+_TICKET_CATEGORY_EMOJI = {
+    "payment": "💳",
+    "technical": "🔧",
+    "other": "❓",
+}
+
+
+@lru_cache(maxsize=256)
+def _ticket_row_parts(
+    status: str,
+    priority: str,
+    category: str,
+    important: bool,
+) -> Tuple[str, str]:
+    """
+    Неизменные части строки тикета: «🆕 #» и « 💳 🔴 ❗».
+
+    Комбинаций статуса, приоритета и категории немного, поэтому значки
+    ищутся один раз на комбинацию, а в цикле остаётся только склейка.
+    """
+    head = _TICKET_STATUS_EMOJI.get(status, "❓") + " #"
+    tail = " ".join((
+        "",
+        _TICKET_CATEGORY_EMOJI.get(category, "❓"),
+        _TICKET_PRIORITY_EMOJI.get(priority, ""),
+        "❗" if important else "",
+    ))
+    return head, tail
+
+
+def _build_support_filter_rows(
+    status_filter: Optional[str],
+) -> Tuple[Tuple[InlineKeyboardButton, ...], ...]:
+    """Ряды фильтра тикетов по статусу."""
+    return (
+        (
+            _mk(
+                text="🆕 Открытые" + (" ✓" if status_filter == "open" else ""),
+                callback_data="admin:support_filter:open",
+            ),
+            _mk(
+                text="⏳ В работе" + (" ✓" if status_filter == "in_progress" else ""),
+                callback_data="admin:support_filter:in_progress",
+            ),
+        ),
+        (
+            _mk(
+                text="✅ Решённые" + (" ✓" if status_filter == "resolved" else ""),
+                callback_data="admin:support_filter:resolved",
+            ),
+            _mk(
+                text="🔄 Все" + (" ✓" if status_filter is None else ""),
+                callback_data="admin:support_filter:all",
+            ),
+        ),
+    )
+
+
+_SUPPORT_FILTER_ROWS = {
+    key: _build_support_filter_rows(key)
+    for key in (None, "open", "in_progress", "resolved")
+}
+
+
 def get_support_tickets_keyboard(
     tickets: List,
     page: int = 1,
@@ -944,86 +1162,34 @@ def get_support_tickets_keyboard(
         total_pages: Всего страниц
         status_filter: Фильтр по статусу
     """
-    builder = InlineKeyboardBuilder()
-
-    status_emoji = {
-        "open": "🆕",
-        "in_progress": "⏳",
-        "resolved": "✅",
-        "archived": "📁",
-    }
-
-    priority_emoji = {
-        "low": "",
-        "medium": "🟡",
-        "high": "🔴",
-    }
-
-    category_names = {
-        "payment": "💳",
-        "technical": "🔧",
-        "other": "❓",
-    }
+    rows = []
 
     for ticket in tickets:
-        username = ticket.user.username if ticket.user else "Без имени"
-        status = status_emoji.get(ticket.status, "❓")
-        priority = priority_emoji.get(ticket.priority, "")
-        category = category_names.get(ticket.category, "❓")
-        important = "❗" if ticket.is_important else ""
-
-        builder.row(
-            InlineKeyboardButton(
-                text=f"{status} #{ticket.id} | @{username} {category} {priority} {important}",
-                callback_data=f"admin:support_ticket:{ticket.id}",
-            )
+        head, tail = _ticket_row_parts(
+            ticket.status, ticket.priority, ticket.category, bool(ticket.is_important)
         )
+        ticket_id = str(ticket.id)
+        username = ticket.user.username if ticket.user else _NONAME
 
-    # Пагинация
-    if total_pages > 1:
-        nav_buttons = []
-        if page > 1:
-            nav_buttons.append(
-                InlineKeyboardButton(text="◀️", callback_data=f"admin:support_page:{page-1}")
-            )
-        nav_buttons.append(
-            InlineKeyboardButton(text=f"{page}/{total_pages}", callback_data="admin:support_info")
-        )
-        if page < total_pages:
-            nav_buttons.append(
-                InlineKeyboardButton(text="▶️", callback_data=f"admin:support_page:{page+1}")
+        rows.append([
+            _mk(
+                text="".join((head, ticket_id, " | @", str(username), tail)),
+                callback_data=_TICKET_CB_PREFIX + ticket_id,
             )
+        ])
 
-        if nav_buttons:
-            builder.row(*nav_buttons)
+    # Пагинация
+    if total_pages > 1:
+        rows.append(_pagination_row("admin:support_page", page, total_pages, "admin:support_info"))
 
     # Фильтры по статусу
-    builder.row(
-        InlineKeyboardButton(
-            text="🆕 Открытые" + (" ✓" if status_filter == "open" else ""),
-            callback_data="admin:support_filter:open",
-        ),
-        InlineKeyboardButton(
-            text="⏳ В работе" + (" ✓" if status_filter == "in_progress" else ""),
-            callback_data="admin:support_filter:in_progress",
-        ),
-    )
-    builder.row(
-        InlineKeyboardButton(
-            text="✅ Решённые" + (" ✓" if status_filter == "resolved" else ""),
-            callback_data="admin:support_filter:resolved",
-        ),
-        InlineKeyboardButton(
-            text="🔄 Все" + (" ✓" if status_filter is None else ""),
-            callback_data="admin:support_filter:all",
-        ),
+    rows.extend(
+        _SUPPORT_FILTER_ROWS.get(status_filter) or _build_support_filter_rows(status_filter)
     )
 
-    builder.row(
-        InlineKeyboardButton(text="⬅️ Главное меню", callback_data="admin:main"),
-    )
+    rows.append(_MAIN_MENU_ROW)
 
-    return builder.as_markup()
+    return _as_markup(rows)
 
 
 def get_support_ticket_detail_keyboard(ticket) -> InlineKeyboardMarkup:
@@ -1033,104 +1199,109 @@ def get_support_ticket_detail_keyboard(ticket) -> InlineKeyboardMarkup:
     Args:
         ticket: Объект SupportTicket
     """
-    builder = InlineKeyboardBuilder()
+    return _build_ticket_detail_keyboard(
+        ticket.id, ticket.status, bool(ticket.is_important)
+    )
+
 
+@lru_cache(maxsize=512)
+def _build_ticket_detail_keyboard(
+    ticket_id: int,
+    status: str,
+    important: bool,
+) -> InlineKeyboardMarkup:
+    """
+    Собрать клавиатуру тикета.
+
+    Статус и важность входят в ключ кэша, поэтому после изменения
+    тикета берётся новая разметка и сбрасывать кэш не нужно.
+    """
     # Кнопка ответа
-    builder.row(
-        InlineKeyboardButton(
-            text="✍️ Ответить",
-            callback_data=f"admin:support_reply:{ticket.id}",
-        ),
-    )
+    rows = [
+        [
+            _mk(
+                text="✍️ Ответить",
+                callback_data=f"admin:support_reply:{ticket_id}",
+            ),
+        ],
+    ]
 
     # Управление статусом
-    if ticket.status == "open":
-        builder.row(
-            InlineKeyboardButton(
+    if status == "open":
+        rows.append([
+            _mk(
                 text="⏳ Взять в работу",
-                callback_data=f"admin:support_take:{ticket.id}",
+                callback_data=f"admin:support_take:{ticket_id}",
             ),
-        )
-    elif ticket.status == "in_progress":
-        builder.row(
-            InlineKeyboardButton(
+        ])
+    elif status == "in_progress":
+        rows.append([
+            _mk(
                 text="✅ Решить",
-                callback_data=f"admin:support_resolve:{ticket.id}",
+                callback_data=f"admin:support_resolve:{ticket_id}",
             ),
-        )
+        ])
 
     # Важность
-    if not ticket.is_important:
-        builder.row(
-            InlineKeyboardButton(
+    if not important:
+        rows.append([
+            _mk(
                 text="⭐ Отметить важным",
-                callback_data=f"admin:support_important:{ticket.id}",
+                callback_data=f"admin:support_important:{ticket_id}",
             ),
-        )
+        ])
 
     # Архивирование/удаление
-    if ticket.status in ["resolved", "archived"]:
-        if ticket.status != "archived":
-            builder.row(
-                InlineKeyboardButton(
-                    text="📁 Архивировать",
-                    callback_data=f"admin:support_archive:{ticket.id}",
-                ),
-            )
-        else:
-            builder.row(
-                InlineKeyboardButton(
-                    text="🔄 Разархивировать",
-                    callback_data=f"admin:support_reopen:{ticket.id}",
-                ),
-            )
-
-    if ticket.status == "resolved":
-        builder.row(
-            InlineKeyboardButton(
+    if status == "resolved":
+        rows.append([
+            _mk(
+                text="📁 Архивировать",
+                callback_data=f"admin:support_archive:{ticket_id}",
+            ),
+        ])
+        rows.append([
+            _mk(
                 text="🗑 Удалить",
-                callback_data=f"admin:support_delete:{ticket.id}",
+                callback_data=f"admin:support_delete:{ticket_id}",
             ),
-        )
+        ])
+    elif status == "archived":
+        rows.append([
+            _mk(
+                text="🔄 Разархивировать",
+                callback_data=f"admin:support_reopen:{ticket_id}",
+            ),
+        ])
 
-    builder.row(
-        InlineKeyboardButton(text="⬅️ К списку", callback_data="admin:support"),
-        InlineKeyboardButton(text="🏠 Меню", callback_data="admin:main"),
-    )
+    rows.append([_BTN_BACK_SUPPORT, _BTN_HOME])
 
-    return builder.as_markup()
+    return _as_markup(rows)
 
 
+@lru_cache(maxsize=1024)
 def get_cancel_reply_keyboard(ticket_id: int) -> InlineKeyboardMarkup:
-    """Клавиатура отмены ответа."""
-    builder = InlineKeyboardBuilder()
-
-    builder.row(
-        InlineKeyboardButton(text="❌ Отмена", callback_data=f"admin:support_ticket:{ticket_id}"),
-    )
-
-    return builder.as_markup()
+    """Клавиатура отмены ответа (кэшируется по тикету)."""
+    return _as_markup([
+        [_mk(text="❌ Отмена", callback_data=f"{_TICKET_CB_PREFIX}{ticket_id}")],
+    ])
 
 
+@lru_cache(maxsize=1024)
 def get_confirm_reply_keyboard(ticket_id: int) -> InlineKeyboardMarkup:
-    """Клавиатура подтверждения отправки ответа."""
-    builder = InlineKeyboardBuilder()
-
-    builder.row(
-        InlineKeyboardButton(text="✅ Отправить", callback_data=f"admin:support_confirm_reply:{ticket_id}"),
-        InlineKeyboardButton(text="✏️ Изменить", callback_data=f"admin:support_edit_reply:{ticket_id}"),
-    )
-    builder.row(
-        InlineKeyboardButton(text="❌ Отмена", callback_data=f"admin:support_ticket:{ticket_id}"),
-    )
-
-    return builder.as_markup()
+    """Клавиатура подтверждения отправки ответа (кэшируется по тикету)."""
+    return _as_markup([
+        [
+            _mk(text="✅ Отправить", callback_data=f"admin:support_confirm_reply:{ticket_id}"),
+            _mk(text="✏️ Изменить", callback_data=f"admin:support_edit_reply:{ticket_id}"),
+        ],
+        [
+            _mk(text="❌ Отмена", callback_data=f"{_TICKET_CB_PREFIX}{ticket_id}"),
+        ],
+    ])
 
 
 def get_canned_responses_keyboard(ticket_id: int) -> InlineKeyboardMarkup:
     """Клавиатура с шаблонами ответов."""
-    builder = InlineKeyboardBuilder()
-
     canned_responses = [
         ("👋 Приветствие", "hello"),
         ("⏳ В работе", "in_progress"),
@@ -1140,14 +1311,12 @@ def get_canned_responses_keyboard(ticket_id: int) -> InlineKeyboardMarkup:
         ("🔄 Передано в отдел", "forwarded"),
     ]
 
-    for text, key in canned_responses:
-        builder.row(
-            InlineKeyboardButton(text=text, callback_data=f"admin:support_canned:{ticket_id}:{key}"),
-        )
-
-    builder.row(
-        InlineKeyboardButton(text="❌ Отмена", callback_data=f"admin:support_ticket:{ticket_id}"),
-    )
-
-    return builder.as_markup()
+    rows = [
+        [_mk(text=text, callback_data=f"admin:support_canned:{ticket_id}:{key}")]
+        for text, key in canned_responses
+    ]
+    rows.append([
+        _mk(text="❌ Отмена", callback_data=f"admin:support_ticket:{ticket_id}"),
+    ])
 
+    return _as_markup(rows)
@@ -48,20 +48,30 @@ def setup_logging() -> None:
     else:
         renderer = structlog.processors.JSONRenderer()
     
+    # Фильтр уровня первым: отброшенные записи (DEBUG в production)
+    # не проходят остальную цепочку процессоров
+    processors = [
+        structlog.stdlib.filter_by_level,
+        structlog.contextvars.merge_contextvars,
+        structlog.stdlib.add_logger_name,
+        structlog.stdlib.add_log_level,
+        structlog.stdlib.PositionalArgumentsFormatter(),
+        structlog.processors.TimeStamper(fmt="iso"),
+    ]
+    
+    # stack_info используется только при отладке
+    if settings.debug:
+        processors.append(structlog.processors.StackInfoRenderer())
+    
+    processors += [
+        structlog.processors.format_exc_info,
+        structlog.processors.UnicodeDecoder(),
+        renderer,
+    ]
+    
     # Конфигурация structlog
     structlog.configure(
-        processors=[
-            structlog.contextvars.merge_contextvars,
-            structlog.stdlib.filter_by_level,
-            structlog.stdlib.add_logger_name,
-            structlog.stdlib.add_log_level,
-            structlog.stdlib.PositionalArgumentsFormatter(),
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
-            structlog.processors.UnicodeDecoder(),
-            renderer,
-        ],
+        processors=processors,
         wrapper_class=structlog.stdlib.BoundLogger,
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
@@ -91,46 +101,53 @@ def create_directories() -> None:
     )
 
 
-async def on_startup(bot: Bot) -> None:
+# Ссылки на фоновые задачи, чтобы их не собрал GC до завершения
+_background_tasks: set[asyncio.Task] = set()
+
+
+async def notify_admin_started(bot: Bot) -> None:
     """
-    Callback при старте бота.
-    
-    Выполняется один раз при запуске:
-    - Очищает старые временные файлы
-    - Создаёт индексы БД
-    - Запускает backup scheduler
-    - Регистрирует команды бота
-    - Логирует информацию о боте
-    - Уведомляет админа о запуске
+    Уведомить админа о запуске бота.
     
     Args:
         bot: Экземпляр бота
     """
-    from aiogram.types import BotCommand, BotCommandScopeDefault, BotCommandScopeChat
-    
-    # Очистка старых временных файлов (старше 24 часов)
     try:
-        from utils.temp_files import cleanup_old_temp_files
-        deleted_count = cleanup_old_temp_files(max_age_hours=24)
-        if deleted_count > 0:
-            logger.info("old_temp_files_cleaned", files_deleted=deleted_count)
+        mode = "🔧 DEBUG" if settings.debug else "🚀 PRODUCTION"
+        await bot.send_message(
+            chat_id=settings.admin_user_id,
+            text=f"🤖 Бот запущен\n\nРежим: {mode}\nВерсия: 2.0",
+        )
     except Exception as e:
-        logger.warning("failed_to_cleanup_temp_files", error=str(e))
-    
-    # Создание индексов БД
+        logger.warning("failed_to_notify_admin", error=str(e))
+
+
+async def create_indexes() -> None:
+    """Создать индексы БД (ошибки логируются)."""
     try:
         from database.indexes import ensure_indexes
         await ensure_indexes()
     except Exception as e:
         logger.warning("failed_to_create_indexes", error=str(e))
+
+
+async def start_backup_scheduler() -> None:
+    """Запустить планировщик бэкапов (ошибки логируются)."""
+    try:
+        from utils.backup import backup_scheduler
+        await backup_scheduler.start()
+    except Exception as e:
+        logger.warning("failed_to_start_backup_scheduler", error=str(e))
+
+
+async def register_commands(bot: Bot) -> None:
+    """
+    Зарегистрировать команды бота для пользователей и админов.
     
-    # Запуск планировщика бэкапов (только в production)
-    if not settings.debug:
-        try:
-            from utils.backup import backup_scheduler
-            await backup_scheduler.start()
-        except Exception as e:
-            logger.warning("failed_to_start_backup_scheduler", error=str(e))
+    Args:
+        bot: Экземпляр бота
+    """
+    from aiogram.types import BotCommand, BotCommandScopeDefault, BotCommandScopeChat
     
     # Регистрация команд для всех пользователей
     user_commands = [
@@ -165,8 +182,43 @@ async def on_startup(bot: Bot) -> None:
             logger.info("admin_commands_registered", admin_id=admin_id)
         except Exception as e:
             logger.warning("failed_to_register_admin_commands", admin_id=admin_id, error=str(e))
+
+
+async def on_startup(bot: Bot) -> None:
+    """
+    Callback при старте бота.
+    
+    Выполняется один раз при запуске:
+    - Очищает старые временные файлы
+    - Создаёт индексы БД
+    - Запускает backup scheduler
+    - Регистрирует команды бота
+    - Логирует информацию о боте
+    - Уведомляет админа о запуске
+    
+    Независимые сетевые операции выполняются параллельно.
+    
+    Args:
+        bot: Экземпляр бота
+    """
+    # Очистка старых временных файлов (старше 24 часов)
+    try:
+        from utils.temp_files import cleanup_old_temp_files
+        deleted_count = cleanup_old_temp_files(max_age_hours=24)
+        if deleted_count > 0:
+            logger.info("old_temp_files_cleaned", files_deleted=deleted_count)
+    except Exception as e:
+        logger.warning("failed_to_cleanup_temp_files", error=str(e))
+    
+    # Индексы, команды и get_me не зависят друг от друга.
+    # Шаги логируют свои ошибки сами, исключение возможно только от get_me.
+    startup_steps = [create_indexes(), register_commands(bot)]
     
-    bot_info = await bot.get_me()
+    # Запуск планировщика бэкапов (только в production)
+    if not settings.debug:
+        startup_steps.append(start_backup_scheduler())
+    
+    bot_info, *_ = await asyncio.gather(bot.get_me(), *startup_steps)
     
     logger.info(
         "bot_started",
@@ -175,16 +227,11 @@ async def on_startup(bot: Bot) -> None:
         debug_mode=settings.debug,
     )
     
-    # Уведомление админа о запуске
+    # Уведомление админа о запуске (в фоне, не задерживает старт polling)
     if settings.admin_user_id:
-        try:
-            mode = "🔧 DEBUG" if settings.debug else "🚀 PRODUCTION"
-            await bot.send_message(
-                chat_id=settings.admin_user_id,
-                text=f"🤖 Бот запущен\n\nРежим: {mode}\nВерсия: 2.0",
-            )
-        except Exception as e:
-            logger.warning("failed_to_notify_admin", error=str(e))
+        task = asyncio.create_task(notify_admin_started(bot))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
 
 
 async def on_shutdown(bot: Bot) -> None:
@@ -194,6 +241,7 @@ async def on_shutdown(bot: Bot) -> None:
     Выполняется при graceful shutdown:
     - Останавливает backup scheduler
     - Закрывает сессию support бота
+    - Закрывает HTTP клиент AI провайдера
     - Логирует остановку
     - Закрывает сессии
 
@@ -216,6 +264,13 @@ async def on_shutdown(bot: Bot) -> None:
     except Exception as e:
         logger.warning("failed_to_close_support_bot", error=str(e))
 
+    # Закрытие пула соединений с Gemini API
+    try:
+        from core.ai_providers import close_gemini_client
+        await close_gemini_client()
+    except Exception as e:
+        logger.warning("failed_to_close_gemini_client", error=str(e))
+
     # Закрытие соединения с БД
     await close_db()
 
@@ -267,10 +322,13 @@ async def main() -> None:
     logger.info("database_ready")
     
     # Регистрация middleware (порядок важен!)
-    from bot.middleware import DatabaseMiddleware, UserMiddleware, LoggingMiddleware
+    from bot.middleware import UserMiddleware, LoggingMiddleware
     from bot.middlewares.throttling import ThrottlingMiddleware
     from bot.middlewares.album import AlbumMiddleware
     
+    # Логирование - один outer middleware на все апдейты
+    dp.update.outer_middleware(LoggingMiddleware())
+    
     # Album middleware - ПЕРВЫЙ для сбора медиагрупп (несколько фото сразу)
     # Должен быть до throttling, чтобы альбомы обрабатывались как один запрос
     dp.message.middleware(AlbumMiddleware())
@@ -280,17 +338,10 @@ async def main() -> None:
     dp.message.middleware(throttling_middleware)
     dp.callback_query.middleware(throttling_middleware)
     
-    # Логирование
-    dp.message.middleware(LoggingMiddleware())
-    dp.callback_query.middleware(LoggingMiddleware())
-    
-    # База данных
-    dp.message.middleware(DatabaseMiddleware())
-    dp.callback_query.middleware(DatabaseMiddleware())
-    
     # Пользователь
-    dp.message.middleware(UserMiddleware())
-    dp.callback_query.middleware(UserMiddleware())
+    user_middleware = UserMiddleware()
+    dp.message.middleware(user_middleware)
+    dp.callback_query.middleware(user_middleware)
     
     logger.info("middleware_registered")
     
@@ -16,6 +16,7 @@ from aiogram.types import Message, CallbackQuery, TelegramObject
 import structlog
 
 from database import get_or_create_user
+from database.user_cache import cache_user, get_cached_user
 
 
 logger = structlog.get_logger()
@@ -27,6 +28,7 @@ class UserMiddleware(BaseMiddleware):
     
     Добавляет 'user' (модель User) в data обработчика.
     Автоматически создаёт пользователя если его нет в БД.
+    Повторные апдейты в течение USER_CACHE_TTL берут пользователя из кэша.
     """
     
     async def __call__(
@@ -36,17 +38,16 @@ class UserMiddleware(BaseMiddleware):
         data: Dict[str, Any],
     ) -> Any:
         """Получает или создаёт пользователя и добавляет в data."""
-        # Получаем user из события
-        user_tg = None
-        
-        if isinstance(event, Message):
-            user_tg = event.from_user
-        elif isinstance(event, CallbackQuery):
-            user_tg = event.from_user
-        elif hasattr(event, "from_user"):
-            user_tg = getattr(event, "from_user", None)
+        # Получаем user из события (Message и CallbackQuery содержат from_user)
+        user_tg = getattr(event, "from_user", None)
+        user = None
         
         if user_tg:
+            user = get_cached_user(user_tg.id)
+        
+        if user is not None:
+            data["user"] = user
+        elif user_tg:
             try:
                 # get_or_create_user возвращает Tuple[User, bool]
                 user, created = await get_or_create_user(
@@ -55,6 +56,7 @@ class UserMiddleware(BaseMiddleware):
                     first_name=user_tg.first_name,
                 )
                 data["user"] = user
+                cache_user(user)
                 
                 if created:
                     logger.info(
@@ -78,8 +80,7 @@ class UserMiddleware(BaseMiddleware):
                 raise
         
         # Проверяем блокировку пользователя
-        if user and hasattr(user, 'is_blocked') and user.is_blocked:
-            from aiogram.types import Message, CallbackQuery
+        if user and user.is_blocked:
             if isinstance(event, Message):
                 await event.answer("⛔ Ваш аккаунт заблокирован. Обратитесь в поддержку.")
             elif isinstance(event, CallbackQuery):
@@ -95,7 +96,6 @@ class UserMiddleware(BaseMiddleware):
                 error=str(e),
             )
             # Отправляем сообщение пользователю об ошибке
-            from aiogram.types import Message, CallbackQuery
             try:
                 if isinstance(event, Message):
                     await event.answer(
@@ -113,6 +113,9 @@ class LoggingMiddleware(BaseMiddleware):
     Middleware для логирования запросов.
     
     Логирует все входящие обновления для отладки.
+    Регистрируется один раз через dp.update.outer_middleware:
+    пользователя берёт из event_from_user, который заполняет
+    UserContextMiddleware диспетчера.
     """
     
     async def __call__(
@@ -122,33 +125,32 @@ class LoggingMiddleware(BaseMiddleware):
         data: Dict[str, Any],
     ) -> Any:
         """Логирует обновление и вызывает обработчик."""
-        # Определяем тип события
-        event_type = type(event).__name__
+        # Определяем тип события (у Update - тип вложенного события)
+        event_type = getattr(event, "event_type", None) or type(event).__name__
         
         # Извлекаем user_id если есть
-        user_id = None
-        if isinstance(event, (Message, CallbackQuery)):
-            if event.from_user:
-                user_id = event.from_user.id
-        
-        # Логируем запрос
-        log = logger.bind(
-            event_type=event_type,
-            user_id=user_id,
-        )
+        from_user = data.get("event_from_user")
+        user_id = from_user.id if from_user else None
         
-        log.debug("Incoming update")
+        # Логируем запрос (поля передаются напрямую, без bind на каждый апдейт)
+        logger.debug("Incoming update", event_type=event_type, user_id=user_id)
         
         try:
             result = await handler(event, data)
-            log.debug("Update handled successfully")
+            logger.debug("Update handled successfully", event_type=event_type, user_id=user_id)
             return result
         except Exception as e:
-            log.error("Handler failed", error=str(e))
+            logger.error(
+                "Handler failed",
+                event_type=event_type,
+                user_id=user_id,
+                error=str(e),
+            )
             raise
 
 
-# Для совместимости с main.py - DatabaseMiddleware теперь no-op
+# Для совместимости со сторонним кодом - DatabaseMiddleware теперь no-op
+# и не регистрируется в диспетчере (лишний уровень вызова на каждый апдейт)
 class DatabaseMiddleware(BaseMiddleware):
     """
     Заглушка для совместимости.
@@ -7,6 +7,8 @@ Telegram отправляет фотографии из альбома как о
 """
 
 import asyncio
+import time
+from operator import attrgetter
 from typing import Any, Awaitable, Callable, Dict, List, Union
 
 from aiogram import BaseMiddleware
@@ -30,12 +32,16 @@ class AlbumMiddleware(BaseMiddleware):
     3. Передаёт список фото в обработчик через data["album"]
     """
     
-    # Хранилище альбомов: {media_group_id: [messages]}
+    # Хранилище альбомов: {media_group_id: [messages]}.
+    # Блокировки не нужны: между проверкой и изменением словаря нет
+    # await, а event loop выполняет корутины в одном потоке
     _albums: Dict[str, List[Message]] = {}
-    # Блокировки для предотвращения race condition
-    _locks: Dict[str, asyncio.Lock] = {}
+    # Время начала сбора альбомов: {media_group_id: time.monotonic()}
+    _started: Dict[str, float] = {}
     # Задержка ожидания остальных фото альбома (секунды)
     ALBUM_LATENCY: float = 0.5
+    # Альбомы, не забранные за это время, считаются брошенными (секунды)
+    ALBUM_TTL: float = ALBUM_LATENCY * 10
     
     async def __call__(
         self,
@@ -61,53 +67,48 @@ class AlbumMiddleware(BaseMiddleware):
         
         media_group_id = event.media_group_id
         
-        # Создаём lock для этой группы если нет
-        if media_group_id not in self._locks:
-            self._locks[media_group_id] = asyncio.Lock()
+        album = self._albums.get(media_group_id)
         
-        async with self._locks[media_group_id]:
-            # Первое сообщение в группе?
-            is_first = media_group_id not in self._albums
+        if album is not None:
+            # Добавляем в существующий альбом; обработку запустит первое сообщение
+            album.append(event)
             
-            if is_first:
-                # Создаём новый альбом
-                self._albums[media_group_id] = [event]
-                
-                logger.debug(
-                    "album_started",
-                    media_group_id=media_group_id,
-                    user_id=event.from_user.id if event.from_user else 0,
-                )
-            else:
-                # Добавляем в существующий альбом
-                self._albums[media_group_id].append(event)
-                
-                logger.debug(
-                    "album_photo_added",
-                    media_group_id=media_group_id,
-                    count=len(self._albums[media_group_id]),
-                )
-        
-        # Только первое сообщение запускает обработку
-        if not is_first:
+            logger.debug(
+                "album_photo_added",
+                media_group_id=media_group_id,
+                count=len(album),
+            )
             return None
         
-        # Ждём остальные фото альбома
-        await asyncio.sleep(self.ALBUM_LATENCY)
+        # Первое сообщение в группе: создаём новый альбом
+        now = time.monotonic()
+        self._sweep_stale(now)
+        
+        self._albums[media_group_id] = [event]
+        self._started[media_group_id] = now
+        
+        logger.debug(
+            "album_started",
+            media_group_id=media_group_id,
+            user_id=event.from_user.id if event.from_user else 0,
+        )
         
-        # Забираем собранный альбом
         try:
-            async with self._locks[media_group_id]:
-                album = self._albums.pop(media_group_id, [])
+            # Ждём остальные фото альбома
+            await asyncio.sleep(self.ALBUM_LATENCY)
+            
+            # Забираем собранный альбом
+            album = self._albums.pop(media_group_id, [])
         finally:
-            # Гарантированно удаляем lock
-            self._locks.pop(media_group_id, None)
+            # Гарантированно освобождаем группу, даже при отмене ожидания
+            self._release(media_group_id)
         
         if not album:
             return None
         
         # Сортируем по message_id для правильного порядка
-        album.sort(key=lambda m: m.message_id)
+        if len(album) > 1:
+            album.sort(key=attrgetter("message_id"))
         
         logger.info(
             "album_collected",
@@ -122,3 +123,28 @@ class AlbumMiddleware(BaseMiddleware):
         
         # Вызываем handler с первым сообщением и альбомом в data
         return await handler(event, data)
+    
+    @classmethod
+    def _release(cls, media_group_id: str) -> None:
+        """Удалить все данные медиагруппы."""
+        cls._albums.pop(media_group_id, None)
+        cls._started.pop(media_group_id, None)
+    
+    @classmethod
+    def _sweep_stale(cls, now: float) -> None:
+        """
+        Удалить альбомы, которые не были забраны за ALBUM_TTL.
+        
+        Вызывается при старте нового альбома; одновременно собирается
+        лишь несколько альбомов, поэтому проход по ним дешёвый.
+        """
+        stale = [
+            media_group_id
+            for media_group_id, started in cls._started.items()
+            if now - started > cls.ALBUM_TTL
+        ]
+        for media_group_id in stale:
+            cls._release(media_group_id)
+        
+        if stale:
+            logger.warning("album_stale_dropped", count=len(stale))
@@ -4,14 +4,15 @@ Throttling и Rate Limiting middleware.
 Модуль обеспечивает защиту от спама и DDoS:
 - Ограничение частоты запросов на пользователя
 - Гибкая настройка лимитов для разных типов действий
-- Автоматическая очистка старых записей
+- Ленивое вытеснение устаревших записей (TTL)
 - Логирование подозрительной активности
 """
 
+import math
 import time
-from collections import defaultdict
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any, Awaitable, Callable, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 
 from aiogram import BaseMiddleware
 from aiogram.types import Message, CallbackQuery, TelegramObject
@@ -46,29 +47,64 @@ class RateLimitConfig:
     # Порог для логирования подозрительной активности
     suspicious_threshold: int = 50     # Увеличили до 50
     
+    # Время затухания счётчика нарушений (секунды): старые нарушения
+    # забываются, и бан получают только серии нарушений подряд
+    violation_decay_tau: float = 600.0
+    
     # Время жизни записи в кэше (секунды)
     cache_ttl: float = 300.0           # 5 минут
+    
+    # Максимум отслеживаемых пользователей (защита памяти от потока новых ID)
+    max_users: int = 100_000
 
 
-@dataclass  
+@dataclass(slots=True)
 class UserRateState:
-    """Состояние rate limiting для пользователя."""
+    """
+    Состояние rate limiting для пользователя.
+    
+    slots=True: без __dict__ на каждый экземпляр - состояний столько же,
+    сколько активных пользователей.
+    """
     
     last_request: float = 0.0
-    violations: int = 0
     banned_until: float = 0.0
     requests_count: int = 0
     
+    # Счётчик нарушений с экспоненциальным затуханием и время его обновления
+    violations: float = 0.0
+    last_violation: float = 0.0
+    
+    # Корзина генераций (GenerationThrottlingMiddleware), создаётся
+    # при первой генерации
+    generation_bucket: Optional["TokenBucket"] = None
+    
     # Специфичные таймстампы
-    last_generation: float = 0.0
     last_photo: float = 0.0
     last_payment: float = 0.0
+    
+    def decayed_violations(self, now: float, tau: float) -> float:
+        """Значение счётчика нарушений на момент now."""
+        if not self.violations:
+            return 0.0
+        return self.violations * math.exp((self.last_violation - now) / tau)
+    
+    def add_violation(self, now: float, tau: float) -> float:
+        """Учесть нарушение и вернуть новое значение счётчика."""
+        self.violations = self.decayed_violations(now, tau) + 1.0
+        self.last_violation = now
+        return self.violations
 
 
 # ============================================================
 # THROTTLING MIDDLEWARE
 # ============================================================
 
+def _min_interval(rate: float) -> float:
+    """Минимальный интервал (сек) для rate запросов в секунду; 0 - без лимита."""
+    return 1.0 / rate if rate > 0 else 0.0
+
+
 class ThrottlingMiddleware(BaseMiddleware):
     """
     Middleware для ограничения частоты запросов.
@@ -85,8 +121,28 @@ class ThrottlingMiddleware(BaseMiddleware):
             config: Конфигурация лимитов (по умолчанию стандартная)
         """
         self.config = config or RateLimitConfig()
-        self.user_states: Dict[int, UserRateState] = defaultdict(UserRateState)
-        self._last_cleanup = time.time()
+        
+        # Минимальные интервалы считаются один раз, а не на каждый запрос
+        cfg = self.config
+        self._message_limit = ("message", _min_interval(cfg.message_rate))
+        self._photo_limit = ("photo", _min_interval(cfg.photo_rate))
+        self._unknown_limit = ("unknown", self._message_limit[1])
+        self._default_callback_limit = ("callback", _min_interval(cfg.callback_rate))
+        
+        # Таблицы разбора событий: тип события -> обработчик,
+        # префикс callback_data -> (тип действия, интервал)
+        self._event_interval_handlers: Dict[type, Callable[[Any], Tuple[str, float]]] = {
+            CallbackQuery: self._callback_interval,
+            Message: self._message_interval,
+        }
+        self._callback_limits: Dict[str, Tuple[str, float]] = {
+            "category": ("generation", _min_interval(cfg.generation_rate)),
+            "buy": ("payment", _min_interval(cfg.payment_rate)),
+        }
+        
+        # Порядок ключей = порядок last_request: самые старые записи в начале,
+        # поэтому вытеснение по TTL не требует полного обхода
+        self.user_states: "OrderedDict[int, UserRateState]" = OrderedDict()
     
     async def __call__(
         self,
@@ -97,8 +153,10 @@ class ThrottlingMiddleware(BaseMiddleware):
         """Проверяет rate limit и вызывает обработчик."""
         
         # Пропускаем проверку для сообщений из альбома (media_group)
-        # Они будут обработаны AlbumMiddleware как один запрос
-        if isinstance(event, Message) and event.media_group_id:
+        # Они будут обработаны AlbumMiddleware как один запрос.
+        # Типы апдейтов aiogram не наследуются, поэтому достаточно
+        # сравнения type() без обхода MRO в isinstance
+        if type(event) is Message and event.media_group_id:
             # Просто пропускаем throttling для альбомов
             return await handler(event, data)
         
@@ -107,103 +165,116 @@ class ThrottlingMiddleware(BaseMiddleware):
         if not user_id:
             return await handler(event, data)
         
-        # Определяем тип события и соответствующий rate
-        event_type, rate_limit = self._get_event_rate(event, data)
+        # Определяем тип события и минимальный интервал для него
+        event_type, min_interval = self._get_event_interval(event, data)
         
-        # Проверяем rate limit
-        current_time = time.time()
-        state = self.user_states[user_id]
+        # Лимит отключён (rate = 0) - состояние пользователя не нужно
+        if min_interval <= 0:
+            return await handler(event, data)
         
-        # Проверяем бан
-        if state.banned_until > current_time:
-            remaining = int(state.banned_until - current_time)
-            await self._send_rate_limit_message(event, remaining)
-            logger.warning(
-                "rate_limit_banned_user_attempt",
-                user_id=user_id,
-                remaining_seconds=remaining,
-            )
-            return None
+        # Проверяем rate limit (монотонные часы не зависят от перевода времени)
+        current_time = time.monotonic()
+        self._expire_states(current_time)
         
-        # Проверяем rate
-        time_since_last = current_time - state.last_request
-        min_interval = 1.0 / rate_limit if rate_limit > 0 else 0
+        state = self.user_states.get(user_id)
         
-        if time_since_last < min_interval:
-            state.violations += 1
-            
-            # Банним при частых нарушениях (увеличили порог до 15)
-            if state.violations >= 15:
-                state.banned_until = current_time + self.config.ban_duration
+        # Новый пользователь не может быть забанен или превысить лимит,
+        # поэтому его состояние создаётся только после проверок
+        if state is not None:
+            # Проверяем бан
+            if state.banned_until > current_time:
+                remaining = int(state.banned_until - current_time)
+                await self._send_rate_limit_message(event, remaining)
                 logger.warning(
-                    "rate_limit_user_banned",
+                    "rate_limit_banned_user_attempt",
                     user_id=user_id,
-                    violations=state.violations,
-                    ban_duration=self.config.ban_duration,
+                    remaining_seconds=remaining,
                 )
+                return None
             
-            # Логируем подозрительную активность
-            if state.violations >= self.config.suspicious_threshold:
-                logger.error(
-                    "rate_limit_suspicious_activity",
-                    user_id=user_id,
-                    violations=state.violations,
+            # Проверяем rate
+            time_since_last = current_time - state.last_request
+            
+            if time_since_last < min_interval:
+                violations = state.add_violation(
+                    current_time, self.config.violation_decay_tau
                 )
+                
+                # Банним при частых нарушениях (увеличили порог до 15)
+                if violations >= 15:
+                    state.banned_until = current_time + self.config.ban_duration
+                    logger.warning(
+                        "rate_limit_user_banned",
+                        user_id=user_id,
+                        violations=round(violations, 1),
+                        ban_duration=self.config.ban_duration,
+                    )
+                
+                # Логируем подозрительную активность
+                if violations >= self.config.suspicious_threshold:
+                    logger.error(
+                        "rate_limit_suspicious_activity",
+                        user_id=user_id,
+                        violations=round(violations, 1),
+                    )
+                
+                await self._send_rate_limit_message(event)
+                return None
             
-            await self._send_rate_limit_message(event)
-            return None
+            self.user_states.move_to_end(user_id)
+        else:
+            state = self.user_states[user_id] = UserRateState()
+            # Вытесняем давно не активного пользователя при переполнении
+            if len(self.user_states) > self.config.max_users:
+                self.user_states.popitem(last=False)
         
         # Обновляем состояние
         state.last_request = current_time
         state.requests_count += 1
         
-        # Добавляем state в data для использования в хендлерах
+        # Добавляем state и время запроса в data для использования дальше по цепочке
         data["rate_state"] = state
-        
-        # Периодическая очистка кэша
-        if current_time - self._last_cleanup > 300:  # каждые 5 минут
-            await self._cleanup_old_states(current_time)
+        data["request_ts"] = current_time
         
         return await handler(event, data)
     
     def _get_user_id(self, event: TelegramObject) -> Optional[int]:
         """Получить user_id из события."""
-        if isinstance(event, Message) and event.from_user:
-            return event.from_user.id
-        elif isinstance(event, CallbackQuery) and event.from_user:
-            return event.from_user.id
+        cls = type(event)
+        if cls is Message or cls is CallbackQuery:
+            from_user = event.from_user
+            return from_user.id if from_user else None
         return None
     
-    def _get_event_rate(
+    def _get_event_interval(
         self,
         event: TelegramObject,
         data: Dict[str, Any],
-    ) -> tuple[str, float]:
+    ) -> Tuple[str, float]:
         """
-        Определить тип события и соответствующий rate limit.
+        Определить тип события и минимальный интервал между запросами.
         
         Returns:
-            Tuple[event_type, rate_limit]
+            Tuple[event_type, min_interval]
         """
-        if isinstance(event, CallbackQuery):
-            callback_data = event.data or ""
-            
-            # Специфичные callback
-            if callback_data.startswith("category:"):
-                return "generation", self.config.generation_rate
-            elif callback_data.startswith("buy:"):
-                return "payment", self.config.payment_rate
-            else:
-                return "callback", self.config.callback_rate
-        
-        elif isinstance(event, Message):
-            # Фото
-            if event.photo:
-                return "photo", self.config.photo_rate
-            else:
-                return "message", self.config.message_rate
-        
-        return "unknown", self.config.message_rate
+        interval_handler = self._event_interval_handlers.get(type(event))
+        if interval_handler is None:
+            return self._unknown_limit
+        return interval_handler(event)
+    
+    def _callback_interval(self, event: CallbackQuery) -> Tuple[str, float]:
+        """Интервал для callback: специфичные действия определяются по префиксу."""
+        # partition - один проход до первого ":" без создания списка
+        prefix, sep, _ = (event.data or "").partition(":")
+        if not sep:
+            return self._default_callback_limit
+        return self._callback_limits.get(prefix, self._default_callback_limit)
+    
+    def _message_interval(self, event: Message) -> Tuple[str, float]:
+        """Интервал для сообщения: фото ограничиваются отдельно."""
+        if event.photo:
+            return self._photo_limit
+        return self._message_limit
     
     async def _send_rate_limit_message(
         self,
@@ -224,24 +295,31 @@ class ThrottlingMiddleware(BaseMiddleware):
         except Exception as e:
             logger.warning("Failed to send rate limit message", error=str(e))
     
-    async def _cleanup_old_states(self, current_time: float) -> None:
-        """Очистка старых записей из кэша."""
-        self._last_cleanup = current_time
-        ttl = self.config.cache_ttl
+    def _expire_states(self, current_time: float) -> None:
+        """
+        Вытеснить записи старше cache_ttl.
         
-        expired_users = [
-            user_id
-            for user_id, state in self.user_states.items()
-            if (current_time - state.last_request) > ttl
-        ]
+        Записи упорядочены по last_request, поэтому проверяются только
+        устаревшие записи в начале словаря — O(1) амортизированно.
+        """
+        states = self.user_states
+        deadline = current_time - self.config.cache_ttl
+        removed = 0
         
-        for user_id in expired_users:
-            del self.user_states[user_id]
+        # Один проход по значениям до первой свежей записи, затем пакетное
+        # удаление с головы без повторного поиска ключей
+        for state in states.values():
+            if state.last_request >= deadline:
+                break
+            removed += 1
         
-        if expired_users:
+        for _ in range(removed):
+            states.popitem(last=False)
+        
+        if removed:
             logger.debug(
                 "rate_limit_cache_cleanup",
-                removed_count=len(expired_users),
+                removed_count=removed,
             )
     
     def reset_user(self, user_id: int) -> None:
@@ -268,10 +346,12 @@ class ThrottlingMiddleware(BaseMiddleware):
         if not state:
             return {"exists": False}
         
-        current_time = time.time()
+        current_time = time.monotonic()
         return {
             "exists": True,
-            "violations": state.violations,
+            "violations": state.decayed_violations(
+                current_time, self.config.violation_decay_tau
+            ),
             "requests_count": state.requests_count,
             "is_banned": state.banned_until > current_time,
             "banned_until": state.banned_until if state.banned_until > current_time else None,
@@ -283,20 +363,56 @@ class ThrottlingMiddleware(BaseMiddleware):
 # СПЕЦИАЛИЗИРОВАННЫЕ RATE LIMITERS
 # ============================================================
 
+@dataclass(slots=True)
+class TokenBucket:
+    """
+    Корзина токенов пользователя.
+    
+    Токены пополняются со скоростью 1/min_interval до capacity,
+    каждое действие расходует один токен.
+    """
+    
+    tokens: float
+    last_refill: float
+    
+    def consume(self, now: float, min_interval: float, capacity: float) -> float:
+        """
+        Попробовать израсходовать токен.
+        
+        Returns:
+            0.0 если токен списан, иначе сколько секунд ждать следующего
+        """
+        self.tokens = min(capacity, self.tokens + (now - self.last_refill) / min_interval)
+        self.last_refill = now
+        
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 - self.tokens) * min_interval
+
+
 class GenerationThrottlingMiddleware(BaseMiddleware):
     """
     Специализированный throttling для генерации ТЗ.
     
     Более строгие лимиты для дорогих AI операций.
+    
+    После ThrottlingMiddleware корзина хранится в общем UserRateState
+    (data["rate_state"]). Без него (middleware не подключён выше или
+    общий лимит отключён) используются собственные корзины по user_id,
+    поэтому лимит генераций действует всегда.
     """
     
-    def __init__(self, min_interval: float = 10.0):
+    def __init__(self, min_interval: float = 10.0, burst: int = 1):
         """
         Args:
             min_interval: Минимальный интервал между генерациями (сек)
+            burst: Сколько генераций подряд допускается без ожидания
         """
         self.min_interval = min_interval
-        self.last_generation: Dict[int, float] = {}
+        self.burst = float(burst)
+        # Корзины для запросов без общего состояния пользователя
+        self.buckets: Dict[int, TokenBucket] = {}
     
     async def __call__(
         self,
@@ -307,31 +423,39 @@ class GenerationThrottlingMiddleware(BaseMiddleware):
         """Проверяет throttling для генерации."""
         
         # Только для callback генерации
-        if not isinstance(event, CallbackQuery):
+        if type(event) is not CallbackQuery:
             return await handler(event, data)
         
         callback_data = event.data or ""
         if not callback_data.startswith("category:"):
             return await handler(event, data)
         
-        user_id = event.from_user.id if event.from_user else 0
-        if not user_id:
-            return await handler(event, data)
-        
-        current_time = time.time()
-        last_time = self.last_generation.get(user_id, 0)
+        # Состояние пользователя и время запроса от ThrottlingMiddleware
+        state = data.get("rate_state")
+        if state is not None:
+            current_time = data["request_ts"]
+            bucket = state.generation_bucket
+            if bucket is None:
+                bucket = state.generation_bucket = TokenBucket(self.burst, current_time)
+        else:
+            user_id = event.from_user.id if event.from_user else 0
+            if not user_id:
+                return await handler(event, data)
+            
+            current_time = time.monotonic()
+            bucket = self.buckets.get(user_id)
+            if bucket is None:
+                bucket = self.buckets[user_id] = TokenBucket(self.burst, current_time)
         
-        if current_time - last_time < self.min_interval:
-            remaining = int(self.min_interval - (current_time - last_time))
+        # Корзина меняется без await, поэтому блокировка не нужна
+        wait = bucket.consume(current_time, self.min_interval, self.burst)
+        if wait:
             await event.answer(
-                f"⏳ Генерация доступна через {remaining} сек.",
+                f"⏳ Генерация доступна через {int(wait)} сек.",
                 show_alert=True,
             )
             return None
         
-        # Обновляем время последней генерации
-        self.last_generation[user_id] = current_time
-        
         return await handler(event, data)
 
 
@@ -9,8 +9,12 @@
 """
 
 import math
+import time
 from datetime import datetime, timedelta
-from aiogram.types import InlineKeyboardMarkup
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from database import is_unlimited_active
@@ -28,11 +32,48 @@ from config.packages import (
 
 MIN_DAYS_LEFT_FOR_RENEWAL = 7  # За сколько дней до окончания разрешено продление
 
+SECONDS_PER_DAY = 86400
+
+# Начало эпохи для наивных UTC дат из БД
+_EPOCH = datetime(1970, 1, 1)
+
 
 # ============================================================
 # СТАТУС БЕЗЛИМИТНОЙ ПОДПИСКИ
 # ============================================================
 
+def _inactive_status() -> dict:
+    """Статус при неактивной подписке."""
+    return {
+        "is_active": False,
+        "days_left": 0,
+        "can_renew": False,
+        "until_date": None,
+        "until_formatted": "",
+    }
+
+
+@lru_cache(maxsize=4096)
+def _until_cached(until: datetime) -> Tuple[float, str]:
+    """
+    Unix-время окончания подписки и дата для текста.
+
+    Зависят только от until, поэтому при рендеринге меню (несколько
+    вызовов подряд) берутся из кэша.
+    """
+    return (until - _EPOCH).total_seconds(), until.strftime("%d.%m.%Y")
+
+
+def _days_left(until_ts: float, now: float) -> int:
+    """
+    Дней до окончания подписки с округлением вверх.
+
+    Считается от точного текущего времени: округлённое время у границы
+    суток дало бы лишний день и сдвинуло бы порог продления.
+    """
+    return max(0, math.ceil((until_ts - now) / SECONDS_PER_DAY))
+
+
 def get_unlimited_status_text(user: User) -> dict:
     """
     Получить детальный статус безлимитной подписки.
@@ -45,32 +86,13 @@ def get_unlimited_status_text(user: User) -> dict:
         - until_date: datetime или None - дата окончания
         - until_formatted: str - отформатированная дата окончания
     """
-    if not is_unlimited_active(user):
-        return {
-            "is_active": False,
-            "days_left": 0,
-            "can_renew": False,
-            "until_date": None,
-            "until_formatted": "",
-        }
-
-    now = datetime.utcnow()
     until = user.unlimited_until
 
-    if not until:
-        return {
-            "is_active": False,
-            "days_left": 0,
-            "can_renew": False,
-            "until_date": None,
-            "until_formatted": "",
-        }
-
-    delta = until - now
-    days_left = max(0, math.ceil(delta.total_seconds() / 86400))
+    if not until or not is_unlimited_active(user):
+        return _inactive_status()
 
-    # Форматируем дату окончания
-    until_formatted = until.strftime("%d.%m.%Y")
+    until_ts, until_formatted = _until_cached(until)
+    days_left = _days_left(until_ts, time.time())
 
     return {
         "is_active": True,
@@ -81,91 +103,97 @@ def get_unlimited_status_text(user: User) -> dict:
     }
 
 
-def _format_number(num: int) -> str:
-    """Форматирование числа с пробелами (1000 -> 1 000)."""
-    return f"{num:,}".replace(",", " ")
-
-
 # ============================================================
 # ТЕКСТ МЕНЮ
 # ============================================================
 
-def build_packages_menu_text(user: User) -> str:
-    """
-    Построить текст меню пакетов с учётом статуса подписки.
+_MENU_HEADER = (
+    "💳 <b>Пополнение баланса</b>\n"
+    "━━━━━━━━━━━━━━━━━━━━━\n\n"
+)
 
-    Args:
-        user: Пользователь
+_MENU_UNLIMITED_TMPL = (
+    _MENU_HEADER
+    + "👑 <b>Безлимит активен</b>\n"
+    "   До %s (%d дн.)\n\n"
+)
 
-    Returns:
-        Текст сообщения для меню пакетов
-    """
-    unlimited_status = get_unlimited_status_text(user)
+_MENU_CAN_RENEW = (
+    "📦 <b>Безлимит можно продлить!</b>\n\n"
+    f"У вас осталось менее {MIN_DAYS_LEFT_FOR_RENEWAL} дней. "
+    "Вы можете продлить подписку, чтобы не прерывать доступ.\n\n"
+)
 
-    # Заголовок
-    text = (
-        "💳 <b>Пополнение баланса</b>\n"
-        "━━━━━━━━━━━━━━━━━━━━━\n\n"
-    )
+_MENU_NO_RENEW = (
+    "📦 <b>У вас активен безлимит!</b>\n\n"
+    "Вы можете генерировать ТЗ без ограничений.\n"
+    f"Продление доступно когда осталось меньше {MIN_DAYS_LEFT_FOR_RENEWAL} дней.\n\n"
+)
 
-    # Если активен безлимит
-    if unlimited_status["is_active"]:
-        days_left = unlimited_status["days_left"]
-        until_formatted = unlimited_status["until_formatted"]
+_MENU_BALANCE_TMPL = _MENU_HEADER + "%s Ваш баланс: <b>%d</b> кредитов\n\n"
 
-        text += (
-            f"👑 <b>Безлимит активен</b>\n"
-            f"   До {until_formatted} ({days_left} дн.)\n\n"
-        )
+# Описание пакетов по категориям (не зависит от пользователя)
+_MENU_PACKAGES_LIST = (
+    "📦 <b>Выберите пакет:</b>\n\n"
 
-        # Информационный блок
-        if unlimited_status["can_renew"]:
-            text += (
-                "📦 <b>Безлимит можно продлить!</b>\n\n"
-                f"У вас осталось менее {MIN_DAYS_LEFT_FOR_RENEWAL} дней. "
-                "Вы можете продлить подписку, чтобы не прерывать доступ.\n\n"
-            )
-        else:
-            text += (
-                "📦 <b>У вас активен безлимит!</b>\n\n"
-                "Вы можете генерировать ТЗ без ограничений.\n"
-                f"Продление доступно когда осталось меньше {MIN_DAYS_LEFT_FOR_RENEWAL} дней.\n\n"
-            )
-    else:
-        # Текущий баланс (если безлимит не активен)
-        balance_emoji = "🟢" if user.balance >= 5 else "🟡" if user.balance > 0 else "🔴"
-        text += f"{balance_emoji} Ваш баланс: <b>{user.balance}</b> кредитов\n\n"
+    "<b>🎯 Для старта</b>\n"
+    "   <i>Пробный • Старт • Базовый</i>\n\n"
+
+    "<b>⭐ Популярные</b>\n"
+    "   <i>Оптимальный • Профи</i>\n\n"
 
-        # Описание пакетов по категориям
-        text += (
-            "📦 <b>Выберите пакет:</b>\n\n"
+    "<b>💼 Для бизнеса</b>\n"
+    "   <i>Бизнес • Корпоративный</i>\n\n"
 
-            "<b>🎯 Для старта</b>\n"
-            "   <i>Пробный • Старт • Базовый</i>\n\n"
+    "━━━━━━━━━━━━━━━━━━━━━\n"
+    "👑 <b>БЕЗЛИМИТ</b> — неограниченные генерации\n"
+    "   30 дней за 1 790₽ • Без лимитов!\n\n"
 
-            "<b>⭐ Популярные</b>\n"
-            "   <i>Оптимальный • Профи</i>\n\n"
+    "💡 <i>Чем больше пакет — тем выгоднее!</i>\n"
+)
 
-            "<b>💼 Для бизнеса</b>\n"
-            "   <i>Бизнес • Корпоративный</i>\n\n"
 
-            "━━━━━━━━━━━━━━━━━━━━━\n"
-            "👑 <b>БЕЗЛИМИТ</b> — неограниченные генерации\n"
-            "   30 дней за 1 790₽ • Без лимитов!\n\n"
+def build_packages_menu_text(user: User, *, unlimited_status: Optional[dict] = None) -> str:
+    """
+    Построить текст меню пакетов с учётом статуса подписки.
 
-            "💡 <i>Чем больше пакет — тем выгоднее!</i>\n"
+    Args:
+        user: Пользователь
+        unlimited_status: Уже посчитанный get_unlimited_status_text(user)
+
+    Returns:
+        Текст сообщения для меню пакетов
+    """
+    if unlimited_status is None:
+        unlimited_status = get_unlimited_status_text(user)
+
+    # Если активен безлимит
+    if unlimited_status["is_active"]:
+        head = _MENU_UNLIMITED_TMPL % (
+            unlimited_status["until_formatted"],
+            unlimited_status["days_left"],
         )
+        return head + (_MENU_CAN_RENEW if unlimited_status["can_renew"] else _MENU_NO_RENEW)
 
-    return text
+    # Текущий баланс (если безлимит не активен)
+    balance = user.balance
+    balance_emoji = "🟢" if balance >= 5 else "🟡" if balance > 0 else "🔴"
+    return _MENU_BALANCE_TMPL % (balance_emoji, balance) + _MENU_PACKAGES_LIST
 
 
-def get_package_blocked_message(package_id: str, user: User) -> str | None:
+def get_package_blocked_message(
+    package_id: str,
+    user: User,
+    *,
+    unlimited_status: Optional[dict] = None,
+) -> str | None:
     """
     Получить сообщение о блокировке покупки пакета.
 
     Args:
         package_id: ID пакета
         user: Пользователь
+        unlimited_status: Уже посчитанный get_unlimited_status_text(user)
 
     Returns:
         Сообщение о блокировке или None если блокировки нет
@@ -175,7 +203,8 @@ def get_package_blocked_message(package_id: str, user: User) -> str | None:
     if not package:
         return "⚠️ Пакет не найден"
 
-    unlimited_status = get_unlimited_status_text(user)
+    if unlimited_status is None:
+        unlimited_status = get_unlimited_status_text(user)
 
     # Если безлимит не активен - блокировки нет
     if not unlimited_status["is_active"]:
@@ -217,114 +246,106 @@ def get_package_blocked_message(package_id: str, user: User) -> str | None:
 # КЛАВИАТУРА
 # ============================================================
 
-def build_packages_keyboard(user: User, show_back: bool = True) -> InlineKeyboardMarkup:
+def _package_button(pkg, badge: str = "", price: str = "") -> Tuple[str, str]:
+    """Текст и callback_data кнопки пакета кредитов."""
+    savings_text = f" (-{pkg.savings_percent}%)" if pkg.savings_percent > 0 else ""
+    return (
+        f"{badge}{pkg.emoji} {pkg.credits} ТЗ • {price or pkg.price_rub}₽{savings_text}",
+        f"buy:{pkg.id}",
+    )
+
+
+# Пакеты неизменны (frozen dataclass), поэтому кнопки считаются один раз,
+# а кнопки aiogram (frozen pydantic-модели) безопасно переиспользуются
+_mk = InlineKeyboardButton.model_construct
+
+
+def _row(buttons) -> Tuple[InlineKeyboardButton, ...]:
+    """Ряд кнопок из пар (текст, callback_data)."""
+    return tuple(_mk(text=text, callback_data=callback_data) for text, callback_data in buttons)
+
+
+# Ряды меню пакетов: стартовые, популярные, бизнес
+_PACKAGE_ROWS = (
+    _row(_package_button(pkg) for pkg in get_packages_by_category("starter")),
+    _row(
+        _package_button(pkg, badge="🔥 " if pkg.is_popular else "")
+        for pkg in get_packages_by_category("popular")
+    ),
+    _row(
+        _package_button(
+            pkg,
+            badge="💎 " if pkg.is_best_value else "",
+            price=pkg.price_rub_formatted,
+        )
+        for pkg in get_packages_by_category("business")
+    ),
+)
+
+
+def _unlimited_rows() -> Tuple[Tuple[Tuple[InlineKeyboardButton, ...], ...], ...]:
+    """Ряды покупки и продления безлимита (пустые, если тарифа нет)."""
+    unlimited_packages = get_unlimited_packages()
+    if not unlimited_packages:
+        return (), ()
+
+    pkg = unlimited_packages[0]
+    price = pkg.price_rub_formatted
+    callback_data = f"buy:{pkg.id}"
+    return (
+        (_row([(f"👑 БЕЗЛИМИТ {pkg.duration_days} дней • {price}₽", callback_data)]),),
+        (_row([(f"🔄 Продлить на {pkg.duration_days} дней • {price}₽", callback_data)]),),
+    )
+
+
+_UNLIMITED_ROWS, _RENEW_ROWS = _unlimited_rows()
+
+_BTN_UNLIMITED_INFO = _mk(text="ℹ️ Безлимит активен", callback_data="unlimited_info")
+_BTN_HELP = _mk(text="❓ Как это работает", callback_data="packages_help")
+_BTN_TO_MENU = _mk(text="⬅️ В меню", callback_data="show_main_menu")
+_BTN_BACK = _mk(text="⬅️ Назад", callback_data="show_main_menu")
+
+
+def build_packages_keyboard(
+    user: User,
+    show_back: bool = True,
+    *,
+    unlimited_status: Optional[dict] = None,
+) -> InlineKeyboardMarkup:
     """
     Построить клавиатуру пакетов с учётом статуса подписки.
 
+    Раскладка известна заранее, поэтому ряды собираются из готовых
+    кнопок без InlineKeyboardBuilder.
+
     Args:
         user: Пользователь
         show_back: Показывать кнопку "Назад"
+        unlimited_status: Уже посчитанный get_unlimited_status_text(user)
 
     Returns:
         InlineKeyboardMarkup
     """
-    builder = InlineKeyboardBuilder()
-    unlimited_status = get_unlimited_status_text(user)
+    if unlimited_status is None:
+        unlimited_status = get_unlimited_status_text(user)
 
-    # Если активен безлимит
+    # Если активен безлимит: info+help, продление (если можно), назад
     if unlimited_status["is_active"]:
-        # Кнопка информации о подписке
-        builder.button(
-            text="ℹ️ Безлимит активен",
-            callback_data="unlimited_info",
-        )
-
-        # Кнопка справки
-        builder.button(
-            text="❓ Как это работает",
-            callback_data="packages_help",
-        )
-
-        # Если можно продлить - показываем кнопку продления
+        rows = [(_BTN_UNLIMITED_INFO, _BTN_HELP)]
         if unlimited_status["can_renew"]:
-            unlimited_packages = get_unlimited_packages()
-            if unlimited_packages:
-                pkg = unlimited_packages[0]
-                builder.button(
-                    text=f"🔄 Продлить на {pkg.duration_days} дней • {_format_number(pkg.price_rub)}₽",
-                    callback_data=f"buy:{pkg.id}",
-                )
-
-        # Кнопка назад
+            rows.extend(_RENEW_ROWS)
         if show_back:
-            builder.button(
-                text="⬅️ В меню",
-                callback_data="show_main_menu",
-            )
-
-        # Раскладка: 2 в ряд, потом 1 или 2
-        if unlimited_status["can_renew"]:
-            builder.adjust(2, 1, 1)  # info+help, renew, back
-        else:
-            builder.adjust(2, 1)  # info+help, back
+            rows.append((_BTN_TO_MENU,))
 
+    # Обычное меню: стартовые (3 в ряд), популярные и бизнес (по 2 в ряд),
+    # безлимитный тариф (отдельно), справка и назад
     else:
-        # Обычное меню с пакетами
-
-        # Стартовые пакеты (3 в ряд)
-        starter_packages = get_packages_by_category("starter")
-        for pkg in starter_packages:
-            savings_text = f" (-{pkg.savings_percent}%)" if pkg.savings_percent > 0 else ""
-            builder.button(
-                text=f"{pkg.emoji} {pkg.credits} ТЗ • {pkg.price_rub}₽{savings_text}",
-                callback_data=f"buy:{pkg.id}",
-            )
-
-        # Популярные пакеты (2 в ряд)
-        popular_packages = get_packages_by_category("popular")
-        for pkg in popular_packages:
-            badge = "🔥 " if pkg.is_popular else ""
-            savings_text = f" (-{pkg.savings_percent}%)" if pkg.savings_percent > 0 else ""
-            builder.button(
-                text=f"{badge}{pkg.emoji} {pkg.credits} ТЗ • {pkg.price_rub}₽{savings_text}",
-                callback_data=f"buy:{pkg.id}",
-            )
-
-        # Бизнес пакеты (2 в ряд)
-        business_packages = get_packages_by_category("business")
-        for pkg in business_packages:
-            badge = "💎 " if pkg.is_best_value else ""
-            savings_text = f" (-{pkg.savings_percent}%)" if pkg.savings_percent > 0 else ""
-            builder.button(
-                text=f"{badge}{pkg.emoji} {pkg.credits} ТЗ • {_format_number(pkg.price_rub)}₽{savings_text}",
-                callback_data=f"buy:{pkg.id}",
-            )
-
-        # Безлимитный тариф (отдельно)
-        unlimited_packages = get_unlimited_packages()
-        if unlimited_packages:
-            pkg = unlimited_packages[0]
-            builder.button(
-                text=f"👑 БЕЗЛИМИТ {pkg.duration_days} дней • {_format_number(pkg.price_rub)}₽",
-                callback_data=f"buy:{pkg.id}",
-            )
-
-        # Информационные кнопки
-        builder.button(
-            text="❓ Как это работает",
-            callback_data="packages_help",
-        )
-
-        if show_back:
-            builder.button(
-                text="⬅️ Назад",
-                callback_data="show_main_menu",
-            )
+        rows = [*_PACKAGE_ROWS, *_UNLIMITED_ROWS]
+        rows.append((_BTN_HELP, _BTN_BACK) if show_back else (_BTN_HELP,))
 
-        # Раскладка: 3-2-2-1-1/2
-        builder.adjust(3, 2, 2, 1, 2 if show_back else 1)
-
-    return builder.as_markup()
+    # Ряды копируются в списки: без валидации кортежи сериализуются мимо
+    # схемы list[list[...]], и кнопки уходят в Bot API с явными null полями
+    return InlineKeyboardMarkup.model_construct(inline_keyboard=[list(row) for row in rows])
 
 
 def build_unlimited_info_keyboard() -> InlineKeyboardMarkup:
@@ -5,6 +5,8 @@
 избегая создания новых экземпляров при каждом уведомлении.
 """
 
+from functools import cache
+
 import structlog
 from aiogram import Bot
 from aiogram.client.default import DefaultBotProperties
@@ -13,43 +15,47 @@ from aiogram.enums import ParseMode
 
 logger = structlog.get_logger()
 
-# Глобальный экземпляр бота поддержки (lazy initialization)
-_support_bot_instance: Bot | None = None
-
 
-def get_support_bot() -> Bot | None:
+@cache
+def _build_support_bot() -> Bot | None:
     """
-    Получить или создать общий экземпляр бота поддержки.
+    Создать экземпляр бота поддержки (выполняется один раз).
 
-    Использует singleton pattern для переиспользования одного Bot instance
-    вместо создания нового при каждом уведомлении.
+    functools.cache превращает повторные вызовы в поиск по словарю.
+    Исключения не кэшируются, поэтому при ошибке следующий вызов
+    повторит попытку.
 
     Returns:
         Bot instance или None, если токен не настроен
     """
-    global _support_bot_instance
+    # Импортируем настройки (lazy import)
+    from support_bot.config import support_settings
 
-    # Если бот уже создан, возвращаем его
-    if _support_bot_instance is not None:
-        return _support_bot_instance
+    if not support_settings.support_bot_token:
+        logger.warning("support_bot_token_not_configured")
+        return None
 
-    # Импортируем настройки (lazy import)
-    try:
-        from support_bot.config import support_settings
+    bot = Bot(
+        token=support_settings.support_bot_token,
+        default=DefaultBotProperties(parse_mode=ParseMode.HTML),
+    )
 
-        if not support_settings.support_bot_token:
-            logger.warning("support_bot_token_not_configured")
-            return None
+    logger.info("support_bot_instance_created")
+    return bot
 
-        # Создаём экземпляр бота
-        _support_bot_instance = Bot(
-            token=support_settings.support_bot_token,
-            default=DefaultBotProperties(parse_mode=ParseMode.HTML),
-        )
 
-        logger.info("support_bot_instance_created")
-        return _support_bot_instance
+def get_support_bot() -> Bot | None:
+    """
+    Получить или создать общий экземпляр бота поддержки.
+
+    Использует singleton pattern для переиспользования одного Bot instance
+    вместо создания нового при каждом уведомлении.
 
+    Returns:
+        Bot instance или None, если токен не настроен
+    """
+    try:
+        return _build_support_bot()
     except Exception as e:
         logger.error("failed_to_create_support_bot_instance", error=str(e))
         return None
@@ -61,15 +67,20 @@ async def close_support_bot() -> None:
 
     Должен вызываться при graceful shutdown основного бота.
     """
-    global _support_bot_instance
-
-    if _support_bot_instance is not None:
-        try:
-            await _support_bot_instance.session.close()
-            _support_bot_instance = None
-            logger.info("support_bot_instance_closed")
-        except Exception as e:
-            logger.error("failed_to_close_support_bot_session", error=str(e))
+    # Не создаём бота только ради закрытия
+    if not _build_support_bot.cache_info().currsize:
+        return
+
+    bot = _build_support_bot()
+    if bot is None:
+        return
+
+    try:
+        await bot.session.close()
+        _build_support_bot.cache_clear()
+        logger.info("support_bot_instance_closed")
+    except Exception as e:
+        logger.error("failed_to_close_support_bot_session", error=str(e))
 
 
 async def notify_user_via_support_bot(
@@ -5,12 +5,19 @@
 Включает стандартные пакеты и безлимитную подписку.
 """
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from functools import partial
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
 from datetime import datetime, timedelta
 
 
-@dataclass(frozen=True)
+# Производные поля: не передаются в конструктор, не участвуют в сравнении
+_derived = partial(field, init=False, repr=False, compare=False)
+
+
+@dataclass(frozen=True, slots=True)
 class CreditPackage:
     """
     Пакет кредитов для покупки.
@@ -26,6 +33,10 @@ class CreditPackage:
         is_unlimited: Безлимитный тариф
         duration_days: Длительность подписки в днях (для безлимита)
         savings_percent: Процент экономии по сравнению с базовой ценой
+    
+    Производные значения (цены, тексты кнопок и описаний) вычисляются
+    один раз в __post_init__: экземпляры неизменяемы, а slots=True
+    исключает __dict__ (и вместе с ним functools.cached_property).
     """
     id: str
     name: str
@@ -38,69 +49,104 @@ class CreditPackage:
     duration_days: int = 0  # Для безлимитных тарифов
     savings_percent: int = 0  # Процент экономии
     
-    @property
-    def price_per_credit(self) -> float:
-        """Цена за один кредит."""
-        if self.is_unlimited or self.credits <= 0:
-            return 0.0
-        return round(self.price_rub / self.credits, 1)
-    
-    @property
-    def price_kopecks(self) -> int:
-        """Цена в копейках для Telegram API."""
-        return self.price_rub * 100
+    # Цена за один кредит в десятых долях рубля (целочисленное округление)
+    price_per_credit_tenths: int = _derived()
+    # Цена за один кредит
+    price_per_credit: float = _derived()
+    # Цена за один кредит для текстов (26.3)
+    price_per_credit_text: str = _derived()
+    # Цена в рублях с разделением разрядов (1290 -> 1 290)
+    price_rub_formatted: str = _derived()
+    # Цена в копейках для Telegram API
+    price_kopecks: int = _derived()
+    # Название для отображения с бейджем
+    display_name: str = _derived()
+    # Объём пакета: срок подписки или количество ТЗ
+    amount_text: str = _derived()
+    # Текст для кнопки выбора пакета
+    button_text: str = _derived()
+    # Короткий текст для компактных кнопок
+    short_button_text: str = _derived()
+    # Описание для Invoice
+    description: str = _derived()
+    # Отображение количества кредитов
+    credits_display: str = _derived()
+    # Длительность подписки (None для обычных пакетов)
+    expiry_delta: Optional[timedelta] = _derived()
+    # Экономия в рублях относительно базовой цены за кредит
+    savings_rub: int = _derived()
     
-    @property
-    def display_name(self) -> str:
-        """Название для отображения с бейджем."""
-        badge = ""
+    def __post_init__(self) -> None:
+        """Вычислить производные значения (frozen: через object.__setattr__)."""
+        if self.is_unlimited or self.credits <= 0:
+            tenths = 0
+        else:
+            tenths = (self.price_rub * 20 + self.credits) // (self.credits * 2)
+        price_per_credit_text = "%d.%d" % divmod(tenths, 10)
+        
         if self.is_unlimited:
             badge = " ♾️"
         elif self.is_popular:
             badge = " 🔥"
         elif self.is_best_value:
             badge = " 💎"
-        return f"{self.emoji} {self.name}{badge}"
-    
-    @property
-    def button_text(self) -> str:
-        """Текст для кнопки выбора пакета."""
-        if self.is_unlimited:
-            return f"{self.display_name} — {self.duration_days} дней за {self.price_rub}₽"
-        return f"{self.display_name} — {self.credits} ТЗ за {self.price_rub}₽"
-    
-    @property
-    def short_button_text(self) -> str:
-        """Короткий текст для компактных кнопок."""
-        if self.is_unlimited:
-            return f"∞ {self.duration_days}д • {self.price_rub}₽"
-        return f"{self.credits} ТЗ • {self.price_rub}₽"
-    
-    @property
-    def description(self) -> str:
-        """Описание для Invoice."""
+        else:
+            badge = ""
+        display_name = f"{self.emoji} {self.name}{badge}"
+        
         if self.is_unlimited:
-            return (
+            amount_text = f"{self.duration_days} дней"
+            short_button_text = f"∞ {self.duration_days}д • {self.price_rub}₽"
+            description = (
                 f"Безлимитная подписка на {self.duration_days} дней. "
                 f"Неограниченное количество генераций ТЗ."
             )
-        return (
-            f"{self.credits} кредитов для генерации ТЗ. "
-            f"Цена за кредит: {self.price_per_credit}₽"
-        )
-    
-    @property
-    def credits_display(self) -> str:
-        """Отображение количества кредитов."""
-        if self.is_unlimited:
-            return "∞ Безлимит"
-        return f"{self.credits} ТЗ"
+            credits_display = "∞ Безлимит"
+        else:
+            amount_text = f"{self.credits} ТЗ"
+            short_button_text = f"{amount_text} • {self.price_rub}₽"
+            description = (
+                f"{self.credits} кредитов для генерации ТЗ. "
+                f"Цена за кредит: {price_per_credit_text}₽"
+            )
+            credits_display = amount_text
+        
+        derived = {
+            "price_per_credit_tenths": tenths,
+            "price_per_credit": tenths / 10,
+            "price_per_credit_text": price_per_credit_text,
+            "price_rub_formatted": f"{self.price_rub:,}".replace(",", " "),
+            "price_kopecks": self.price_rub * 100,
+            "display_name": display_name,
+            "amount_text": amount_text,
+            "button_text": f"{display_name} — {amount_text} за {self.price_rub}₽",
+            "short_button_text": short_button_text,
+            "description": description,
+            "credits_display": credits_display,
+            "savings_rub": (
+                0
+                if self.is_unlimited
+                else int(self.credits * BASE_PRICE_PER_CREDIT - self.price_rub)
+            ),
+            "expiry_delta": (
+                timedelta(days=self.duration_days)
+                if self.is_unlimited and self.duration_days > 0
+                else None
+            ),
+        }
+        for name, value in derived.items():
+            object.__setattr__(self, name, value)
     
     def get_expiry_date(self) -> Optional[datetime]:
-        """Получить дату окончания подписки (для безлимита)."""
-        if self.is_unlimited and self.duration_days > 0:
-            return datetime.utcnow() + timedelta(days=self.duration_days)
-        return None
+        """
+        Получить дату окончания подписки (для безлимита).
+        
+        Наивная UTC дата - в таком виде даты хранятся в БД.
+        """
+        expiry_delta = self.expiry_delta
+        if expiry_delta is None:
+            return None
+        return datetime.utcnow() + expiry_delta
 
 
 # ============================================================
@@ -113,7 +159,8 @@ BASE_PRICE_PER_CREDIT = 30.0  # Базовая цена за 1 ТЗ
 # ДОСТУПНЫЕ ПАКЕТЫ
 # ============================================================
 
-PACKAGES: Dict[str, CreditPackage] = {
+# Только для чтения: пакеты и все выборки ниже вычисляются один раз при импорте
+PACKAGES: Mapping[str, CreditPackage] = MappingProxyType({
     # Пробный пакет для новичков
     "trial": CreditPackage(
         id="trial",
@@ -197,17 +244,26 @@ PACKAGES: Dict[str, CreditPackage] = {
         duration_days=30,
         savings_percent=100,
     ),
-}
+})
 
 
-# Группировка пакетов для отображения в меню
-PACKAGE_CATEGORIES = {
-    "starter": ["trial", "start", "basic"],  # Для новичков
-    "popular": ["optimal", "pro"],            # Популярные
-    "business": ["business", "enterprise"],   # Для бизнеса
-    "premium": ["unlimited"],                 # Премиум
+# Группировка пакетов для отображения в меню (сразу объекты пакетов)
+PACKAGE_CATEGORIES: Dict[str, Tuple[CreditPackage, ...]] = {
+    "starter": (PACKAGES["trial"], PACKAGES["start"], PACKAGES["basic"]),  # Для новичков
+    "popular": (PACKAGES["optimal"], PACKAGES["pro"]),                     # Популярные
+    "business": (PACKAGES["business"], PACKAGES["enterprise"]),            # Для бизнеса
+    "premium": (PACKAGES["unlimited"],),                                   # Премиум
 }
 
+# Выборки пакетов неизменны, поэтому строятся один раз при импорте
+_ALL_PACKAGES = tuple(PACKAGES.values())
+_REGULAR_PACKAGES = tuple(p for p in _ALL_PACKAGES if not p.is_unlimited)
+_UNLIMITED_PACKAGES = tuple(p for p in _ALL_PACKAGES if p.is_unlimited)
+
+# Обычные пакеты по возрастанию кредитов и ключи для bisect
+_PACKAGES_BY_CREDITS = tuple(sorted(_REGULAR_PACKAGES, key=lambda p: p.credits))
+_CREDIT_KEYS = tuple(p.credits for p in _PACKAGES_BY_CREDITS)
+
 
 def get_package(package_id: str) -> Optional[CreditPackage]:
     """
@@ -222,35 +278,47 @@ def get_package(package_id: str) -> Optional[CreditPackage]:
     return PACKAGES.get(package_id)
 
 
-def get_all_packages() -> List[CreditPackage]:
+def get_all_packages() -> Tuple[CreditPackage, ...]:
     """
     Получить все доступные пакеты.
     
     Returns:
-        List[CreditPackage]: Список всех пакетов
+        Tuple[CreditPackage, ...]: Все пакеты
     """
-    return list(PACKAGES.values())
+    return _ALL_PACKAGES
 
 
-def get_regular_packages() -> List[CreditPackage]:
+def get_regular_packages() -> Tuple[CreditPackage, ...]:
     """Получить только обычные пакеты (без безлимита)."""
-    return [p for p in PACKAGES.values() if not p.is_unlimited]
+    return _REGULAR_PACKAGES
 
 
-def get_unlimited_packages() -> List[CreditPackage]:
+def get_unlimited_packages() -> Tuple[CreditPackage, ...]:
     """Получить только безлимитные пакеты."""
-    return [p for p in PACKAGES.values() if p.is_unlimited]
+    return _UNLIMITED_PACKAGES
 
 
-def get_packages_by_category(category: str) -> List[CreditPackage]:
+def get_packages_by_category(category: str) -> Tuple[CreditPackage, ...]:
     """Получить пакеты по категории."""
-    package_ids = PACKAGE_CATEGORIES.get(category, [])
-    return [PACKAGES[pid] for pid in package_ids if pid in PACKAGES]
+    return PACKAGE_CATEGORIES.get(category, ())
+
+
+def find_package_for_credits(credits: int) -> Optional[CreditPackage]:
+    """
+    Найти наименьший пакет, покрывающий нужное количество кредитов.
+    
+    Args:
+        credits: Сколько кредитов нужно
+        
+    Returns:
+        CreditPackage или None если такого большого пакета нет
+    """
+    index = bisect_left(_CREDIT_KEYS, credits)
+    if index < len(_PACKAGES_BY_CREDITS):
+        return _PACKAGES_BY_CREDITS[index]
+    return None
 
 
 def calculate_savings(package: CreditPackage) -> int:
     """Рассчитать экономию в рублях."""
-    if package.is_unlimited:
-        return 0
-    base_cost = package.credits * BASE_PRICE_PER_CREDIT
-    return int(base_cost - package.price_rub)
+    return package.savings_rub
@@ -5,13 +5,14 @@
 - base.py - абстрактные базовые классы
 - gemini.py - Google Gemini провайдер
 - chain.py - цепочки провайдеров с fallback
+- cache.py - кэш ответов провайдеров
 
 Фабричные функции:
 - create_vision_chain() - создаёт цепочку Vision провайдеров
 - create_text_chain() - создаёт цепочку Text провайдеров
 """
 
-from typing import Optional
+from typing import List, Optional
 
 from core.ai_providers.base import (
     BaseTextProvider,
@@ -19,28 +20,24 @@ from core.ai_providers.base import (
     ProviderResponse,
     ProviderStatus,
 )
+from core.ai_providers.cache import ResponseCache
 from core.ai_providers.chain import (
     ChainConfig,
     TextProviderChain,
     VisionProviderChain,
 )
+from core.ai_providers.gemini import GeminiProvider, close_gemini_client
 
 
-def create_vision_chain(
-    gemini_api_key: Optional[str] = None,
-    use_fast_models: bool = True,
-    config: Optional[ChainConfig] = None,
-) -> VisionProviderChain:
+def _create_providers(gemini_api_key: Optional[str]) -> List[GeminiProvider]:
     """
-    Создаёт цепочку Vision провайдеров.
+    Создать провайдеров для цепочек.
     
-    Args:
-        gemini_api_key: API ключ Google Gemini
-        use_fast_models: Использовать быстрые модели
-        config: Конфигурация цепочки
-        
-    Returns:
-        VisionProviderChain с настроенными провайдерами
+    settings импортируется при вызове: модуль используется и без
+    настроенного окружения (например, только классы цепочек).
+    
+    Raises:
+        ValueError: Если не указан API ключ
     """
     from bot.config import settings
     
@@ -51,13 +48,31 @@ def create_vision_chain(
     
     # Добавляем Gemini если есть валидный ключ
     if gemini_key and not gemini_key.startswith('your_'):
-        from core.ai_providers.gemini import GeminiProvider
         providers.append(GeminiProvider(api_key=gemini_key))
     
     if not providers:
         raise ValueError("Не указан API ключ для AI провайдера")
     
-    return VisionProviderChain(providers=providers, config=config)
+    return providers
+
+
+def create_vision_chain(
+    gemini_api_key: Optional[str] = None,
+    use_fast_models: bool = True,
+    config: Optional[ChainConfig] = None,
+) -> VisionProviderChain:
+    """
+    Создаёт цепочку Vision провайдеров.
+    
+    Args:
+        gemini_api_key: API ключ Google Gemini
+        use_fast_models: Использовать быстрые модели
+        config: Конфигурация цепочки
+        
+    Returns:
+        VisionProviderChain с настроенными провайдерами
+    """
+    return VisionProviderChain(providers=_create_providers(gemini_api_key), config=config)
 
 
 def create_text_chain(
@@ -76,22 +91,7 @@ def create_text_chain(
     Returns:
         TextProviderChain с настроенными провайдерами
     """
-    from bot.config import settings
-    
-    # Используем ключ из settings если не передан
-    gemini_key = gemini_api_key or settings.gemini_api_key
-    
-    providers = []
-    
-    # Добавляем Gemini если есть валидный ключ
-    if gemini_key and not gemini_key.startswith('your_'):
-        from core.ai_providers.gemini import GeminiProvider
-        providers.append(GeminiProvider(api_key=gemini_key))
-    
-    if not providers:
-        raise ValueError("Не указан API ключ для AI провайдера")
-    
-    return TextProviderChain(providers=providers, config=config)
+    return TextProviderChain(providers=_create_providers(gemini_api_key), config=config)
 
 
 __all__ = [
@@ -104,8 +104,12 @@ __all__ = [
     "VisionProviderChain",
     "TextProviderChain",
     "ChainConfig",
+    # Cache
+    "ResponseCache",
     # Factory functions
     "create_vision_chain",
     "create_text_chain",
+    # Shutdown
+    "close_gemini_client",
 ]
 
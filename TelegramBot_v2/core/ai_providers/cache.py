@@ -0,0 +1,71 @@
+"""
+Кэш ответов AI провайдеров.
+
+Ключ - хэш blake2b от частей запроса. Интерфейс кэша асинхронный,
+чтобы in-memory LRU можно было заменить внешним хранилищем (Redis)
+без изменения провайдеров.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Optional, Union
+
+from core.ai_providers.base import ProviderResponse
+
+
+def make_cache_key(*parts: Union[str, bytes]) -> str:
+    """
+    Построить ключ кэша из частей запроса.
+    
+    Каждая часть хэшируется с префиксом длины, поэтому разные наборы
+    частей не склеиваются в одинаковый ключ.
+    
+    Args:
+        parts: Строки и байты запроса (модель, промпты, изображения)
+    
+    Returns:
+        Hex-дайджест blake2b
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode()
+        digest.update(len(part).to_bytes(8, "little"))
+        digest.update(part)
+    
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """
+    In-memory LRU кэш успешных ответов провайдеров.
+    
+    Attributes:
+        maxsize: Максимум записей (старые вытесняются)
+    """
+    
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, ProviderResponse]" = OrderedDict()
+    
+    async def get(self, key: str) -> Optional[ProviderResponse]:
+        """Получить ответ по ключу или None."""
+        response = self._data.get(key)
+        if response is not None:
+            self._data.move_to_end(key)
+        return response
+    
+    async def set(self, key: str, response: ProviderResponse) -> None:
+        """Сохранить ответ, вытеснив самый старый при переполнении."""
+        self._data[key] = response
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Очистить кэш."""
+        self._data.clear()
+    
+    def __len__(self) -> int:
+        return len(self._data)
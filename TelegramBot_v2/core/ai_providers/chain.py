@@ -6,8 +6,9 @@
 """
 
 import asyncio
+import logging
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple, TypeVar, Union
 
 import structlog
 
@@ -21,8 +22,10 @@ from core.ai_providers.base import (
 # Логгер
 logger = structlog.get_logger()
 
+_P = TypeVar("_P", BaseVisionProvider, BaseTextProvider)
 
-@dataclass
+
+@dataclass(slots=True)
 class ChainConfig:
     """
     Конфигурация цепочки провайдеров.
@@ -37,6 +40,56 @@ class ChainConfig:
     fail_fast: bool = False
 
 
+def _build_attempts(
+    providers: Sequence[_P],
+    max_retries: int,
+) -> Tuple[Tuple[_P, str, int, bool], ...]:
+    """
+    Развернуть порядок попыток в плоский список.
+    
+    Каждый элемент - (провайдер, его имя, номер попытки с 1, ждать ли
+    retry_delay после неудачи). Цепочка проходит по нему одним циклом, без
+    вложенного цикла попыток и арифметики на каждой итерации; при
+    max_retries=1 (по умолчанию) это просто список провайдеров без ожиданий.
+    """
+    return tuple(
+        (provider, provider.name, attempt, attempt < max_retries)
+        for provider in providers
+        for attempt in range(1, max_retries + 1)
+    )
+
+
+async def _health_check_providers(
+    providers: Sequence[Union[BaseVisionProvider, BaseTextProvider]],
+    log_event: str,
+) -> Dict[str, ProviderStatus]:
+    """
+    Параллельная проверка доступности провайдеров.
+    
+    Проверки независимы, поэтому выполняются одновременно: общее время
+    равно самой долгой проверке, а не их сумме. Исключение провайдера
+    считается статусом ERROR.
+    """
+    statuses = await asyncio.gather(
+        *(provider.health_check() for provider in providers),
+        return_exceptions=True,
+    )
+    
+    results = {}
+    for provider, status in zip(providers, statuses):
+        if isinstance(status, BaseException):
+            status = ProviderStatus.ERROR
+        results[provider.name] = status
+        
+        logger.debug(
+            log_event,
+            provider=provider.name,
+            status=status.value,
+        )
+    
+    return results
+
+
 class VisionProviderChain:
     """
     Цепочка Vision провайдеров с автоматическим fallback.
@@ -62,6 +115,13 @@ class VisionProviderChain:
         """
         self.providers = providers
         self.config = config or ChainConfig()
+        # Параметры конфигурации, читаемые в цикле попыток, фиксируются
+        # при создании цепочки (как и план попыток)
+        self._attempts = _build_attempts(providers, self.config.max_retries)
+        self._retry_delay = self.config.retry_delay
+        # Уровень проверяется один раз: при выключенном DEBUG отладочные
+        # записи в цикле попыток не собирают kwargs и не идут в structlog
+        self._debug_enabled = logging.getLogger(__name__).isEnabledFor(logging.DEBUG)
         
         logger.info(
             "vision_chain_initialized",
@@ -106,47 +166,49 @@ class VisionProviderChain:
         Raises:
             RuntimeError: Если все провайдеры вернули ошибку
         """
-        errors: List[str] = []
+        # (провайдер, ошибка): строки собираются только если упали все
+        errors: List[Tuple[str, Optional[str]]] = []
         
-        for provider in self.providers:
-            for attempt in range(self.config.max_retries):
+        for provider, provider_name, attempt, retry_after in self._attempts:
+            if self._debug_enabled:
                 logger.debug(
                     "vision_chain_trying_provider",
-                    provider=provider.name,
-                    attempt=attempt + 1,
+                    provider=provider_name,
+                    attempt=attempt,
                     images_count=len(images),
                 )
-                
-                response = await provider.analyze_multiple_images(images, prompt)
-                
-                if response.success:
-                    logger.info(
-                        "vision_chain_success",
-                        provider=provider.name,
-                        attempt=attempt + 1,
-                    )
-                    return response
-                
-                # Запоминаем ошибку
-                error_msg = f"{provider.name}: {response.error_message}"
-                errors.append(error_msg)
-                
-                logger.warning(
-                    "vision_chain_provider_failed",
-                    provider=provider.name,
-                    attempt=attempt + 1,
-                    error=response.error_message,
+            
+            response = await provider.analyze_multiple_images(images, prompt)
+            
+            if response.success:
+                logger.info(
+                    "vision_chain_success",
+                    provider=provider_name,
+                    attempt=attempt,
                 )
-                
-                # Ждём перед повторной попыткой
-                if attempt < self.config.max_retries - 1:
-                    await asyncio.sleep(self.config.retry_delay)
+                return response
+            
+            # Запоминаем ошибку
+            error = response.error_message
+            errors.append((provider_name, error))
+            
+            logger.warning(
+                "vision_chain_provider_failed",
+                provider=provider_name,
+                attempt=attempt,
+                error=error,
+            )
+            
+            # Ждём перед повторной попыткой
+            if retry_after:
+                await asyncio.sleep(self._retry_delay)
         
         # Все провайдеры упали
-        all_errors = "; ".join(errors)
+        error_messages = [f"{name}: {error}" for name, error in errors]
+        all_errors = "; ".join(error_messages)
         logger.error(
             "vision_chain_all_failed",
-            errors=errors,
+            errors=error_messages,
         )
         
         raise RuntimeError(f"Все Vision провайдеры недоступны: {all_errors}")
@@ -158,19 +220,7 @@ class VisionProviderChain:
         Returns:
             Словарь {имя_провайдера: статус}
         """
-        results = {}
-        
-        for provider in self.providers:
-            status = await provider.health_check()
-            results[provider.name] = status
-            
-            logger.debug(
-                "vision_provider_health_check",
-                provider=provider.name,
-                status=status.value,
-            )
-        
-        return results
+        return await _health_check_providers(self.providers, "vision_provider_health_check")
 
 
 class TextProviderChain:
@@ -198,6 +248,13 @@ class TextProviderChain:
         """
         self.providers = providers
         self.config = config or ChainConfig()
+        # Параметры конфигурации, читаемые в цикле попыток, фиксируются
+        # при создании цепочки (как и план попыток)
+        self._attempts = _build_attempts(providers, self.config.max_retries)
+        self._retry_delay = self.config.retry_delay
+        # Уровень проверяется один раз: при выключенном DEBUG отладочные
+        # записи в цикле попыток не собирают kwargs и не идут в structlog
+        self._debug_enabled = logging.getLogger(__name__).isEnabledFor(logging.DEBUG)
         
         logger.info(
             "text_chain_initialized",
@@ -226,52 +283,54 @@ class TextProviderChain:
         Raises:
             RuntimeError: Если все провайдеры вернули ошибку
         """
-        errors: List[str] = []
+        # (провайдер, ошибка): строки собираются только если упали все
+        errors: List[Tuple[str, Optional[str]]] = []
         
-        for provider in self.providers:
-            for attempt in range(self.config.max_retries):
+        for provider, provider_name, attempt, retry_after in self._attempts:
+            if self._debug_enabled:
                 logger.debug(
                     "text_chain_trying_provider",
-                    provider=provider.name,
-                    attempt=attempt + 1,
-                )
-                
-                response = await provider.generate(
-                    prompt=prompt,
-                    system_prompt=system_prompt,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
+                    provider=provider_name,
+                    attempt=attempt,
                 )
-                
-                if response.success:
-                    logger.info(
-                        "text_chain_success",
-                        provider=provider.name,
-                        attempt=attempt + 1,
-                        result_length=len(response.content),
-                    )
-                    return response
-                
-                # Запоминаем ошибку
-                error_msg = f"{provider.name}: {response.error_message}"
-                errors.append(error_msg)
-                
-                logger.warning(
-                    "text_chain_provider_failed",
-                    provider=provider.name,
-                    attempt=attempt + 1,
-                    error=response.error_message,
+            
+            response = await provider.generate(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                max_tokens=max_tokens,
+                temperature=temperature,
+            )
+            
+            if response.success:
+                logger.info(
+                    "text_chain_success",
+                    provider=provider_name,
+                    attempt=attempt,
+                    result_length=len(response.content),
                 )
-                
-                # Ждём перед повторной попыткой
-                if attempt < self.config.max_retries - 1:
-                    await asyncio.sleep(self.config.retry_delay)
+                return response
+            
+            # Запоминаем ошибку
+            error = response.error_message
+            errors.append((provider_name, error))
+            
+            logger.warning(
+                "text_chain_provider_failed",
+                provider=provider_name,
+                attempt=attempt,
+                error=error,
+            )
+            
+            # Ждём перед повторной попыткой
+            if retry_after:
+                await asyncio.sleep(self._retry_delay)
         
         # Все провайдеры упали
-        all_errors = "; ".join(errors)
+        error_messages = [f"{name}: {error}" for name, error in errors]
+        all_errors = "; ".join(error_messages)
         logger.error(
             "text_chain_all_failed",
-            errors=errors,
+            errors=error_messages,
         )
         
         raise RuntimeError(f"Все Text провайдеры недоступны: {all_errors}")
@@ -283,16 +342,4 @@ class TextProviderChain:
         Returns:
             Словарь {имя_провайдера: статус}
         """
-        results = {}
-        
-        for provider in self.providers:
-            status = await provider.health_check()
-            results[provider.name] = status
-            
-            logger.debug(
-                "text_provider_health_check",
-                provider=provider.name,
-                status=status.value,
-            )
-        
-        return results
+        return await _health_check_providers(self.providers, "text_provider_health_check")
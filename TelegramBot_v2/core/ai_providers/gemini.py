@@ -8,7 +8,11 @@ Google Gemini провайдер (Fallback).
 
 import asyncio
 import base64
-from typing import List, Optional
+import hashlib
+import json
+import random
+import time
+from typing import Dict, List, Optional, Tuple
 
 import httpx
 import structlog
@@ -19,10 +23,72 @@ from core.ai_providers.base import (
     ProviderResponse,
     ProviderStatus,
 )
+from core.ai_providers.cache import ResponseCache, make_cache_key
 
 # Логгер
 logger = structlog.get_logger()
 
+# SIMD base64 (libbase64) при наличии pybase64, иначе stdlib
+try:
+    from pybase64 import b64encode_as_string as _b64encode
+except ImportError:
+    def _b64encode(data: bytes) -> str:
+        return base64.b64encode(data).decode("ascii")
+
+# Быстрая (де)сериализация JSON при наличии orjson, иначе stdlib
+try:
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+    
+    _json_loads = json.loads
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Тело запроса проверки доступности (сериализуется один раз)
+_PROBE_BODY = _json_dumps({
+    "contents": [{"parts": [{"text": "ping"}]}],
+    "generationConfig": {"maxOutputTokens": 1},
+})
+
+# Общий HTTP клиент: провайдер создаётся на каждую генерацию, а пул
+# соединений переиспользует TCP+TLS соединения с API между запросами
+_client: Optional[httpx.AsyncClient] = None
+
+_CLIENT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Получить общий HTTP клиент (создаётся при первом запросе)."""
+    global _client
+    
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(limits=_CLIENT_LIMITS)
+    return _client
+
+
+# Кэши системных промптов в Gemini (cachedContents):
+# (модель, хэш промпта) -> (имя кэша, monotonic время истечения)
+_prompt_caches: Dict[Tuple[str, str], Tuple[str, float]] = {}
+
+# Кэш ответов по умолчанию (общий для всех экземпляров провайдера)
+_response_cache = ResponseCache(maxsize=512)
+
+
+async def close_gemini_client() -> None:
+    """
+    Закрыть общий HTTP клиент.
+    
+    Должен вызываться при graceful shutdown бота.
+    """
+    global _client
+    
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        logger.info("gemini_client_closed")
+
 
 class GeminiProvider(BaseVisionProvider, BaseTextProvider):
     """
@@ -44,6 +110,28 @@ class GeminiProvider(BaseVisionProvider, BaseTextProvider):
     
     # API endpoint и модели
     BASE_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+    UPLOAD_URL = "https://generativelanguage.googleapis.com/upload/v1beta/files"
+    FILES_URL = "https://generativelanguage.googleapis.com/v1beta"
+    
+    CACHE_URL = "https://generativelanguage.googleapis.com/v1beta/cachedContents"
+    
+    # Фото крупнее порога загружаются через Files API, мелкие идут inline
+    INLINE_IMAGE_MAX_BYTES = 20 * 1024
+    
+    # Таймаут удаления загруженного файла (секунды)
+    FILE_DELETE_TIMEOUT = 5.0
+    
+    # Context caching: API не кэширует контекст короче ~1-4K токенов
+    PROMPT_CACHE_MIN_CHARS = 8000
+    PROMPT_CACHE_TTL = 3600
+    
+    # Таймаут проверки доступности (секунды)
+    HEALTH_CHECK_TIMEOUT = 5.0
+    
+    # Повтор запроса при временных ошибках API (rate limit, 5xx)
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    MAX_ATTEMPTS = 3
+    RETRY_MAX_DELAY = 30.0
     
     # Модели (используем актуальные имена из API)
     MODEL = "gemini-2.5-flash"
@@ -54,6 +142,7 @@ class GeminiProvider(BaseVisionProvider, BaseTextProvider):
         api_key: str,
         use_pro_model: bool = False,
         timeout: float = 90.0,
+        response_cache: Optional[ResponseCache] = None,
     ):
         """
         Инициализация провайдера Gemini.
@@ -62,10 +151,13 @@ class GeminiProvider(BaseVisionProvider, BaseTextProvider):
             api_key: API ключ Google AI Studio
             use_pro_model: Использовать Pro модель (качественнее, но медленнее)
             timeout: Таймаут запроса в секундах
+            response_cache: Кэш ответов (по умолчанию общий in-memory LRU)
         """
         self.api_key = api_key
         self.timeout = timeout
         self.model = self.MODEL_PRO if use_pro_model else self.MODEL
+        self.response_cache = _response_cache if response_cache is None else response_cache
+        self._endpoint = f"{self.BASE_URL}/{self.model}:generateContent?key={self.api_key}"
         
         logger.debug(
             "gemini_provider_initialized",
@@ -80,7 +172,7 @@ class GeminiProvider(BaseVisionProvider, BaseTextProvider):
         Returns:
             Полный URL для API запроса
         """
-        return f"{self.BASE_URL}/{self.model}:generateContent?key={self.api_key}"
+        return self._endpoint
     
     async def analyze_image(
         self,
@@ -103,6 +195,7 @@ class GeminiProvider(BaseVisionProvider, BaseTextProvider):
         self,
         images: List[bytes],
         prompt: Optional[str] = None,
+        per_image: bool = False,
     ) -> ProviderResponse:
         """
         Анализ нескольких изображений.
@@ -110,6 +203,9 @@ class GeminiProvider(BaseVisionProvider, BaseTextProvider):
         Args:
             images: Список байтов изображений
             prompt: Общий промпт для анализа
+            per_image: Описать каждое фото отдельным параллельным запросом
+                (для независимых описаний; по умолчанию - один запрос
+                со всеми фото)
             
         Returns:
             ProviderResponse с объединённым описанием
@@ -117,18 +213,23 @@ class GeminiProvider(BaseVisionProvider, BaseTextProvider):
         if not prompt:
             prompt = "Опиши подробно что изображено на фото."
         
-        # Формируем parts для запроса
-        parts = []
+        images = images[:5]  # Ограничение 5 фото
         
-        # Добавляем изображения
-        for img_bytes in images[:5]:  # Ограничение 5 фото
-            base64_image = base64.b64encode(img_bytes).decode("utf-8")
-            parts.append({
-                "inline_data": {
-                    "mime_type": "image/jpeg",
-                    "data": base64_image,
-                }
-            })
+        if per_image and len(images) > 1:
+            return await self._analyze_per_image(images, prompt)
+        
+        # Повторный анализ тех же фото с тем же промптом не идёт в сеть
+        cache_key = make_cache_key("vision", self.model, prompt, *images)
+        cached = await self.response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Формируем parts для запроса: изображения загружаются параллельно
+        image_parts = await asyncio.gather(
+            *(self._image_part(img_bytes) for img_bytes in images)
+        )
+        parts = [part for part, _ in image_parts]
+        uploaded_files = [file_name for _, file_name in image_parts if file_name]
         
         # Добавляем текстовый промпт
         parts.append({"text": prompt})
@@ -147,84 +248,185 @@ class GeminiProvider(BaseVisionProvider, BaseTextProvider):
         }
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    self._get_endpoint(),
-                    json=request_body,
-                )
-                response.raise_for_status()
-                data = response.json()
-            
-            # Извлекаем текст из ответа
-            result_text = self._extract_text(data)
-            
-            if not result_text:
-                return ProviderResponse(
-                    success=False,
-                    content="",
-                    provider_name=self.name,
-                    error_message="Пустой ответ от Gemini",
-                )
-            
-            logger.info(
-                "gemini_vision_success",
-                model=self.model,
-                images_count=len(images),
-                result_length=len(result_text),
-            )
-            
-            return ProviderResponse(
-                success=True,
-                content=result_text,
-                provider_name=self.name,
-                metadata={"model": self.model},
-            )
-            
-        except httpx.TimeoutException:
-            error_msg = f"Таймаут запроса ({self.timeout}s)"
-            logger.error("gemini_vision_timeout", timeout=self.timeout)
-            
-            return ProviderResponse(
-                success=False,
-                content="",
-                provider_name=self.name,
-                error_message=error_msg,
-            )
-            
-        except httpx.HTTPStatusError as e:
-            error_msg = f"HTTP ошибка: {e.response.status_code}"
-            
-            # Пробуем получить детали ошибки
-            try:
-                error_data = e.response.json()
-                if "error" in error_data:
-                    error_msg = error_data["error"].get("message", error_msg)
-            except Exception:
-                pass
+            data, error = await self._post_json(request_body, "gemini_vision")
+        finally:
+            # Фото пользователей не остаются в хранилище проекта
+            if uploaded_files:
+                await self._delete_files(uploaded_files)
+        
+        if error is not None:
+            return self._error_response(error)
+        
+        # Извлекаем текст из ответа
+        result_text = self._extract_text(data)
+        
+        if not result_text:
+            return self._error_response("Пустой ответ от Gemini")
+        
+        logger.info(
+            "gemini_vision_success",
+            model=self.model,
+            images_count=len(images),
+            result_length=len(result_text),
+        )
+        
+        response = ProviderResponse(
+            success=True,
+            content=result_text,
+            provider_name=self.name,
+            metadata={"model": self.model},
+        )
+        await self.response_cache.set(cache_key, response)
+        return response
+    
+    async def _analyze_per_image(self, images: List[bytes], prompt: str) -> ProviderResponse:
+        """
+        Параллельный анализ фото по одному.
+        
+        Время ответа - по самому долгому фото, а не сумма. Описания
+        успешных фото объединяются в исходном порядке.
+        
+        Args:
+            images: Список байтов изображений
+            prompt: Промпт для каждого фото
             
-            logger.error(
-                "gemini_vision_http_error",
-                status_code=e.response.status_code,
-                error=error_msg,
-            )
+        Returns:
+            ProviderResponse с объединёнными описаниями или первой ошибкой
+        """
+        results = await asyncio.gather(
+            *(self.analyze_image(img_bytes, prompt) for img_bytes in images),
+            return_exceptions=True,
+        )
+        
+        contents = []
+        error_message = None
+        for result in results:
+            if isinstance(result, BaseException):
+                error_message = error_message or str(result)
+            elif result.success:
+                contents.append(result.content)
+            else:
+                error_message = error_message or result.error_message
+        
+        if not contents:
+            return self._error_response(error_message or "Пустой ответ от Gemini")
+        
+        logger.info(
+            "gemini_vision_per_image_success",
+            model=self.model,
+            images_count=len(images),
+            failed_count=len(images) - len(contents),
+        )
+        
+        return ProviderResponse(
+            success=True,
+            content="\n\n".join(contents),
+            provider_name=self.name,
+            metadata={"model": self.model},
+        )
+    
+    async def _upload_image(self, image_bytes: bytes) -> Optional[Tuple[str, str]]:
+        """
+        Загрузить изображение через Files API.
+        
+        Загруженный файл хранится в проекте Gemini (до 48 часов) и
+        занимает его квоту, поэтому после запроса он удаляется через
+        _delete_files.
+        
+        Args:
+            image_bytes: Байты изображения (JPEG)
             
-            return ProviderResponse(
-                success=False,
-                content="",
-                provider_name=self.name,
-                error_message=error_msg,
+        Returns:
+            (имя файла, URI файла) или None при ошибке
+        """
+        try:
+            response = await _get_client().post(
+                self.UPLOAD_URL,
+                params={"key": self.api_key},
+                headers={
+                    "X-Goog-Upload-Protocol": "raw",
+                    "Content-Type": "image/jpeg",
+                },
+                content=image_bytes,
+                timeout=self.timeout,
             )
+            response.raise_for_status()
+            uploaded = _json_loads(response.content)["file"]
+            return uploaded["name"], uploaded["uri"]
             
         except Exception as e:
-            error_msg = str(e)
-            logger.error("gemini_vision_error", error=error_msg)
-            
-            return ProviderResponse(
-                success=False,
-                content="",
-                provider_name=self.name,
-                error_message=error_msg,
+            logger.warning(
+                "gemini_upload_error",
+                size=len(image_bytes),
+                error=str(e),
             )
+            return None
+    
+    async def _image_part(self, image_bytes: bytes) -> Tuple[dict, Optional[str]]:
+        """
+        Сформировать part запроса для изображения.
+        
+        Крупные фото передаются ссылкой на Files API без base64 (+33% к
+        объёму), мелкие и не загрузившиеся - inline. Крупные кодируются
+        в отдельном потоке.
+        
+        Args:
+            image_bytes: Байты изображения (JPEG)
+            
+        Returns:
+            (part с file_data или inline_data, имя загруженного файла или None)
+        """
+        if len(image_bytes) > self.INLINE_IMAGE_MAX_BYTES:
+            uploaded = await self._upload_image(image_bytes)
+            if uploaded:
+                file_name, file_uri = uploaded
+                return {
+                    "file_data": {
+                        "mime_type": "image/jpeg",
+                        "file_uri": file_uri,
+                    }
+                }, file_name
+            # Кодирование крупного фото не блокирует event loop
+            data = await asyncio.to_thread(_b64encode, image_bytes)
+        else:
+            data = _b64encode(image_bytes)
+        
+        return {
+            "inline_data": {
+                "mime_type": "image/jpeg",
+                "data": data,
+            }
+        }, None
+    
+    async def _delete_files(self, file_names: List[str]) -> None:
+        """
+        Удалить загруженные файлы из Files API (best effort).
+        
+        Ошибки только логируются: неудалённый файл истечёт на сервере сам.
+        
+        Args:
+            file_names: Имена файлов вида files/<id>
+        """
+        results = await asyncio.gather(
+            *(
+                _get_client().delete(
+                    f"{self.FILES_URL}/{file_name}",
+                    params={"key": self.api_key},
+                    timeout=self.FILE_DELETE_TIMEOUT,
+                )
+                for file_name in file_names
+            ),
+            return_exceptions=True,
+        )
+        
+        for file_name, result in zip(file_names, results):
+            if isinstance(result, BaseException):
+                error = str(result)
+            elif result.is_error:
+                error = f"HTTP {result.status_code}"
+            else:
+                continue
+            logger.warning("gemini_file_delete_error", file=file_name, error=error)
     
     async def generate(
         self,
@@ -244,7 +446,37 @@ class GeminiProvider(BaseVisionProvider, BaseTextProvider):
             
         Returns:
             ProviderResponse с сгенерированным текстом
+        
+        Note:
+            Успешные ответы при temperature=0 кэшируются в общем кэше
+            ответов (единственный кэш текста; цепочки своего не держат).
+            Сейчас ни один вызывающий код не передаёт temperature=0
+            (генератор использует 0.7), поэтому этот путь не задействован.
         """
+        # При temperature>0 повторный запрос должен дать новый вариант
+        cache_key = None
+        if temperature == 0.0:
+            cache_key = make_cache_key(
+                "text", self.model, system_prompt or "", prompt, str(max_tokens)
+            )
+            cached = await self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        response = await self._generate(prompt, system_prompt, max_tokens, temperature)
+        
+        if cache_key is not None and response.success:
+            await self.response_cache.set(cache_key, response)
+        return response
+    
+    async def _generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+    ) -> ProviderResponse:
+        """Запрос генерации текста к API (без кэша ответов)."""
         # Формируем тело запроса
         request_body = {
             "contents": [
@@ -262,59 +494,97 @@ class GeminiProvider(BaseVisionProvider, BaseTextProvider):
         
         # Добавляем системный промпт если есть
         if system_prompt:
-            request_body["systemInstruction"] = {
-                "parts": [
-                    {"text": system_prompt}
-                ]
-            }
+            await self._apply_system_prompt(request_body, system_prompt)
+        
+        data, error = await self._post_json(request_body, "gemini_text", system_prompt)
+        if error is not None:
+            return self._error_response(error)
+        
+        # Извлекаем текст из ответа
+        result_text = self._extract_text(data)
         
+        if not result_text:
+            return self._error_response("Пустой ответ от Gemini")
+        
+        logger.info(
+            "gemini_text_success",
+            model=self.model,
+            result_length=len(result_text),
+        )
+        
+        return ProviderResponse(
+            success=True,
+            content=result_text,
+            provider_name=self.name,
+            metadata={"model": self.model},
+        )
+    
+    async def _post_json(
+        self,
+        request_body: dict,
+        log_prefix: str,
+        system_prompt: Optional[str] = None,
+    ) -> Tuple[Optional[dict], Optional[str]]:
+        """
+        Запрос generateContent с обработкой ошибок.
+        
+        Args:
+            request_body: Тело запроса
+            log_prefix: Префикс событий лога (gemini_vision / gemini_text)
+            system_prompt: Системный промпт запроса (для пересоздания кэша)
+            
+        Returns:
+            (JSON ответа, None) при успехе или (None, сообщение об ошибке)
+        """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    self._get_endpoint(),
-                    json=request_body,
+            for attempt in range(1, self.MAX_ATTEMPTS + 1):
+                response = await _get_client().post(
+                    self._endpoint,
+                    content=_json_dumps(request_body),
+                    headers=_JSON_HEADERS,
+                    timeout=self.timeout,
                 )
-                response.raise_for_status()
-                data = response.json()
-            
-            # Извлекаем текст из ответа
-            result_text = self._extract_text(data)
-            
-            if not result_text:
-                return ProviderResponse(
-                    success=False,
-                    content="",
-                    provider_name=self.name,
-                    error_message="Пустой ответ от Gemini",
+                
+                # Кэш истёк или удалён на сервере - пересоздаём и повторяем
+                if response.status_code == 404 and "cachedContent" in request_body:
+                    _prompt_caches.pop(self._prompt_cache_key(system_prompt), None)
+                    await self._apply_system_prompt(request_body, system_prompt)
+                    response = await _get_client().post(
+                        self._endpoint,
+                        content=_json_dumps(request_body),
+                        headers=_JSON_HEADERS,
+                        timeout=self.timeout,
+                    )
+                
+                if (
+                    response.status_code not in self.RETRY_STATUSES
+                    or attempt == self.MAX_ATTEMPTS
+                ):
+                    break
+                
+                delay = self._retry_delay(response, attempt)
+                if delay is None:
+                    break
+                
+                logger.warning(
+                    f"{log_prefix}_retry",
+                    status_code=response.status_code,
+                    attempt=attempt,
+                    delay=round(delay, 2),
                 )
+                await asyncio.sleep(delay)
             
-            logger.info(
-                "gemini_text_success",
-                model=self.model,
-                result_length=len(result_text),
-            )
-            
-            return ProviderResponse(
-                success=True,
-                content=result_text,
-                provider_name=self.name,
-                metadata={"model": self.model},
-            )
+            response.raise_for_status()
+            return _json_loads(response.content), None
             
         except httpx.TimeoutException:
-            error_msg = f"Таймаут запроса ({self.timeout}s)"
-            logger.error("gemini_text_timeout", timeout=self.timeout)
-            
-            return ProviderResponse(
-                success=False,
-                content="",
-                provider_name=self.name,
-                error_message=error_msg,
-            )
+            logger.error(f"{log_prefix}_timeout", timeout=self.timeout)
+            return None, f"Таймаут запроса ({self.timeout}s)"
             
         except httpx.HTTPStatusError as e:
             error_msg = f"HTTP ошибка: {e.response.status_code}"
             
+            # Пробуем получить детали ошибки
             try:
                 error_data = e.response.json()
                 if "error" in error_data:
@@ -323,28 +593,122 @@ class GeminiProvider(BaseVisionProvider, BaseTextProvider):
                 pass
             
             logger.error(
-                "gemini_text_http_error",
+                f"{log_prefix}_http_error",
                 status_code=e.response.status_code,
                 error=error_msg,
             )
-            
-            return ProviderResponse(
-                success=False,
-                content="",
-                provider_name=self.name,
-                error_message=error_msg,
-            )
+            return None, error_msg
             
         except Exception as e:
             error_msg = str(e)
-            logger.error("gemini_text_error", error=error_msg)
+            logger.error(f"{log_prefix}_error", error=error_msg)
+            return None, error_msg
+    
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> Optional[float]:
+        """
+        Пауза перед повтором запроса.
+        
+        Берётся из заголовка Retry-After, иначе экспоненциальная
+        с небольшим случайным разбросом.
+        
+        Args:
+            response: Ответ с временной ошибкой
+            attempt: Номер неудавшейся попытки (с 1)
             
-            return ProviderResponse(
-                success=False,
-                content="",
-                provider_name=self.name,
-                error_message=error_msg,
+        Returns:
+            Пауза в секундах или None, если ждать дольше RETRY_MAX_DELAY
+        """
+        try:
+            delay = float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            delay = 0.5 * 2 ** (attempt - 1) + random.random() * 0.25
+        
+        return delay if delay <= self.RETRY_MAX_DELAY else None
+    
+    def _error_response(self, error_message: str) -> ProviderResponse:
+        """Ответ с ошибкой от этого провайдера."""
+        return ProviderResponse(
+            success=False,
+            content="",
+            provider_name=self.name,
+            error_message=error_message,
+        )
+    
+    def _prompt_cache_key(self, system_prompt: str) -> Tuple[str, str]:
+        """Ключ кэша системного промпта для текущей модели."""
+        digest = hashlib.blake2b(system_prompt.encode(), digest_size=16).hexdigest()
+        return self.model, digest
+    
+    async def _ensure_cache(self, system_prompt: str) -> Optional[str]:
+        """
+        Получить кэш системного промпта в Gemini (cachedContents).
+        
+        Длинный системный промпт кэшируется на сервере, чтобы не
+        передавать и не тарифицировать его заново в каждом запросе.
+        
+        Args:
+            system_prompt: Системный промпт
+            
+        Returns:
+            Имя кэша или None, если промпт короткий или кэш не создан
+        """
+        if len(system_prompt) < self.PROMPT_CACHE_MIN_CHARS:
+            return None
+        
+        key = self._prompt_cache_key(system_prompt)
+        now = time.monotonic()
+        
+        cached = _prompt_caches.get(key)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        
+        try:
+            response = await _get_client().post(
+                self.CACHE_URL,
+                params={"key": self.api_key},
+                content=_json_dumps({
+                    "model": f"models/{self.model}",
+                    "systemInstruction": {
+                        "parts": [
+                            {"text": system_prompt}
+                        ]
+                    },
+                    "ttl": f"{self.PROMPT_CACHE_TTL}s",
+                }),
+                headers=_JSON_HEADERS,
+                timeout=self.timeout,
             )
+            response.raise_for_status()
+            cache_name = _json_loads(response.content)["name"]
+            
+        except Exception as e:
+            logger.warning("gemini_cache_error", model=self.model, error=str(e))
+            return None
+        
+        # Запас в минуту до истечения TTL на сервере
+        _prompt_caches[key] = (cache_name, now + self.PROMPT_CACHE_TTL - 60)
+        return cache_name
+    
+    async def _apply_system_prompt(self, request_body: dict, system_prompt: str) -> None:
+        """
+        Добавить системный промпт в запрос: ссылкой на кэш или текстом.
+        
+        Args:
+            request_body: Тело запроса generateContent
+            system_prompt: Системный промпт
+        """
+        cache_name = await self._ensure_cache(system_prompt)
+        
+        if cache_name:
+            request_body.pop("systemInstruction", None)
+            request_body["cachedContent"] = cache_name
+        else:
+            request_body.pop("cachedContent", None)
+            request_body["systemInstruction"] = {
+                "parts": [
+                    {"text": system_prompt}
+                ]
+            }
     
     def _extract_text(self, response_data: dict) -> str:
         """
@@ -357,23 +721,18 @@ class GeminiProvider(BaseVisionProvider, BaseTextProvider):
             Извлечённый текст или пустая строка
         """
         try:
-            candidates = response_data.get("candidates", [])
-            if not candidates:
-                return ""
-            
-            content = candidates[0].get("content", {})
-            parts = content.get("parts", [])
+            parts = response_data["candidates"][0]["content"]["parts"]
             
-            if not parts:
-                return ""
+            # Обычный ответ - одна текстовая часть
+            if len(parts) == 1:
+                return parts[0].get("text", "")
             
             # Собираем текст из всех частей
-            texts = []
-            for part in parts:
-                if "text" in part:
-                    texts.append(part["text"])
+            return "\n".join(part["text"] for part in parts if "text" in part)
             
-            return "\n".join(texts)
+        except (KeyError, IndexError):
+            # Нет кандидатов или частей (например, ответ заблокирован)
+            return ""
             
         except Exception as e:
             logger.warning("gemini_extract_text_error", error=str(e))
@@ -387,20 +746,29 @@ class GeminiProvider(BaseVisionProvider, BaseTextProvider):
             ProviderStatus с текущим состоянием
         """
         try:
-            response = await self.generate(
-                prompt="Say 'OK'",
-                max_tokens=10,
-                temperature=0.0,
-            )
-            
-            if response.success:
-                return ProviderStatus.AVAILABLE
-            
-            error_lower = (response.error_message or "").lower()
-            if "rate" in error_lower or "quota" in error_lower:
-                return ProviderStatus.RATE_LIMITED
-            
-            return ProviderStatus.ERROR
-            
+            return await self._probe()
         except Exception:
             return ProviderStatus.ERROR
+    
+    async def _probe(self) -> ProviderStatus:
+        """
+        Минимальный запрос к API для проверки доступности.
+        
+        Статус определяется по HTTP коду ответа, без разбора текста
+        и без кэша ответов.
+        
+        Returns:
+            ProviderStatus по коду ответа
+        """
+        response = await _get_client().post(
+            self._endpoint,
+            content=_PROBE_BODY,
+            headers=_JSON_HEADERS,
+            timeout=self.HEALTH_CHECK_TIMEOUT,
+        )
+        
+        if response.status_code == 200:
+            return ProviderStatus.AVAILABLE
+        if response.status_code == 429:
+            return ProviderStatus.RATE_LIMITED
+        return ProviderStatus.ERROR
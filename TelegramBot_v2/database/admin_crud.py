@@ -29,6 +29,7 @@ from database.models import (
     Payment,
     User,
 )
+from database.user_cache import invalidates_user_cache
 
 
 logger = structlog.get_logger()
@@ -431,6 +432,7 @@ async def get_user_full_info(telegram_id: int) -> Optional[Dict[str, Any]]:
         }
 
 
+@invalidates_user_cache
 async def admin_add_credits(
     admin_id: int,
     telegram_id: int,
@@ -477,6 +479,7 @@ async def admin_add_credits(
         return False
 
 
+@invalidates_user_cache
 async def admin_remove_credits(
     admin_id: int,
     telegram_id: int,
@@ -526,6 +529,7 @@ async def admin_remove_credits(
         return False
 
 
+@invalidates_user_cache
 async def admin_block_user(
     admin_id: int,
     telegram_id: int,
@@ -572,6 +576,7 @@ async def admin_block_user(
         return False
 
 
+@invalidates_user_cache
 async def admin_unblock_user(
     admin_id: int,
     telegram_id: int,
@@ -612,6 +617,7 @@ async def admin_unblock_user(
         return False
 
 
+@invalidates_user_cache
 async def admin_grant_unlimited(
     admin_id: int,
     telegram_id: int,
@@ -667,6 +673,7 @@ async def admin_grant_unlimited(
         return new_until
 
 
+@invalidates_user_cache
 async def admin_revoke_unlimited(
     admin_id: int,
     telegram_id: int,
@@ -789,6 +796,7 @@ async def get_idea_full_info(idea_id: int) -> Optional[Dict[str, Any]]:
         }
 
 
+@invalidates_user_cache
 async def admin_approve_idea(
     admin_id: int,
     idea_id: int,
@@ -14,6 +14,7 @@ from sqlalchemy.orm import selectinload
 
 from database.database import get_session
 from database.models import Feedback, Generation, GenerationPhoto, Idea, Payment, User
+from database.user_cache import invalidates_user_cache
 
 
 # Логгер
@@ -180,6 +181,7 @@ async def get_user_balance(telegram_id: int) -> int:
         return balance if balance is not None else 0
 
 
+@invalidates_user_cache
 async def decrease_balance(telegram_id: int, amount: int = 1) -> bool:
     """
     Списать кредиты с баланса пользователя.
@@ -249,6 +251,7 @@ async def decrease_balance(telegram_id: int, amount: int = 1) -> bool:
         return True
 
 
+@invalidates_user_cache
 async def increase_balance(telegram_id: int, amount: int) -> bool:
     """
     Пополнить баланс пользователя.
@@ -294,6 +297,7 @@ async def increase_balance(telegram_id: int, amount: int) -> bool:
         return True
 
 
+@invalidates_user_cache
 async def activate_unlimited(telegram_id: int, duration_days: int) -> Optional[datetime]:
     """Активировать безлимит на заданное количество дней."""
     async with get_session() as session:
@@ -331,6 +335,7 @@ async def activate_unlimited(telegram_id: int, duration_days: int) -> Optional[d
         return new_until
 
 
+@invalidates_user_cache
 async def increment_total_generated(telegram_id: int) -> None:
     """
     Увеличить счётчик сгенерированных ТЗ.
@@ -346,6 +351,7 @@ async def increment_total_generated(telegram_id: int) -> None:
         )
 
 
+@invalidates_user_cache
 async def set_user_premium(telegram_id: int, is_premium: bool = True) -> bool:
     """
     Установить премиум-статус пользователю.
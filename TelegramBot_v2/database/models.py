@@ -24,6 +24,7 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
+    false,
     func,
 )
 from sqlalchemy.orm import (
@@ -104,6 +105,7 @@ class User(Base):
     is_blocked: Mapped[bool] = mapped_column(
         Boolean,
         default=False,
+        server_default=false(),
     )
     unlimited_until: Mapped[Optional[datetime]] = mapped_column(
         DateTime,
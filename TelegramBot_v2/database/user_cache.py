@@ -0,0 +1,83 @@
+"""
+Кэш пользователей в памяти процесса.
+
+UserMiddleware загружает пользователя на каждый апдейт. Серии сообщений
+от одного пользователя обслуживаются из кэша с коротким TTL, а CRUD
+функции, изменяющие пользователя, сбрасывают его запись через
+декоратор invalidates_user_cache.
+"""
+
+import inspect
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Awaitable, Callable, Optional, Tuple, TypeVar
+
+from database.models import User
+
+
+# Время жизни записи (секунды)
+USER_CACHE_TTL = 30.0
+
+# Максимум пользователей в кэше (вытесняются давно загруженные)
+USER_CACHE_MAX_SIZE = 10_000
+
+_F = TypeVar("_F", bound=Callable[..., Awaitable[Any]])
+
+# telegram_id -> (момент истечения по monotonic, пользователь)
+_cache: "OrderedDict[int, Tuple[float, User]]" = OrderedDict()
+
+
+def get_cached_user(telegram_id: int) -> Optional[User]:
+    """Получить пользователя из кэша (None если нет или устарел)."""
+    entry = _cache.get(telegram_id)
+    if entry is None:
+        return None
+
+    expires_at, user = entry
+    if expires_at < time.monotonic():
+        del _cache[telegram_id]
+        return None
+    return user
+
+
+def cache_user(user: User) -> None:
+    """Положить пользователя в кэш."""
+    _cache[user.telegram_id] = (time.monotonic() + USER_CACHE_TTL, user)
+    _cache.move_to_end(user.telegram_id)
+
+    if len(_cache) > USER_CACHE_MAX_SIZE:
+        _cache.popitem(last=False)
+
+
+def invalidate_user_cache(telegram_id: Optional[int] = None) -> None:
+    """
+    Сбросить кэш пользователя.
+
+    Args:
+        telegram_id: ID пользователя (None - сбросить весь кэш)
+    """
+    if telegram_id is None:
+        _cache.clear()
+    else:
+        _cache.pop(telegram_id, None)
+
+
+def invalidates_user_cache(func: _F) -> _F:
+    """
+    Декоратор для CRUD функций, изменяющих пользователя.
+
+    После выполнения сбрасывает запись по аргументу telegram_id,
+    а если функция его не принимает - весь кэш.
+    """
+    signature = inspect.signature(func)
+
+    @wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            arguments = signature.bind_partial(*args, **kwargs).arguments
+            invalidate_user_cache(arguments.get("telegram_id"))
+
+    return wrapper  # type: ignore[return-value]
@@ -49,20 +49,30 @@ def setup_logging() -> None:
     else:
         renderer = structlog.processors.JSONRenderer()
 
+    # Фильтр уровня первым: отброшенные записи (DEBUG в production)
+    # не проходят остальную цепочку процессоров
+    processors = [
+        structlog.stdlib.filter_by_level,
+        structlog.contextvars.merge_contextvars,
+        structlog.stdlib.add_logger_name,
+        structlog.stdlib.add_log_level,
+        structlog.stdlib.PositionalArgumentsFormatter(),
+        structlog.processors.TimeStamper(fmt="iso"),
+    ]
+
+    # stack_info используется только при отладке
+    if support_settings.debug:
+        processors.append(structlog.processors.StackInfoRenderer())
+
+    processors += [
+        structlog.processors.format_exc_info,
+        structlog.processors.UnicodeDecoder(),
+        renderer,
+    ]
+
     # Конфигурация structlog
     structlog.configure(
-        processors=[
-            structlog.contextvars.merge_contextvars,
-            structlog.stdlib.filter_by_level,
-            structlog.stdlib.add_logger_name,
-            structlog.stdlib.add_log_level,
-            structlog.stdlib.PositionalArgumentsFormatter(),
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
-            structlog.processors.UnicodeDecoder(),
-            renderer,
-        ],
+        processors=processors,
         wrapper_class=structlog.stdlib.BoundLogger,
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
@@ -168,19 +178,15 @@ async def main() -> None:
     logger.info("support_bot_database_ready")
 
     # Регистрация middleware (упрощённая версия без throttling и album)
-    from bot.middleware import DatabaseMiddleware, UserMiddleware, LoggingMiddleware
-
-    # Логирование
-    dp.message.middleware(LoggingMiddleware())
-    dp.callback_query.middleware(LoggingMiddleware())
+    from bot.middleware import UserMiddleware, LoggingMiddleware
 
-    # База данных
-    dp.message.middleware(DatabaseMiddleware())
-    dp.callback_query.middleware(DatabaseMiddleware())
+    # Логирование - один outer middleware на все апдейты
+    dp.update.outer_middleware(LoggingMiddleware())
 
     # Пользователь
-    dp.message.middleware(UserMiddleware())
-    dp.callback_query.middleware(UserMiddleware())
+    user_middleware = UserMiddleware()
+    dp.message.middleware(user_middleware)
+    dp.callback_query.middleware(user_middleware)
 
     logger.info("support_bot_middleware_registered")
 
@@ -0,0 +1,31 @@
+"""
+Общие фикстуры тестов.
+"""
+
+import json
+
+import pytest
+from aiogram import Bot
+from aiogram.methods import SendMessage
+
+
+@pytest.fixture
+def reply_markup_payload():
+    """
+    Сериализовать разметку так, как её отправляет в Bot API сессия aiogram.
+
+    Returns:
+        Функция: разметка -> распарсенный JSON поля reply_markup
+    """
+    bot = Bot("1:test")
+
+    def payload(markup):
+        form = bot.session.build_form_data(
+            bot, SendMessage(chat_id=1, text="test", reply_markup=markup)
+        )
+        for options, _headers, value in form._fields:
+            if options["name"] == "reply_markup":
+                return json.loads(value)
+        raise AssertionError("reply_markup не попал в запрос")
+
+    return payload
@@ -0,0 +1,214 @@
+"""
+Тесты для клавиатур админ-панели.
+
+Проверка раскладки кнопок и формата callback_data.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from bot.keyboards.admin_callbacks import (
+    CB_CREDIT_REMOVE_CONFIRM,
+    CB_UNLIMITED_GRANT,
+    MAX_CALLBACK_BYTES,
+    int36,
+    pack_callback,
+    unpack_callback,
+)
+from bot.keyboards.admin_keyboards import (
+    get_admin_back_keyboard,
+    get_admin_main_keyboard,
+    get_analytics_period_keyboard,
+    get_cancel_reply_keyboard,
+    get_category_filter_keyboard,
+    get_credit_amount_keyboard,
+    get_confirm_action_keyboard,
+    get_free_credits_keyboard,
+    get_support_ticket_detail_keyboard,
+    get_support_tickets_keyboard,
+    get_unlimited_manage_keyboard,
+    get_users_list_keyboard,
+)
+
+
+def _texts(markup):
+    """Тексты кнопок по рядам."""
+    return [[btn.text for btn in row] for row in markup.inline_keyboard]
+
+
+def _callbacks(markup):
+    """callback_data кнопок по рядам."""
+    return [[btn.callback_data for btn in row] for row in markup.inline_keyboard]
+
+
+class TestCreditAmountKeyboard:
+    """Тесты клавиатуры выбора количества кредитов."""
+
+    def test_layout(self):
+        markup = get_credit_amount_keyboard(12345, "add")
+        assert _texts(markup) == [
+            ["1 💎", "5 💎", "10 💎"],
+            ["20 💎", "50 💎", "100 💎"],
+            ["✏️ Другое количество"],
+            ["❌ Отмена"],
+        ]
+
+    def test_callback_data(self):
+        callbacks = _callbacks(get_credit_amount_keyboard(12345, "remove"))
+        assert unpack_callback(CB_CREDIT_REMOVE_CONFIRM, callbacks[0][0]) == [12345, 1]
+        assert unpack_callback(CB_CREDIT_REMOVE_CONFIRM, callbacks[1][2]) == [12345, 100]
+        assert callbacks[2] == ["admin:credit_remove_custom:12345"]
+        assert callbacks[3] == ["admin:user:12345"]
+
+
+class TestAdminCallbacks:
+    """Тесты компактных callback_data."""
+
+    def test_int36(self):
+        assert int36(0) == "0"
+        assert int36(35) == "z"
+        assert int36(36) == "10"
+        assert int(int36(9_876_543_210), 36) == 9_876_543_210
+
+    def test_roundtrip(self):
+        data = pack_callback(CB_UNLIMITED_GRANT, 7_000_000_000, 365)
+        assert data.startswith(CB_UNLIMITED_GRANT + ":")
+        assert unpack_callback(CB_UNLIMITED_GRANT, data) == [7_000_000_000, 365]
+
+    def test_limit(self):
+        with pytest.raises(ValueError):
+            pack_callback("a:" + "x" * MAX_CALLBACK_BYTES, 1)
+
+    def test_unlimited_grant_buttons(self):
+        callbacks = _callbacks(get_unlimited_manage_keyboard(555, True))
+        assert [unpack_callback(CB_UNLIMITED_GRANT, cb) for cb in callbacks[0]] == [
+            [555, 7],
+            [555, 30],
+            [555, 90],
+        ]
+
+
+class TestFreeCreditsKeyboard:
+    """Тесты клавиатуры бесплатных кредитов."""
+
+    def test_layout(self):
+        markup = get_free_credits_keyboard()
+        assert _texts(markup) == [
+            ["0 💎", "1 💎", "2 💎"],
+            ["3 💎", "5 💎"],
+            ["⬅️ Настройки"],
+        ]
+        assert _callbacks(markup)[1] == [
+            "admin:set_free_credits:3",
+            "admin:set_free_credits:5",
+        ]
+
+    def test_markup_is_shared(self):
+        assert get_free_credits_keyboard() is get_free_credits_keyboard()
+
+
+class TestStaticKeyboards:
+    """Тесты кэширования статических клавиатур."""
+
+    def test_main_keyboard_is_shared(self):
+        assert get_admin_main_keyboard() is get_admin_main_keyboard()
+        assert _callbacks(get_admin_main_keyboard())[-1] == ["admin:refresh"]
+
+    def test_back_keyboard_cached_per_section(self):
+        assert get_admin_back_keyboard("users") is get_admin_back_keyboard("users")
+        assert _callbacks(get_admin_back_keyboard())[0] == ["admin:main"]
+        assert _callbacks(get_admin_back_keyboard("users"))[0] == ["admin:users", "admin:main"]
+
+    def test_category_filter_keyboard(self):
+        markup = get_category_filter_keyboard()
+        assert markup is get_category_filter_keyboard()
+        callbacks = _callbacks(markup)
+        assert callbacks[0] == ["admin:gen_category:clothes", "admin:gen_category:electronics"]
+        assert all(len(row) <= 2 for row in callbacks)
+        assert callbacks[-2:] == [["admin:gen_category:all"], ["admin:generations"]]
+
+    def test_confirm_action_keyboard_cached(self):
+        markup = get_confirm_action_keyboard("block", 42)
+        assert markup is get_confirm_action_keyboard("block", 42)
+        assert _callbacks(markup) == [["admin:block_yes:42", "admin:user:42"]]
+        assert _callbacks(get_confirm_action_keyboard("block", 42, "x"))[0][0] == "admin:block_yes:42:x"
+
+    def test_analytics_period_keyboard(self):
+        callbacks = _callbacks(get_analytics_period_keyboard("reg"))
+        assert callbacks[0] == ["admin:analytics_reg:7", "admin:analytics_reg:30"]
+
+
+class TestPagination:
+    """Тесты ряда навигации в списках."""
+
+    def test_middle_page(self):
+        markup = get_users_list_keyboard([], page=2, total_pages=3)
+        assert _texts(markup)[0] == ["◀️", "2/3", "▶️"]
+        assert _callbacks(markup)[0] == [
+            "admin:users_page:1",
+            "admin:users_info",
+            "admin:users_page:3",
+        ]
+
+    def test_single_page(self):
+        markup = get_users_list_keyboard([], page=1, total_pages=1)
+        assert _callbacks(markup)[0] == ["admin:users_info"]
+
+
+class TestSerialization:
+    """Тесты сериализации разметки на пути отправки aiogram."""
+
+    def test_buttons_sent_without_null_fields(self, reply_markup_payload):
+        payload = reply_markup_payload(get_users_list_keyboard([], page=2, total_pages=3))
+        assert payload["inline_keyboard"][0][1] == {"text": "2/3", "callback_data": "admin:users_info"}
+        assert payload["inline_keyboard"][-1] == [{"text": "⬅️ Главное меню", "callback_data": "admin:main"}]
+
+    def test_cached_rows_not_shared_as_tuples(self):
+        markup = get_support_tickets_keyboard([], page=2, total_pages=3)
+        assert all(type(row) is list for row in markup.inline_keyboard)
+
+
+class TestSupportTicketsKeyboard:
+    """Тесты списка тикетов поддержки."""
+
+    def test_ticket_row(self):
+        ticket = SimpleNamespace(
+            id=7,
+            user=SimpleNamespace(username="bob"),
+            status="open",
+            priority="high",
+            category="payment",
+            is_important=True,
+        )
+        markup = get_support_tickets_keyboard([ticket], status_filter="open")
+        assert _texts(markup)[0] == ["🆕 #7 | @bob 💳 🔴 ❗"]
+        assert _callbacks(markup)[0] == ["admin:support_ticket:7"]
+        assert _texts(markup)[1] == ["🆕 Открытые ✓", "⏳ В работе"]
+
+    def test_pagination_row_shared(self):
+        first = get_support_tickets_keyboard([], page=2, total_pages=3)
+        second = get_support_tickets_keyboard([], page=2, total_pages=3, status_filter="open")
+        # Кнопки ряда общие, сам ряд копируется в список
+        assert first.inline_keyboard[0][0] is second.inline_keyboard[0][0]
+        assert _callbacks(first)[0] == [
+            "admin:support_page:1",
+            "admin:support_info",
+            "admin:support_page:3",
+        ]
+
+    def test_detail_keyboard_follows_ticket_state(self):
+        ticket = SimpleNamespace(id=7, status="open", is_important=False)
+        markup = get_support_ticket_detail_keyboard(ticket)
+        assert markup is get_support_ticket_detail_keyboard(ticket)
+        assert _callbacks(markup)[1] == ["admin:support_take:7"]
+
+        ticket.status = "resolved"
+        ticket.is_important = True
+        callbacks = _callbacks(get_support_ticket_detail_keyboard(ticket))
+        assert callbacks[1:3] == [["admin:support_archive:7"], ["admin:support_delete:7"]]
+
+    def test_cancel_reply_cached(self):
+        markup = get_cancel_reply_keyboard(7)
+        assert markup is get_cancel_reply_keyboard(7)
+        assert _callbacks(markup) == [["admin:support_ticket:7"]]
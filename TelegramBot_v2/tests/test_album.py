@@ -0,0 +1,72 @@
+"""
+Тесты для album middleware.
+
+Проверка сборки медиагрупп и очистки служебных данных.
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from aiogram.types import Message
+
+from bot.middlewares.album import AlbumMiddleware
+
+
+def _album_message(message_id: int, media_group_id: str = "group") -> MagicMock:
+    """Сообщение из медиагруппы."""
+    message = MagicMock(spec=Message)
+    message.message_id = message_id
+    message.media_group_id = media_group_id
+    message.from_user = None
+    return message
+
+
+@pytest.fixture
+def middleware(monkeypatch):
+    monkeypatch.setattr(AlbumMiddleware, "ALBUM_LATENCY", 0.01)
+    yield AlbumMiddleware()
+    AlbumMiddleware._albums.clear()
+    AlbumMiddleware._started.clear()
+
+
+class TestAlbumMiddleware:
+    """Тесты сборки альбомов."""
+
+    @pytest.mark.asyncio
+    async def test_album_collected_in_order(self, middleware):
+        albums = []
+
+        async def handler(event, data):
+            albums.append([m.message_id for m in data["album"]])
+
+        await asyncio.gather(
+            *(middleware(handler, _album_message(i), {}) for i in (3, 1, 2))
+        )
+
+        assert albums == [[1, 2, 3]]
+        assert not AlbumMiddleware._albums
+        assert not AlbumMiddleware._started
+
+    @pytest.mark.asyncio
+    async def test_cancelled_album_released(self, middleware):
+        handler = MagicMock()
+        task = asyncio.create_task(middleware(handler, _album_message(1), {}))
+        await asyncio.sleep(0)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert not AlbumMiddleware._albums
+        assert not AlbumMiddleware._started
+        handler.assert_not_called()
+
+    def test_stale_album_swept(self, middleware):
+        AlbumMiddleware._albums["old"] = [_album_message(1, "old")]
+        AlbumMiddleware._started["old"] = 0.0
+
+        AlbumMiddleware._sweep_stale(AlbumMiddleware.ALBUM_TTL + 1.0)
+
+        assert "old" not in AlbumMiddleware._albums
+        assert "old" not in AlbumMiddleware._started
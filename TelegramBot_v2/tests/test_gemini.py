@@ -0,0 +1,440 @@
+"""
+Тесты для Gemini провайдера.
+
+Запросы к API подменяются через httpx.MockTransport.
+"""
+
+import asyncio
+import base64
+import json
+
+import httpx
+import pytest
+
+from core.ai_providers import gemini
+from core.ai_providers.cache import ResponseCache, make_cache_key
+from core.ai_providers.gemini import GeminiProvider, close_gemini_client
+
+
+def _answer(text: str) -> dict:
+    """Ответ generateContent с одним текстовым фрагментом."""
+    return {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches(monkeypatch):
+    """Пустые модульные кэши для каждого теста."""
+    monkeypatch.setattr(gemini, "_prompt_caches", {})
+    monkeypatch.setattr(gemini, "_response_cache", ResponseCache())
+
+
+@pytest.fixture
+def requests_log(monkeypatch):
+    """Общий клиент с MockTransport, записывающим тела запросов."""
+    log = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.startswith("/upload/"):
+            log.append(("upload", len(request.content)))
+            name = f"files/{len(log)}"
+            return httpx.Response(200, json={"file": {"name": name, "uri": f"https://api/{name}"}})
+        if request.method == "DELETE":
+            log.append(("delete", request.url.path.rsplit("/v1beta/", 1)[1]))
+            return httpx.Response(200, json={})
+        if request.url.path.endswith("/cachedContents"):
+            log.append(("cache", json.loads(request.content)["ttl"]))
+            return httpx.Response(200, json={"name": f"cachedContents/{len(log)}"})
+        log.append(json.loads(request.content))
+        return httpx.Response(200, json=_answer("ok"))
+
+    monkeypatch.setattr(
+        gemini, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    return log
+
+
+class TestGeminiClient:
+    """Тесты общего HTTP клиента."""
+
+    @pytest.mark.asyncio
+    async def test_client_shared_between_providers(self, requests_log):
+        client = gemini._client
+
+        for _ in range(2):
+            response = await GeminiProvider(api_key="key").generate("prompt")
+            assert response.success
+            assert response.content == "ok"
+
+        assert gemini._get_client() is client
+        assert len(requests_log) == 2
+
+    @pytest.mark.asyncio
+    async def test_close_client(self, requests_log):
+        client = gemini._client
+
+        await close_gemini_client()
+
+        assert client.is_closed
+        assert gemini._client is None
+
+
+class TestImageEncoding:
+    """Тесты кодирования изображений."""
+
+    @pytest.mark.asyncio
+    async def test_inline_data_base64(self, requests_log):
+        image = bytes(range(256)) * 4
+
+        response = await GeminiProvider(api_key="key").analyze_image(image, "prompt")
+
+        assert response.success
+        parts = requests_log[0]["contents"][0]["parts"]
+        assert base64.b64decode(parts[0]["inline_data"]["data"]) == image
+        assert parts[-1] == {"text": "prompt"}
+
+    @pytest.mark.asyncio
+    async def test_large_images_uploaded(self, requests_log):
+        large = b"x" * (GeminiProvider.INLINE_IMAGE_MAX_BYTES + 1)
+
+        response = await GeminiProvider(api_key="key").analyze_multiple_images(
+            [large, b"small", large]
+        )
+
+        assert response.success
+        assert requests_log[:2] == [("upload", len(large))] * 2
+        parts = requests_log[2]["contents"][0]["parts"]
+        # Порядок фото сохраняется, мелкое остаётся inline
+        assert [next(iter(part)) for part in parts] == [
+            "file_data", "inline_data", "file_data", "text",
+        ]
+        assert {parts[0]["file_data"]["file_uri"], parts[2]["file_data"]["file_uri"]} == {
+            "https://api/files/1", "https://api/files/2",
+        }
+        # Загруженные фото удаляются после запроса
+        assert sorted(requests_log[3:]) == [("delete", "files/1"), ("delete", "files/2")]
+
+    @pytest.mark.asyncio
+    async def test_uploaded_files_deleted_on_error(self, monkeypatch):
+        deleted = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.startswith("/upload/"):
+                return httpx.Response(200, json={"file": {"name": "files/a", "uri": "u"}})
+            if request.method == "DELETE":
+                deleted.append(request.url.path)
+                # Ошибка удаления не влияет на результат
+                return httpx.Response(500)
+            return httpx.Response(400, json={"error": {"message": "bad request"}})
+
+        monkeypatch.setattr(
+            gemini, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+        large = b"x" * (GeminiProvider.INLINE_IMAGE_MAX_BYTES + 1)
+
+        response = await GeminiProvider(api_key="key").analyze_image(large)
+
+        assert response.error_message == "bad request"
+        assert deleted == ["/v1beta/files/a"]
+
+    @pytest.mark.asyncio
+    async def test_upload_error_falls_back_to_inline(self, monkeypatch):
+        log = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.startswith("/upload/"):
+                return httpx.Response(500)
+            log.append(json.loads(request.content))
+            return httpx.Response(200, json=_answer("ok"))
+
+        monkeypatch.setattr(
+            gemini, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+        large = b"x" * (GeminiProvider.INLINE_IMAGE_MAX_BYTES + 1)
+
+        response = await GeminiProvider(api_key="key").analyze_image(large)
+
+        assert response.success
+        part = log[0]["contents"][0]["parts"][0]
+        assert base64.b64decode(part["inline_data"]["data"]) == large
+
+
+class TestPromptCache:
+    """Тесты кэширования системного промпта."""
+
+    LONG_PROMPT = "Ты — маркетолог. " * 1000
+
+    @pytest.mark.asyncio
+    async def test_long_prompt_cached_once(self, requests_log):
+        for _ in range(2):
+            response = await GeminiProvider(api_key="key").generate("prompt", self.LONG_PROMPT)
+            assert response.success
+
+        assert requests_log[0] == ("cache", "3600s")
+        assert [body["cachedContent"] for body in requests_log[1:]] == ["cachedContents/1"] * 2
+        assert "systemInstruction" not in requests_log[1]
+
+    @pytest.mark.asyncio
+    async def test_short_prompt_sent_inline(self, requests_log):
+        await GeminiProvider(api_key="key").generate("prompt", "Ты — маркетолог.")
+
+        assert len(requests_log) == 1
+        assert requests_log[0]["systemInstruction"] == {"parts": [{"text": "Ты — маркетолог."}]}
+
+    @pytest.mark.asyncio
+    async def test_expired_cache_recreated(self, monkeypatch):
+        log = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/cachedContents"):
+                log.append("cache")
+                return httpx.Response(200, json={"name": f"cachedContents/{len(log)}"})
+            body = json.loads(request.content)
+            log.append(body["cachedContent"])
+            if body["cachedContent"] == "cachedContents/1":
+                return httpx.Response(404, json={"error": {"message": "not found"}})
+            return httpx.Response(200, json=_answer("ok"))
+
+        monkeypatch.setattr(
+            gemini, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+
+        response = await GeminiProvider(api_key="key").generate("prompt", self.LONG_PROMPT)
+
+        assert response.success
+        assert log == ["cache", "cachedContents/1", "cache", "cachedContents/3"]
+
+
+class TestResponseCache:
+    """Тесты кэша ответов."""
+
+    def test_cache_key(self):
+        assert make_cache_key("ab", "c") != make_cache_key("a", "bc")
+        assert make_cache_key("a", b"b") == make_cache_key(b"a", "b")
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        cache = ResponseCache(maxsize=2)
+        response = gemini.ProviderResponse(success=True, content="ok", provider_name="gemini")
+
+        await cache.set("a", response)
+        await cache.set("b", response)
+        assert await cache.get("a") is response
+        await cache.set("c", response)
+
+        assert await cache.get("b") is None
+        assert len(cache) == 2
+
+    @pytest.mark.asyncio
+    async def test_deterministic_text_cached(self, requests_log):
+        provider = GeminiProvider(api_key="key")
+
+        first = await provider.generate("prompt", temperature=0.0)
+        assert await GeminiProvider(api_key="key").generate("prompt", temperature=0.0) is first
+        await provider.generate("prompt", temperature=0.7)
+        await provider.generate("prompt", temperature=0.7)
+
+        assert len(requests_log) == 3
+
+    @pytest.mark.asyncio
+    async def test_vision_cached_by_images(self, requests_log):
+        provider = GeminiProvider(api_key="key")
+
+        await provider.analyze_image(b"photo", "prompt")
+        await provider.analyze_image(b"photo", "prompt")
+        await provider.analyze_image(b"other", "prompt")
+
+        assert len(requests_log) == 2
+
+    @pytest.mark.asyncio
+    async def test_health_check_not_cached(self, requests_log):
+        provider = GeminiProvider(api_key="key")
+
+        for _ in range(2):
+            assert await provider.health_check() is gemini.ProviderStatus.AVAILABLE
+
+        assert len(requests_log) == 2
+
+
+class TestExtractText:
+    """Тесты извлечения текста из ответа."""
+
+    def test_parts(self):
+        provider = GeminiProvider(api_key="key")
+        assert provider._extract_text(_answer("ok")) == "ok"
+        parts = [{"text": "a"}, {"inlineData": {}}, {"text": "b"}]
+        data = {"candidates": [{"content": {"parts": parts}}]}
+        assert provider._extract_text(data) == "a\nb"
+
+    def test_empty_responses(self):
+        provider = GeminiProvider(api_key="key")
+        assert provider._extract_text({}) == ""
+        assert provider._extract_text({"candidates": []}) == ""
+        assert provider._extract_text({"candidates": [{"finishReason": "SAFETY"}]}) == ""
+        assert provider._extract_text({"candidates": [{"content": {"parts": []}}]}) == ""
+
+
+class TestHealthCheck:
+    """Тесты проверки доступности."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("status_code", "expected"),
+        [
+            (200, gemini.ProviderStatus.AVAILABLE),
+            (429, gemini.ProviderStatus.RATE_LIMITED),
+            (503, gemini.ProviderStatus.ERROR),
+        ],
+    )
+    async def test_status_by_code(self, monkeypatch, status_code, expected):
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert json.loads(request.content)["generationConfig"] == {"maxOutputTokens": 1}
+            return httpx.Response(status_code, json={})
+
+        monkeypatch.setattr(
+            gemini, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+
+        assert await GeminiProvider(api_key="key").health_check() is expected
+
+    @pytest.mark.asyncio
+    async def test_network_error(self, monkeypatch):
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("down")
+
+        monkeypatch.setattr(
+            gemini, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+
+        assert await GeminiProvider(api_key="key").health_check() is gemini.ProviderStatus.ERROR
+
+
+class TestErrors:
+    """Тесты обработки ошибок API."""
+
+    @pytest.mark.asyncio
+    async def test_api_error_message(self, monkeypatch):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(400, json={"error": {"message": "API key not valid"}})
+
+        monkeypatch.setattr(
+            gemini, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+        provider = GeminiProvider(api_key="key")
+
+        for response in (
+            await provider.generate("prompt"),
+            await provider.analyze_image(b"photo"),
+        ):
+            assert not response.success
+            assert response.error_message == "API key not valid"
+            assert response.provider_name == "gemini"
+
+    @pytest.mark.asyncio
+    async def test_empty_answer(self, monkeypatch):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"candidates": []})
+
+        monkeypatch.setattr(
+            gemini, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+
+        response = await GeminiProvider(api_key="key").generate("prompt", temperature=0.0)
+
+        assert response.error_message == "Пустой ответ от Gemini"
+        # Неуспешные ответы не кэшируются
+        assert len(gemini._response_cache) == 0
+
+
+class TestRetry:
+    """Тесты повтора запросов при временных ошибках."""
+
+    @pytest.fixture
+    def sleeps(self, monkeypatch):
+        sleeps = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+
+        monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+        return sleeps
+
+    def _client(self, monkeypatch, statuses, headers=None):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            status = statuses[min(len(calls), len(statuses) - 1)]
+            calls.append(status)
+            if status == 200:
+                return httpx.Response(200, json=_answer("ok"))
+            return httpx.Response(status, headers=headers, json={"error": {"message": "busy"}})
+
+        monkeypatch.setattr(
+            gemini, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+        return calls
+
+    @pytest.mark.asyncio
+    async def test_transient_error_retried(self, monkeypatch, sleeps):
+        calls = self._client(monkeypatch, [503, 429, 200])
+
+        response = await GeminiProvider(api_key="key").generate("prompt")
+
+        assert response.success
+        assert calls == [503, 429, 200]
+        assert len(sleeps) == 2
+        assert 0.5 <= sleeps[0] <= 0.75 and 1.0 <= sleeps[1] <= 1.25
+
+    @pytest.mark.asyncio
+    async def test_attempts_exhausted(self, monkeypatch, sleeps):
+        calls = self._client(monkeypatch, [429], headers={"Retry-After": "2"})
+
+        response = await GeminiProvider(api_key="key").generate("prompt")
+
+        assert response.error_message == "busy"
+        assert calls == [429] * GeminiProvider.MAX_ATTEMPTS
+        assert sleeps == [2.0, 2.0]
+
+    @pytest.mark.asyncio
+    async def test_long_retry_after_not_awaited(self, monkeypatch, sleeps):
+        calls = self._client(monkeypatch, [429], headers={"Retry-After": "3600"})
+
+        response = await GeminiProvider(api_key="key").generate("prompt")
+
+        assert not response.success
+        assert calls == [429]
+        assert sleeps == []
+
+    @pytest.mark.asyncio
+    async def test_client_error_not_retried(self, monkeypatch, sleeps):
+        calls = self._client(monkeypatch, [400])
+
+        await GeminiProvider(api_key="key").analyze_image(b"photo")
+
+        assert calls == [400]
+
+
+class TestPerImage:
+    """Тесты параллельного анализа фото по одному."""
+
+    @pytest.mark.asyncio
+    async def test_descriptions_joined_in_order(self, monkeypatch):
+        def handler(request: httpx.Request) -> httpx.Response:
+            parts = json.loads(request.content)["contents"][0]["parts"]
+            data = base64.b64decode(parts[0]["inline_data"]["data"]).decode()
+            if data == "bad":
+                return httpx.Response(400, json={"error": {"message": "bad image"}})
+            return httpx.Response(200, json=_answer(data))
+
+        monkeypatch.setattr(
+            gemini, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+        provider = GeminiProvider(api_key="key")
+
+        response = await provider.analyze_multiple_images(
+            [b"first", b"bad", b"second"], per_image=True
+        )
+        assert response.success
+        assert response.content == "first\n\nsecond"
+
+        response = await provider.analyze_multiple_images([b"bad", b"bad"], per_image=True)
+        assert response.error_message == "bad image"
@@ -0,0 +1,68 @@
+"""
+Тесты для меню пакетов кредитов.
+
+Проверка статуса безлимита и клавиатуры покупки на пути отправки aiogram.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+package_menu = pytest.importorskip("bot.utils.package_menu", exc_type=ImportError)
+
+
+class TestUnlimitedStatus:
+    """Тесты расчёта дней до окончания безлимита."""
+
+    NOW = datetime(2026, 1, 10, 12, 0, 30)
+
+    def _days_left(self, until: datetime) -> int:
+        until_ts, _ = package_menu._until_cached(until)
+        return package_menu._days_left(until_ts, (self.NOW - package_menu._EPOCH).total_seconds())
+
+    @pytest.mark.parametrize(
+        ("delta", "expected"),
+        [
+            (timedelta(days=7), 7),
+            # Секунды после границы суток - уже 8 дней
+            (timedelta(days=7, seconds=1), 8),
+            # Секунды до границы суток - ещё 7 дней
+            (timedelta(days=7, seconds=-29), 7),
+            (timedelta(days=6, microseconds=1), 7),
+            (timedelta(seconds=-1), 0),
+        ],
+    )
+    def test_days_left_at_day_boundary(self, delta, expected):
+        assert self._days_left(self.NOW + delta) == expected
+
+    def test_renewal_threshold(self):
+        days_left = self._days_left(self.NOW + timedelta(days=7, seconds=-29))
+        assert days_left <= package_menu.MIN_DAYS_LEFT_FOR_RENEWAL
+
+    def test_until_formatted(self):
+        assert package_menu._until_cached(datetime(2026, 2, 3, 4, 5))[1] == "03.02.2026"
+
+
+class TestPackagesKeyboard:
+    """Тесты клавиатуры пакетов."""
+
+    def test_buttons_sent_without_null_fields(self, reply_markup_payload):
+        markup = package_menu.build_packages_keyboard(
+            None, unlimited_status={"is_active": False, "can_renew": False}
+        )
+
+        payload = reply_markup_payload(markup)
+
+        buttons = [button for row in payload["inline_keyboard"] for button in row]
+        assert all(set(button) == {"text", "callback_data"} for button in buttons)
+        assert payload["inline_keyboard"][-1] == [
+            {"text": "❓ Как это работает", "callback_data": "packages_help"},
+            {"text": "⬅️ Назад", "callback_data": "show_main_menu"},
+        ]
+
+    def test_rows_are_lists(self):
+        markup = package_menu.build_packages_keyboard(
+            None, show_back=False, unlimited_status={"is_active": True, "can_renew": True}
+        )
+
+        assert all(type(row) is list for row in markup.inline_keyboard)
@@ -0,0 +1,78 @@
+"""
+Тесты для конфигурации пакетов кредитов.
+
+Проверка производных значений пакетов и выборок по категориям.
+"""
+
+import pytest
+
+from config.packages import (
+    PACKAGES,
+    calculate_savings,
+    find_package_for_credits,
+    get_packages_by_category,
+    get_regular_packages,
+    get_unlimited_packages,
+)
+
+
+class TestCreditPackage:
+    """Тесты пакета кредитов."""
+
+    def test_derived_values(self):
+        package = PACKAGES["business"]
+        assert package.price_rub_formatted == "1 290"
+        assert package.price_kopecks == 129_000
+        assert package.display_name == "💼 Бизнес 💎"
+        assert package.button_text == "💼 Бизнес 💎 — 100 ТЗ за 1290₽"
+        assert package.description.endswith("Цена за кредит: 12.9₽")
+
+    def test_unlimited_texts(self):
+        package = PACKAGES["unlimited"]
+        assert package.price_per_credit == 0.0
+        assert package.short_button_text == "∞ 30д • 1790₽"
+        assert package.credits_display == "∞ Безлимит"
+
+    def test_price_per_credit(self):
+        package = PACKAGES["optimal"]  # 449₽ / 25
+        assert package.price_per_credit_tenths == 180
+        assert package.price_per_credit == 18.0
+        assert package.price_per_credit_text == "18.0"
+
+    def test_savings(self):
+        assert calculate_savings(PACKAGES["basic"]) == 71  # 10 * 30₽ - 229₽
+        assert calculate_savings(PACKAGES["unlimited"]) == 0
+
+    def test_derived_values_precomputed(self):
+        package = PACKAGES["optimal"]
+        assert package.button_text is package.button_text
+        assert not hasattr(package, "__dict__")
+        # Производные поля не участвуют в repr и сравнении
+        assert "button_text" not in repr(package)
+
+
+class TestPackageSelections:
+    """Тесты выборок пакетов."""
+
+    def test_selections(self):
+        assert [p.id for p in get_packages_by_category("popular")] == ["optimal", "pro"]
+        assert get_packages_by_category("missing") == ()
+        assert get_unlimited_packages() == (PACKAGES["unlimited"],)
+        assert PACKAGES["unlimited"] not in get_regular_packages()
+
+    def test_packages_read_only(self):
+        with pytest.raises(TypeError):
+            PACKAGES["free"] = PACKAGES["trial"]
+
+    def test_selections_shared(self):
+        # Геттеры отдают готовые кортежи без создания коллекции на вызов
+        for getter in (get_regular_packages, get_unlimited_packages):
+            assert isinstance(getter(), tuple)
+            assert getter() is getter()
+        assert get_packages_by_category("starter") is get_packages_by_category("starter")
+
+    def test_find_package_for_credits(self):
+        assert find_package_for_credits(1).id == "trial"
+        assert find_package_for_credits(10).id == "basic"
+        assert find_package_for_credits(11).id == "optimal"
+        assert find_package_for_credits(1000) is None
@@ -0,0 +1,111 @@
+"""
+Тесты для цепочек AI провайдеров.
+
+Проверка fallback между провайдерами и проверки доступности.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from core.ai_providers.base import ProviderResponse, ProviderStatus
+from core.ai_providers.chain import ChainConfig, TextProviderChain, VisionProviderChain
+
+
+def _provider(name: str, status=ProviderStatus.AVAILABLE, delay: float = 0.0):
+    """Провайдер-заглушка с заданным результатом health_check."""
+
+    async def health_check():
+        await asyncio.sleep(delay)
+        if isinstance(status, Exception):
+            raise status
+        return status
+
+    return SimpleNamespace(name=name, health_check=health_check)
+
+
+def _text_provider(name: str, calls: list, success: bool):
+    """Text провайдер-заглушка, записывающий вызовы."""
+
+    async def generate(**kwargs):
+        calls.append(name)
+        return ProviderResponse(
+            success=success,
+            content="ok" if success else "",
+            provider_name=name,
+            error_message=None if success else "fail",
+        )
+
+    return SimpleNamespace(name=name, generate=generate)
+
+
+class TestHealthCheck:
+    """Тесты проверки доступности провайдеров."""
+
+    @pytest.mark.asyncio
+    async def test_statuses_in_provider_order(self):
+        chain = TextProviderChain([
+            _provider("glm", ProviderStatus.RATE_LIMITED),
+            _provider("gemini"),
+        ])
+
+        assert await chain.health_check_all() == {
+            "glm": ProviderStatus.RATE_LIMITED,
+            "gemini": ProviderStatus.AVAILABLE,
+        }
+
+    @pytest.mark.asyncio
+    async def test_exception_reported_as_error(self):
+        chain = VisionProviderChain([_provider("glm", RuntimeError("boom")), _provider("gemini")])
+
+        results = await chain.health_check_all()
+
+        assert results["glm"] is ProviderStatus.ERROR
+        assert results["gemini"] is ProviderStatus.AVAILABLE
+
+    @pytest.mark.asyncio
+    async def test_checks_run_concurrently(self):
+        chain = VisionProviderChain([_provider(str(i), delay=0.2) for i in range(5)])
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await chain.health_check_all()
+
+        assert loop.time() - started < 0.5
+
+
+class TestFallback:
+    """Тесты перебора провайдеров."""
+
+    @pytest.mark.asyncio
+    async def test_retries_then_next_provider(self, monkeypatch):
+        sleeps = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+
+        monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+        calls = []
+        chain = TextProviderChain(
+            [_text_provider("glm", calls, False), _text_provider("gemini", calls, True)],
+            ChainConfig(max_retries=2, retry_delay=0.5),
+        )
+
+        response = await chain.generate("prompt")
+
+        assert response.provider_name == "gemini"
+        assert calls == ["glm", "glm", "gemini"]
+        # Ожидание только между попытками одного провайдера
+        assert sleeps == [0.5]
+
+    @pytest.mark.asyncio
+    async def test_all_failed(self):
+        calls = []
+        chain = TextProviderChain([_text_provider("glm", calls, False)])
+
+        with pytest.raises(RuntimeError, match="glm: fail"):
+            await chain.generate("prompt")
+
+        assert calls == ["glm"]
+
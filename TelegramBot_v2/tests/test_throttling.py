@@ -5,14 +5,18 @@
 """
 
 import asyncio
+import math
 import time
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from aiogram.types import CallbackQuery, Message, User
 
 from bot.middlewares.throttling import (
+    GenerationThrottlingMiddleware,
     ThrottlingMiddleware,
     RateLimitConfig,
+    TokenBucket,
     UserRateState,
     create_throttling_middleware,
 )
@@ -44,6 +48,18 @@ class TestUserRateState:
         assert state.violations == 0
         assert state.requests_count == 0
         assert state.banned_until == 0.0
+    
+    def test_state_has_no_dict(self):
+        assert not hasattr(UserRateState(), "__dict__")
+    
+    def test_violations_decay(self):
+        state = UserRateState()
+        state.add_violation(now=0.0, tau=600.0)
+        assert state.add_violation(now=0.0, tau=600.0) == 2.0
+        
+        # Через tau счётчик затухает в e раз, старые нарушения забываются
+        assert state.decayed_violations(600.0, 600.0) == pytest.approx(2.0 / math.e)
+        assert state.add_violation(now=6000.0, tau=600.0) == pytest.approx(1.0, abs=1e-3)
 
 
 class TestThrottlingMiddleware:
@@ -97,12 +113,70 @@ class TestThrottlingMiddleware:
     def test_reset_user(self, middleware):
         """Сброс состояния пользователя."""
         user_id = 12345
-        middleware.user_states[user_id].violations = 5
+        middleware.user_states[user_id] = UserRateState(violations=5)
         
         middleware.reset_user(user_id)
         
         assert user_id not in middleware.user_states
     
+    def test_expired_states_evicted(self, middleware):
+        """Устаревшие записи вытесняются, свежие остаются."""
+        now = time.monotonic()
+        middleware.user_states[1] = UserRateState(last_request=now - 1000)
+        middleware.user_states[2] = UserRateState(last_request=now)
+        
+        middleware._expire_states(now)
+        
+        assert list(middleware.user_states) == [2]
+    
+    def test_expiry_stops_at_first_fresh_state(self, middleware):
+        """Обход останавливается на первой свежей записи."""
+        now = time.monotonic()
+        middleware.user_states[1] = UserRateState(last_request=now)
+        # Нарушение порядка: устаревшая запись после свежей не проверяется
+        middleware.user_states[2] = UserRateState(last_request=now - 1000)
+        
+        middleware._expire_states(now)
+        
+        assert list(middleware.user_states) == [1, 2]
+    
+    @pytest.mark.asyncio
+    async def test_max_users_evicts_oldest(self, mock_handler):
+        """При переполнении вытесняется давно не активный пользователь."""
+        middleware = ThrottlingMiddleware(RateLimitConfig(max_users=2))
+        
+        for user_id in (1, 2, 3):
+            event = Message.model_construct(from_user=User.model_construct(id=user_id))
+            await middleware(mock_handler, event, {})
+        
+        assert list(middleware.user_states) == [2, 3]
+    
+    @pytest.mark.asyncio
+    async def test_disabled_rate_skips_state(self, mock_handler):
+        """При rate = 0 состояние пользователя не создаётся."""
+        middleware = ThrottlingMiddleware(RateLimitConfig(message_rate=0))
+        event = Message.model_construct(from_user=User.model_construct(id=1))
+        
+        for _ in range(3):
+            assert await middleware(mock_handler, event, {}) == "handler_result"
+        
+        assert not middleware.user_states
+    
+    @pytest.mark.parametrize(
+        "callback_data, expected",
+        [
+            ("category:clothes", ("generation", 1.0)),
+            ("buy:pack_10", ("payment", 0.5)),
+            ("menu:main", ("callback", 1.0 / 15.0)),
+            ("category", ("callback", 1.0 / 15.0)),
+            (None, ("callback", 1.0 / 15.0)),
+        ],
+    )
+    def test_callback_event_interval(self, middleware, callback_data, expected):
+        """Интервал callback определяется по префиксу callback_data."""
+        event = CallbackQuery.model_construct(data=callback_data)
+        assert middleware._get_event_interval(event, {}) == expected
+    
     def test_get_user_stats_nonexistent(self, middleware):
         """Статистика для несуществующего пользователя."""
         stats = middleware.get_user_stats(99999)
@@ -120,6 +194,30 @@ class TestThrottlingMiddleware:
         assert stats["violations"] >= 5 or stats["is_banned"]
 
 
+class TestTokenBucket:
+    """Тесты корзины токенов генерации."""
+    
+    def test_refill_after_interval(self):
+        bucket = TokenBucket(tokens=1.0, last_refill=0.0)
+        
+        assert bucket.consume(0.0, 10.0, 1.0) == 0.0
+        assert bucket.consume(4.0, 10.0, 1.0) == pytest.approx(6.0)
+        assert bucket.consume(10.0, 10.0, 1.0) == 0.0
+    
+    def test_burst_capacity(self):
+        bucket = TokenBucket(tokens=2.0, last_refill=0.0)
+        
+        assert bucket.consume(0.0, 10.0, 2.0) == 0.0
+        assert bucket.consume(0.0, 10.0, 2.0) == 0.0
+        assert bucket.consume(0.0, 10.0, 2.0) > 0.0
+        # Простой не накапливает токенов больше ёмкости
+        bucket.consume(1000.0, 10.0, 2.0)
+        assert bucket.tokens == pytest.approx(1.0)
+    
+    def test_bucket_has_no_dict(self):
+        assert not hasattr(TokenBucket(tokens=1.0, last_refill=0.0), "__dict__")
+
+
 class TestCreateThrottlingMiddleware:
     """Тесты фабрики middleware."""
     
@@ -134,3 +232,67 @@ class TestCreateThrottlingMiddleware:
         assert middleware.config.message_rate == 2.0
         assert middleware.config.callback_rate == 3.0
         assert middleware.config.ban_duration == 30.0
+
+
+class TestGenerationThrottling:
+    """Тесты throttling генераций."""
+    
+    @pytest.mark.asyncio
+    async def test_bucket_kept_on_rate_state(self, monkeypatch):
+        """Корзина генераций хранится в общем состоянии пользователя."""
+        answer = AsyncMock()
+        monkeypatch.setattr(CallbackQuery, "answer", answer)
+        middleware = GenerationThrottlingMiddleware(min_interval=10.0)
+        handler = AsyncMock(return_value="handler_result")
+        event = CallbackQuery.model_construct(data="category:clothes")
+        state = UserRateState()
+        
+        assert await middleware(handler, event, {"rate_state": state, "request_ts": 0.0}) == "handler_result"
+        assert await middleware(handler, event, {"rate_state": state, "request_ts": 5.0}) is None
+        
+        assert state.generation_bucket is not None
+        handler.assert_awaited_once()
+        answer.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_limit_applies_without_rate_state(self, monkeypatch):
+        """Без ThrottlingMiddleware лимит действует по своим корзинам."""
+        answer = AsyncMock()
+        monkeypatch.setattr(CallbackQuery, "answer", answer)
+        middleware = GenerationThrottlingMiddleware(min_interval=10.0)
+        handler = AsyncMock(return_value="handler_result")
+        event = CallbackQuery.model_construct(
+            data="category:clothes",
+            from_user=User.model_construct(id=12345),
+        )
+        
+        assert await middleware(handler, event, {}) == "handler_result"
+        assert await middleware(handler, event, {}) is None
+        
+        assert 12345 in middleware.buckets
+        handler.assert_awaited_once()
+        answer.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_limit_applies_when_rate_disabled(self, monkeypatch):
+        """Отключённый общий лимит не отключает лимит генераций."""
+        answer = AsyncMock()
+        monkeypatch.setattr(CallbackQuery, "answer", answer)
+        throttling = ThrottlingMiddleware(RateLimitConfig(generation_rate=0.0))
+        generation = GenerationThrottlingMiddleware(min_interval=10.0)
+        handler = AsyncMock(return_value="handler_result")
+        event = CallbackQuery.model_construct(
+            data="category:clothes",
+            from_user=User.model_construct(id=12345),
+        )
+        
+        async def chained(event, data):
+            return await generation(handler, event, data)
+        
+        assert await throttling(chained, event, {}) == "handler_result"
+        assert await throttling(chained, event, {}) is None
+        
+        assert throttling.user_states == {}
+        assert 12345 in generation.buckets
+        handler.assert_awaited_once()
+        answer.assert_awaited_once()
@@ -0,0 +1,105 @@
+"""
+Тесты для кэша пользователей.
+
+Проверка TTL, вытеснения и сброса записей декоратором CRUD функций.
+"""
+
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+
+from database import user_cache
+from database.models import User
+from database.user_cache import (
+    cache_user,
+    get_cached_user,
+    invalidates_user_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    """Пустой кэш и управляемые монотонные часы."""
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(user_cache, "_cache", OrderedDict())
+    monkeypatch.setattr(user_cache, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+def _user(telegram_id: int) -> User:
+    return User(telegram_id=telegram_id)
+
+
+class TestUserCache:
+    """Тесты хранения пользователей."""
+
+    def test_ttl_expiry(self, clock):
+        user = _user(1)
+        cache_user(user)
+
+        clock.now += user_cache.USER_CACHE_TTL - 1
+        assert get_cached_user(1) is user
+
+        clock.now += 2
+        assert get_cached_user(1) is None
+        assert 1 not in user_cache._cache
+
+    def test_eviction_at_max_size(self, monkeypatch):
+        monkeypatch.setattr(user_cache, "USER_CACHE_MAX_SIZE", 2)
+        cache_user(_user(1))
+        cache_user(_user(2))
+        # Повторная загрузка переносит пользователя в конец очереди
+        cache_user(_user(1))
+        cache_user(_user(3))
+
+        assert get_cached_user(2) is None
+        assert get_cached_user(1) is not None
+        assert get_cached_user(3) is not None
+        assert len(user_cache._cache) == 2
+
+
+class TestInvalidatesUserCache:
+    """Тесты декоратора CRUD функций."""
+
+    @pytest.mark.asyncio
+    async def test_telegram_id_positional_and_keyword(self):
+        @invalidates_user_cache
+        async def update_balance(telegram_id: int, amount: int) -> int:
+            return amount
+
+        for telegram_id in (1, 2, 3):
+            cache_user(_user(telegram_id))
+
+        assert await update_balance(1, 5) == 5
+        assert await update_balance(amount=5, telegram_id=2) == 5
+
+        assert get_cached_user(1) is None
+        assert get_cached_user(2) is None
+        assert get_cached_user(3) is not None
+
+    @pytest.mark.asyncio
+    async def test_clears_all_without_telegram_id(self):
+        @invalidates_user_cache
+        async def reset_all_bonuses() -> None:
+            return None
+
+        cache_user(_user(1))
+        cache_user(_user(2))
+
+        await reset_all_bonuses()
+
+        assert len(user_cache._cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_invalidates_when_call_raises(self):
+        @invalidates_user_cache
+        async def block_user(telegram_id: int) -> None:
+            raise RuntimeError("db error")
+
+        cache_user(_user(1))
+
+        with pytest.raises(RuntimeError):
+            await block_user(1)
+
+        assert get_cached_user(1) is None